@@ -1,9 +1,11 @@
 from flask import Flask, g, request, redirect, render_template, flash, url_for
+from werkzeug.local import LocalProxy
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_login import LoginManager
-from flask_compress import Compress
+from flask_caching import Cache
 from app.config import Config
+from app.compression import CachingCompress
 import cloudinary
 import os
 from dotenv import load_dotenv
@@ -13,16 +15,12 @@ import pytz
 db = SQLAlchemy()
 migrate = Migrate()
 login_manager = LoginManager()
-compress = Compress()
+compress = CachingCompress()  # Flask-Compress + cache body đã nén (app/compression.py)
+cache = Cache(with_jinja2_ext=False)  # dùng {% cache %} riêng (app/caching.py)
 
 # Timezone Việt Nam
 VN_TZ = pytz.timezone('Asia/Ho_Chi_Minh')
 
-# ===== CACHE GLOBAL (TTL) =====
-_CATEGORIES_CACHE = None
-_CACHE_TIMESTAMP = None
-_CACHE_TTL = 0  # 5 phút
-
 
 def create_app(config_class=Config):
     """Factory function để tạo Flask app - Tối ưu cho Render"""
@@ -43,7 +41,8 @@ def create_app(config_class=Config):
     # Upload Security
     app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max
 
-    # Static files caching
+    # Static files caching: file thường revalidate mỗi lần (ETag);
+    # CSS/JS build có fingerprint => immutable (app/assets.py)
     app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0
 
     # ==================== INIT EXTENSIONS ====================
@@ -51,6 +50,7 @@ def create_app(config_class=Config):
     migrate.init_app(app, db)
     login_manager.init_app(app)
     compress.init_app(app)  # ✅ bật nén HTTP
+    cache.init_app(app)  # page cache (app/caching.py)
 
     # ==================== CLOUDINARY ====================
     cloudinary.config(
@@ -82,48 +82,55 @@ def create_app(config_class=Config):
     # Khởi tạo cấu hình logging, v.v.
     config_class.init_app(app)
 
-    # ==================== CONTEXT PROCESSOR (TTL + per-request g) ====================
+    # ==================== CONTEXT PROCESSOR (lazy + per-request g) ====================
+    # Giá trị mặc định cho các settings thường dùng trong base.html
+    common_setting_defaults = {
+        'default_banner': '',
+        'website_name': 'BRICON VIỆT NAM',
+        'logo_url': '/static/img/logo.png',
+        'hotline': '0901.180.094',
+        'contact_email': 'info@bricon.vn',
+    }
+
     @app.context_processor
     def inject_globals():
         """
-        - TTL cache (process-level) 5 phút để tránh query lặp qua nhiều request
-        - Per-request cache bằng g.* để 1 request không query lại
+        - Mọi giá trị là lazy proxy: chỉ tra cache/DB khi template thực sự dùng
+          (admin, 404, fragment không render navbar => không tốn gì)
+        - Danh mục: cache process-level, tự xóa sau commit Category/Product
+        - Settings: snapshot process-level (xem app/models/settings.py)
+        - Per-request cache bằng g.* để nhiều lần render trong 1 request không tra lại
         """
-        from app.models.settings import get_setting
-        from app.models.product import Category
+        from app.models.settings import get_setting, get_settings
+        from app.models.product import get_active_categories
         from datetime import datetime
-        import time
 
-        global _CATEGORIES_CACHE, _CACHE_TIMESTAMP
+        def load_common_settings():
+            return get_settings(common_setting_defaults)
 
-        # per-request guard
-        if not hasattr(g, 'all_categories'):
-            now = time.time()
-            need_refresh = (
-                    _CATEGORIES_CACHE is None or
-                    _CACHE_TIMESTAMP is None or
-                    (now - _CACHE_TIMESTAMP) > _CACHE_TTL
+        def common_setting(key):
+            return lazy_request_value(
+                f'setting_{key}',
+                lambda: request_cached('common_settings', load_common_settings)[key]
             )
-            if need_refresh:
-                _CATEGORIES_CACHE = Category.query.filter_by(is_active=True).all()
-                _CACHE_TIMESTAMP = now
-            g.all_categories = _CATEGORIES_CACHE  # dùng cache process-level
 
         return {
             'get_setting': get_setting,
             'site_name': app.config.get('SITE_NAME', 'Briconvn'),
-            'all_categories': g.all_categories,
+            'all_categories': lazy_request_value('all_categories', get_active_categories),
             'current_year': datetime.now().year,
-            # Pre-load settings thường dùng
-            'default_banner': get_setting('default_banner', ''),
-            # Thêm các settings quan trọng cho base.html
-            'website_name': get_setting('website_name', 'BRICON VIỆT NAM'),
-            'logo_url': get_setting('logo_url', '/static/img/logo.png'),
-            'hotline': get_setting('hotline', '0901.180.094'),
-            'contact_email': get_setting('contact_email', 'info@bricon.vn'),
-
+            # Settings thường dùng cho base.html
+            **{key: common_setting(key) for key in common_setting_defaults},
         }
 
+    # ==================== JINJA2 EXTENSIONS ====================
+    from app.caching import FragmentCacheExtension
+    app.jinja_env.add_extension(FragmentCacheExtension)
+
+    # ==================== STATIC ASSETS (fingerprint) ====================
+    from app.assets import init_assets, set_static_cache_headers
+    init_assets(app)  # asset_url() đọc assets-manifest.json
+
     # ==================== JINJA2 FILTERS ====================
     @app.template_filter('format_price')
     def format_price(value):
@@ -208,17 +215,9 @@ def create_app(config_class=Config):
         ✅ SKIP CSP cho admin area (CKEditor cần freedom)
         """
 
-        # # ==================== CACHING ====================
-        # if request.path.startswith('/static/'):
-        #     response.cache_control.max_age = 600
-        #     response.cache_control.public = True
-        #     response.cache_control.immutable = True
-        #
-        # # Cache cho CSS/JS/Images
-        # if any(request.path.endswith(ext) for ext in
-        #        ['.css', '.js', '.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.woff', '.woff2']):
-        #     response.cache_control.max_age = 600
-        #     response.cache_control.public = True
+        # ==================== CACHING ====================
+        # File có hash trong tên (asset_url) => immutable 1 năm; file khác vẫn revalidate (ETag)
+        set_static_cache_headers(response)
 
         # ==================== SECURITY HEADERS ====================
         # Prevent MIME type sniffing
@@ -273,10 +272,65 @@ def create_app(config_class=Config):
     # ==================== CUSTOM CLI COMMANDS ====================
     @app.cli.command()
     def clear_cache():
-        """Clear categories cache"""
+        """Clear categories + settings + page cache + related content + compressed bodies"""
+        from app.models.settings import clear_settings_cache
+        from app.caching import clear_page_cache
+        from app.related import clear_related_index
+        from app.compression import clear_compression_cache
         clear_categories_cache()
+        clear_settings_cache()
+        clear_page_cache()
+        clear_related_index()
+        clear_compression_cache()
         print("✅ Cache cleared successfully!")
 
+    @app.cli.command()
+    def backfill_media_keys():
+        """Tính lại Media.url_key (canonical image URL) cho toàn bộ thư viện"""
+        from sqlalchemy import update
+        from app.models.media import Media, ensure_media_url_key
+        from app.models.helpers import image_url_key
+
+        ensure_media_url_key()
+        rows = db.session.query(Media.id, Media.filepath, Media.url_key).order_by(Media.id).all()
+
+        seen = set()
+        changes = {}
+        duplicates = 0
+        for media_id, filepath, current_key in rows:
+            key = image_url_key(filepath)
+            if key in seen:
+                # Cùng 1 ảnh nhiều record: giữ key cho record cũ nhất
+                key = None
+                duplicates += 1
+            elif key:
+                seen.add(key)
+            if key != current_key:
+                changes[media_id] = key
+
+        if changes:
+            # B1: xóa key cũ của các row thay đổi (tránh đụng unique index giữa chừng)
+            db.session.execute(
+                update(Media).where(Media.id.in_(list(changes))).values(url_key=None)
+            )
+            # B2: bulk UPDATE theo primary key
+            new_keys = [{'id': media_id, 'url_key': key} for media_id, key in changes.items() if key]
+            if new_keys:
+                db.session.execute(update(Media), new_keys)
+            db.session.commit()
+
+        print(f"✅ Media url_key: {len(changes)}/{len(rows)} record cập nhật, {duplicates} bản trùng")
+
+    @app.cli.command()
+    def rebuild_search_index():
+        """Tạo + build lại toàn bộ full-text search index (app/search.py)"""
+        from app.search import rebuild_search_index as _rebuild
+        counts = _rebuild()
+        if not counts:
+            print("⚠️ DB không hỗ trợ full-text index, search dùng ILIKE")
+            return
+        print("✅ Search index: " + ", ".join(f"{doc_type}={n}" for doc_type, n in counts.items()))
+
     @app.cli.command()
     def test_security():
         """Test security headers"""
@@ -298,12 +352,27 @@ def create_app(config_class=Config):
     return app
 
 
+# ==================== PER-REQUEST LAZY VALUES ====================
+def request_cached(name, loader):
+    """Gọi loader 1 lần/request, kết quả lưu tại g.<name>"""
+    if name not in g:
+        setattr(g, name, loader())
+    return g.get(name)
+
+
+def lazy_request_value(name, loader):
+    """
+    LocalProxy trỏ tới request_cached(name, loader)
+    - Không làm gì khi tạo proxy, chỉ resolve khi template đọc giá trị
+    """
+    return LocalProxy(lambda: request_cached(name, loader))
+
+
 # ==================== CLEAR CACHE FUNCTION ====================
 def clear_categories_cache():
-    """Helper function để clear cache khi cần"""
-    global _CATEGORIES_CACHE, _CACHE_TIMESTAMP
-    _CATEGORIES_CACHE = None
-    _CACHE_TIMESTAMP = None
+    """Helper function để clear cache khi cần (cache tự xóa sau commit Category/Product)"""
+    from app.models.product import clear_categories_cache as _clear
+    _clear()
 
 
 # ==================== USER LOADER ====================
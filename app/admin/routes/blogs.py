@@ -42,6 +42,7 @@ API ENDPOINTS:
 
 from flask import render_template, request, flash, redirect, url_for, jsonify
 from app import db
+from app.counts import cached_paginate
 from app.models.content import Blog
 from app.forms.content import BlogForm
 from app.decorators import permission_required
@@ -62,7 +63,8 @@ def blogs():
     - Hiển thị SEO score badge
     """
     page = request.args.get('page', 1, type=int)
-    blogs = Blog.query.order_by(Blog.created_at.desc()).paginate(
+    blogs = cached_paginate(
+        Blog.query.order_by(Blog.created_at.desc()),
         page=page, per_page=20, error_out=False
     )
     return render_template('admin/tin_tuc/blogs.html', blogs=blogs)
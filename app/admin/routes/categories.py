@@ -29,6 +29,7 @@ RELATIONSHIPS:
 
 from flask import render_template, request, flash, redirect, url_for
 from app import db
+from app.counts import cached_paginate
 from app.models.product import Category
 from app.forms.product import CategoryForm
 from app.utils import save_upload_file
@@ -47,7 +48,8 @@ def categories():
     - Hiển thị số lượng sản phẩm trong mỗi category
     """
     page = request.args.get('page', 1, type=int)
-    categories = Category.query.order_by(Category.created_at.desc()).paginate(
+    categories = cached_paginate(
+        Category.query.order_by(Category.created_at.desc()),
         page=page, per_page=20, error_out=False
     )
     return render_template('admin/danh_muc/categories.html', categories=categories)
@@ -35,6 +35,7 @@ WORKFLOW:
 
 from flask import render_template, request, flash, redirect, url_for
 from app import db
+from app.counts import cached_paginate, count_rows
 from app.models.contact import Contact
 from app.decorators import permission_required
 from app.admin import admin_bp
@@ -70,16 +71,17 @@ def contacts():
     elif read_status == 'unread':
         query = query.filter_by(is_read=False)
 
-    contacts = query.order_by(Contact.created_at.desc()).paginate(
+    contacts = cached_paginate(
+        query.order_by(Contact.created_at.desc()),
         page=page, per_page=20, error_out=False
     )
 
     # Statistics
     stats = {
-        'total': Contact.query.count(),
-        'unread': Contact.query.filter_by(is_read=False).count(),
-        'newsletter': Contact.query.filter_by(subject='Đăng ký nhận tin').count(),
-        'contacts': Contact.query.filter(Contact.subject != 'Đăng ký nhận tin').count()
+        'total': count_rows(Contact),
+        'unread': count_rows(Contact, Contact.is_read == False),
+        'newsletter': count_rows(Contact, Contact.subject == 'Đăng ký nhận tin'),
+        'contacts': count_rows(Contact, Contact.subject != 'Đăng ký nhận tin')
     }
 
     return render_template(
@@ -9,6 +9,7 @@ from flask_login import login_required, current_user
 from sqlalchemy import func, desc
 from datetime import datetime, timedelta
 from app import db
+from app.counts import count_rows
 from app.models.product import Product, Category
 from app.models.content import Blog, FAQ
 from app.models.contact import Contact
@@ -33,15 +34,15 @@ def dashboard():
 
     # ==================== BASIC STATS ====================
     stats = {
-        'products': Product.query.count(),
-        'categories': Category.query.count(),
-        'blogs': Blog.query.count(),
-        'contacts_unread': Contact.query.filter_by(is_read=False).count(),
-        'projects': Project.query.count(),
-        'faqs': FAQ.query.filter_by(is_active=True).count(),
-        'jobs': Job.query.filter_by(is_active=True).count(),
-        'media': Media.query.count(),
-        'quizzes': Quiz.query.filter_by(is_active=True).count(),
+        'products': count_rows(Product, estimate=True),
+        'categories': count_rows(Category, estimate=True),
+        'blogs': count_rows(Blog, estimate=True),
+        'contacts_unread': count_rows(Contact, Contact.is_read == False),
+        'projects': count_rows(Project, estimate=True),
+        'faqs': count_rows(FAQ, FAQ.is_active == True),
+        'jobs': count_rows(Job, Job.is_active == True),
+        'media': count_rows(Media, estimate=True),
+        'quizzes': count_rows(Quiz, Quiz.is_active == True),
     }
 
     # ==================== TREND CALCULATIONS ====================
@@ -187,6 +188,15 @@ def dashboard():
                          contact_weekly=contact_weekly)
 
 
+# ==================== COMPRESSION STATS ====================
+@admin_bp.route('/api/compression-stats')
+@permission_required('view_dashboard')
+def compression_stats():
+    """Hit/miss của cache body đã nén (app/compression.py) - của worker đang trả lời"""
+    from app.compression import compression_stats as get_compression_stats
+    return jsonify(get_compression_stats())
+
+
 # ==================== WELCOME USER ====================
 @admin_bp.route('/welcome')
 @login_required
@@ -45,6 +45,7 @@ FRONTEND DISPLAY:
 
 from flask import render_template, request, flash, redirect, url_for
 from app import db
+from app.counts import cached_paginate
 from app.models.job import Job
 from app.forms.job import JobForm
 from app.decorators import permission_required
@@ -62,7 +63,8 @@ def jobs():
     - Badge: Urgent, Expired, Active
     """
     page = request.args.get('page', 1, type=int)
-    jobs = Job.query.order_by(Job.created_at.desc()).paginate(
+    jobs = cached_paginate(
+        Job.query.order_by(Job.created_at.desc()),
         page=page, per_page=20, error_out=False
     )
     return render_template('admin/tuyen_dung/jobs.html', jobs=jobs)
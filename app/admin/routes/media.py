@@ -23,7 +23,9 @@ from flask_login import current_user
 from werkzeug.utils import secure_filename
 
 from app import db
+from app.counts import cached_paginate, count_rows
 from app.models.media import Media
+from app.models.helpers import image_url_key
 from app.models.settings import get_setting
 from app.forms import MediaSEOForm
 from app.utils import save_upload_file, delete_file, get_albums
@@ -42,7 +44,8 @@ def media():
     if album_filter:
         query = query.filter_by(album=album_filter)
 
-    media_files = query.order_by(Media.created_at.desc()).paginate(
+    media_files = cached_paginate(
+        query.order_by(Media.created_at.desc()),
         page=page, per_page=12, error_out=False
     )
 
@@ -51,12 +54,13 @@ def media():
     if album_filter:
         query = query.filter_by(album=album_filter)
 
-    media_files = query.order_by(Media.created_at.desc()).paginate(
+    media_files = cached_paginate(
+        query.order_by(Media.created_at.desc()),
         page=page, per_page=12, error_out=False
     )
 
     albums = get_albums()
-    total_files = Media.query.count()
+    total_files = count_rows(Media)
     total_size = db.session.query(db.func.sum(Media.file_size)).scalar() or 0
     total_size_mb = round(total_size / (1024 * 1024), 2)
 
@@ -88,6 +92,7 @@ def upload_media():
 
         uploaded_count = 0
         errors = []
+        pending_media = {}  # url_key -> Media trong lần upload này
 
         for file in files:
             if file and file.filename:
@@ -112,22 +117,28 @@ def upload_media():
                     )
 
                     if filepath and file_info:
-                        # ✅ Tạo Media object từ file_info
-                        media = Media(
-                            filename=file_info.get('filename'),
-                            original_filename=file_info.get('original_filename'),
-                            filepath=file_info.get('filepath'),  # Cloudinary URL hoặc /static/...
-                            file_type=file_info.get('file_type'),
-                            file_size=file_info.get('file_size'),
-                            width=file_info.get('width', 0),
-                            height=file_info.get('height', 0),
-                            album=file_info.get('album'),
-                            alt_text=file_alt_text,
-                            title=file_alt_text,
-                            uploaded_by=current_user.id
-                        )
-
-                        db.session.add(media)
+                        # ✅ Upload trùng public_id (overwrite=True) => cập nhật record cũ
+                        # thay vì tạo record mới (url_key là unique)
+                        url_key = image_url_key(file_info.get('filepath'))
+                        media = pending_media.get(url_key) or Media.query.filter_by(url_key=url_key).first()
+                        if media is None:
+                            media = Media()
+                            db.session.add(media)
+                        pending_media[url_key] = media
+
+                        # ✅ Gán thông tin từ file_info (url_key tự tính theo filepath)
+                        media.filename = file_info.get('filename')
+                        media.original_filename = file_info.get('original_filename')
+                        media.filepath = file_info.get('filepath')  # Cloudinary URL hoặc /static/...
+                        media.file_type = file_info.get('file_type')
+                        media.file_size = file_info.get('file_size')
+                        media.width = file_info.get('width', 0)
+                        media.height = file_info.get('height', 0)
+                        media.album = file_info.get('album')
+                        media.alt_text = file_alt_text
+                        media.title = file_alt_text
+                        media.uploaded_by = current_user.id
+
                         uploaded_count += 1
                     else:
                         errors.append(f"Không thể upload {file.filename}")
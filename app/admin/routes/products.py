@@ -11,6 +11,7 @@
 
 from flask import render_template, request, flash, redirect, url_for
 from app import db
+from app.counts import cached_paginate
 from app.models.product import Product
 from app.forms.product import ProductForm
 from app.decorators import permission_required
@@ -23,7 +24,8 @@ from app.admin.utils.helpers import get_image_from_form
 def products():
     """Danh sách sản phẩm"""
     page = request.args.get('page', 1, type=int)
-    products = Product.query.order_by(Product.created_at.desc()).paginate(
+    products = cached_paginate(
+        Product.query.order_by(Product.created_at.desc()),
         page=page, per_page=20, error_out=False
     )
     return render_template('admin/san_pham/products.html', products=products)
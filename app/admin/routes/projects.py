@@ -30,6 +30,7 @@ FRONTEND DISPLAY:
 
 from flask import render_template, request, flash, redirect, url_for
 from app import db
+from app.counts import cached_paginate
 from app.models.media import Project
 from app.forms.media import ProjectForm
 from app.decorators import permission_required
@@ -48,7 +49,8 @@ def projects():
     - Badge "Featured" cho dự án nổi bật
     """
     page = request.args.get('page', 1, type=int)
-    projects = Project.query.order_by(Project.created_at.desc()).paginate(
+    projects = cached_paginate(
+        Project.query.order_by(Project.created_at.desc()),
         page=page, per_page=20, error_out=False
     )
     return render_template('admin/du_an/projects.html', projects=projects)
@@ -13,6 +13,7 @@ Yêu cầu: Login và có quyền manage_quiz
 from flask import render_template, request, flash, redirect, url_for, jsonify
 from flask_login import current_user
 from app import db
+from app.counts import cached_paginate, count_rows
 from app.models.quiz import Quiz, Question, Answer, QuizAttempt, UserAnswer
 from app.decorators import permission_required
 from app.admin import admin_bp
@@ -38,7 +39,8 @@ def quizzes():
     if search:
         query = query.filter(Quiz.title.ilike(f'%{search}%'))
 
-    quizzes = query.order_by(Quiz.created_at.desc()).paginate(
+    quizzes = cached_paginate(
+        query.order_by(Quiz.created_at.desc()),
         page=page, per_page=20, error_out=False
     )
 
@@ -349,7 +351,8 @@ def results():
     elif status == 'failed':
         query = query.filter_by(passed=False)
 
-    attempts = query.order_by(QuizAttempt.completed_at.desc()).paginate(
+    attempts = cached_paginate(
+        query.order_by(QuizAttempt.completed_at.desc()),
         page=page, per_page=30, error_out=False
     )
 
@@ -417,9 +420,9 @@ def statistics():
     - Top quiz phổ biến
     - Tỷ lệ đạt/không đạt
     """
-    total_quizzes = Quiz.query.count()
-    total_questions = Question.query.count()
-    total_attempts = QuizAttempt.query.filter_by(is_completed=True).count()
+    total_quizzes = count_rows(Quiz)
+    total_questions = count_rows(Question)
+    total_attempts = count_rows(QuizAttempt, QuizAttempt.is_completed == True)
 
     # Top quiz có nhiều người làm nhất
     top_quizzes = db.session.query(
@@ -432,8 +435,8 @@ def statistics():
     ).limit(5).all()
 
     # Thống kê đạt/không đạt
-    passed_count = QuizAttempt.query.filter_by(is_completed=True, passed=True).count()
-    failed_count = QuizAttempt.query.filter_by(is_completed=True, passed=False).count()
+    passed_count = count_rows(QuizAttempt, QuizAttempt.is_completed == True, QuizAttempt.passed == True)
+    failed_count = count_rows(QuizAttempt, QuizAttempt.is_completed == True, QuizAttempt.passed == False)
 
     return render_template('admin/trac_nghiem/statistics.html',
                            total_quizzes=total_quizzes,
@@ -4,6 +4,7 @@ Quản lý phân quyền RBAC (Role-Based Access Control)
 
 from flask import render_template, request, flash, redirect, url_for
 from app import db
+from app.counts import count_rows
 from app.models.rbac import Role, Permission
 from app.forms.user import RoleForm, PermissionForm
 from app.decorators import permission_required
@@ -19,10 +20,10 @@ def roles():
     roles = Role.query.order_by(Role.priority.desc()).all()
 
     stats = {
-        'total_roles': Role.query.count(),
-        'total_permissions': Permission.query.count(),
-        'total_users': User.query.count(),
-        'active_roles': Role.query.filter_by(is_active=True).count()
+        'total_roles': count_rows(Role),
+        'total_permissions': count_rows(Permission),
+        'total_users': count_rows(User),
+        'active_roles': count_rows(Role, Role.is_active == True)
     }
 
     return render_template('admin/phan_quyen/roles.html', roles=roles, stats=stats)
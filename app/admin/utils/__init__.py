@@ -1,6 +1,6 @@
 """
 🛠️ Admin Utilities Package
-Helper functions, SEO calculations, file generators
+Helper functions, SEO calculations
 """
 
 # ==================== HELPER FUNCTIONS ====================
@@ -9,19 +9,9 @@ from .helpers import (
     normalize_filepath,  # Chuẩn hóa đường dẫn file
 )
 
-# ==================== FILE GENERATORS ====================
-from .generators import (
-    generate_sitemap,  # Tạo sitemap.xml
-    generate_robots_txt,  # Tạo robots.txt
-)
-
 # ✅ Export tất cả để dễ import
 __all__ = [
     # Helpers
     'get_image_from_form',
     'normalize_filepath',
-
-    # Generators
-    'generate_sitemap',
-    'generate_robots_txt',
 ]
\ No newline at end of file
@@ -0,0 +1,200 @@
+"""
+Static assets - URL có fingerprint + cache immutable
+
+- build_css.py / build_js.py (hoặc `python asset_build.py` lúc deploy) ghi bản có hash nội dung
+  (main.min.<hash>.css) + app/static/assets-manifest.json (xem asset_build.py)
+- Manifest đọc 1 lần khi khởi động app
+- asset_url('css/main.min.css') => /static/css/main.min.<hash>.css
+  (chưa có manifest / file không có trong manifest => URL gốc như url_for)
+- File có hash: Cache-Control: public, max-age=31536000, immutable
+  => trình duyệt không hỏi lại server; nội dung đổi => tên đổi
+- Bản nén sẵn lúc build (.br / .gz cạnh file): static view chọn theo Accept-Encoding,
+  gửi kèm Content-Encoding + Vary => không nén lại mỗi request (Flask-Compress bỏ qua)
+- Critical CSS theo template (build_css.py => css/critical/<template>.css):
+  critical_css() trả CSS của template trang đang render => inline trong <head>,
+  main.min.css tải bất đồng bộ (layouts/base.html)
+- JS theo trang (build_js.py => js/chunks/*.min.js + js/chunks.json):
+  main.min.js chỉ chứa module dùng chung; page_scripts() thêm chunk template cần
+
+Usage (template):
+    <link rel="stylesheet" href="{{ asset_url('css/main.min.css') }}">
+    {% set page_critical_css = critical_css() %}
+    {{ page_scripts() }}                              {# chunk JS của template trang #}
+    {{ page_scripts('components/chatbot.html') }}     {# chunk JS của component #}
+"""
+import json
+import logging
+import mimetypes
+import os
+
+from flask import before_render_template, current_app, g, request, send_from_directory, url_for
+from markupsafe import Markup, escape
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = 'assets-manifest.json'
+CRITICAL_DIR = os.path.join('css', 'critical')
+CHUNK_MAP_NAME = os.path.join('js', 'chunks.json')
+IMMUTABLE_MAX_AGE = 31536000  # 1 năm
+
+# Thứ tự ưu tiên: (Content-Encoding, đuôi file nén sẵn)
+PRECOMPRESSED_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def load_manifest(app):
+    """Đọc manifest (logical => hashed) - lỗi / chưa build => {}"""
+    path = os.path.join(app.static_folder, MANIFEST_NAME)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        logger.warning('Chưa có %s (chạy python asset_build.py), dùng URL gốc', MANIFEST_NAME)
+        return {}
+    except (OSError, ValueError):
+        logger.exception('Không đọc được %s, dùng URL gốc', path)
+        return {}
+    return {
+        logical: hashed for logical, hashed in manifest.items()
+        if os.path.exists(os.path.join(app.static_folder, hashed))
+    }
+
+
+def scan_precompressed(app):
+    """{đường dẫn trong static/: (encoding có bản nén sẵn, ...)} - quét 1 lần khi khởi động"""
+    found = {}
+    for root, _, files in os.walk(app.static_folder):
+        names = set(files)
+        for name in files:
+            encodings = tuple(
+                encoding for encoding, suffix in PRECOMPRESSED_ENCODINGS if name + suffix in names
+            )
+            if encodings:
+                path = os.path.relpath(os.path.join(root, name), app.static_folder)
+                found[path.replace(os.sep, '/')] = encodings
+    return found
+
+
+def load_critical_css(app):
+    """{tên template: Markup CSS} từ css/critical/ - chưa build => {}"""
+    root = os.path.join(app.static_folder, CRITICAL_DIR)
+    critical = {}
+    for folder, _, files in os.walk(root):
+        for name in files:
+            if not name.endswith('.css'):
+                continue
+            path = os.path.join(folder, name)
+            template = os.path.relpath(path, root)[:-len('.css')].replace(os.sep, '/') + '.html'
+            with open(path, 'r', encoding='utf-8') as f:
+                critical[template] = Markup(f.read())
+    return critical
+
+
+def load_chunk_map(app):
+    """{tên template: (chunk JS, ...)} từ js/chunks.json - chưa build => {}"""
+    path = os.path.join(app.static_folder, CHUNK_MAP_NAME)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            chunk_map = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError):
+        logger.exception('Không đọc được %s, bỏ qua chunk JS theo trang', path)
+        return {}
+    return {template: tuple(chunks) for template, chunks in chunk_map.items()}
+
+
+def _remember_page_template(sender, template, context, **extra):
+    """before_render_template: ghi lại template trang (render_template) cho critical_css()"""
+    g.page_template = template.name
+
+
+def init_assets(app):
+    """Nạp manifest + bản nén sẵn + critical CSS + chunk map, đăng ký helper Jinja và static view"""
+    manifest = load_manifest(app)
+    app.extensions['asset_manifest'] = manifest
+    app.extensions['asset_hashed_files'] = frozenset(manifest.values())
+    app.extensions['asset_precompressed'] = scan_precompressed(app)
+    app.extensions['asset_critical_css'] = load_critical_css(app)
+    app.extensions['asset_chunks'] = load_chunk_map(app)
+    app.jinja_env.globals['asset_url'] = asset_url
+    app.jinja_env.globals['critical_css'] = critical_css
+    app.jinja_env.globals['page_scripts'] = page_scripts
+    before_render_template.connect(_remember_page_template, app)
+    if 'static' in app.view_functions:
+        app.view_functions['static'] = send_static_file
+
+
+def asset_url(filename, **values):
+    """URL của file static, ưu tiên bản fingerprint trong manifest"""
+    manifest = current_app.extensions.get('asset_manifest', {})
+    return url_for('static', filename=manifest.get(filename, filename), **values)
+
+
+def critical_css():
+    """Critical CSS của template trang đang render (None => dùng <link> chặn render như cũ)"""
+    name = g.get('page_template')
+    if not name:
+        return None
+    return current_app.extensions.get('asset_critical_css', {}).get(name)
+
+
+def page_scripts(template=None):
+    """
+    <script> cho các chunk JS của template (mặc định: template trang đang render)
+    - Module dùng chung nằm trong main.min.js, gọi sau thẻ script của main.min.js
+    """
+    template = template or g.get('page_template')
+    chunks = current_app.extensions.get('asset_chunks', {}).get(template, ())
+    return Markup('\n'.join(
+        f'<script src="{escape(asset_url(chunk))}"></script>' for chunk in chunks
+    ))
+
+
+def is_hashed_asset(filename):
+    """filename (đường dẫn trong static/) là bản fingerprint?"""
+    return filename in current_app.extensions.get('asset_hashed_files', ())
+
+
+def _accepted_encoding(filename):
+    """Encoding nén sẵn tốt nhất client chấp nhận (None => gửi bản gốc)"""
+    available = current_app.extensions.get('asset_precompressed', {}).get(filename, ())
+    for encoding in available:
+        if request.accept_encodings[encoding]:
+            return encoding
+    return None
+
+
+def send_static_file(filename):
+    """
+    Static view: có bản .br/.gz => gửi bản nén theo Accept-Encoding
+    - ETag / Content-Length theo file nén (mỗi encoding 1 ETag riêng)
+    - Vary: Accept-Encoding cho mọi file có bản nén (kể cả khi gửi bản gốc)
+    """
+    app = current_app
+    encoding = _accepted_encoding(filename)
+    if encoding is None:
+        response = app.send_static_file(filename)
+    else:
+        suffix = dict(PRECOMPRESSED_ENCODINGS)[encoding]
+        response = send_from_directory(
+            app.static_folder, filename + suffix,
+            mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+            max_age=app.get_send_file_max_age(filename),
+        )
+        response.headers['Content-Encoding'] = encoding
+    if filename in app.extensions.get('asset_precompressed', {}):
+        response.vary.add('Accept-Encoding')
+    return response
+
+
+def set_static_cache_headers(response):
+    """after_request: file fingerprint => cache 1 năm, immutable"""
+    if request.endpoint != 'static' or response.status_code not in (200, 304):
+        return response
+    filename = (request.view_args or {}).get('filename', '')
+    if is_hashed_asset(filename):
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+        response.cache_control.no_cache = None
+    return response
@@ -0,0 +1,428 @@
+"""
+Page cache - cache toàn bộ response HTML cho khách (anonymous GET)
+
+- Backend: Flask-Caching (config CACHE_TYPE)
+    + Mặc định LRUCache trong process (gunicorn 1 worker)
+    + Nhiều worker/instance: CACHE_TYPE=FileSystemCache + CACHE_DIR để dùng chung
+- Key: host + path + query args đã chuẩn hóa + version của các tag
+- Invalidate theo tag: commit thay đổi model => đổi version tag
+  => mọi key cũ tự hết hiệu lực (không cần quét/xóa từng key)
+- Bỏ qua cache: user đã đăng nhập (admin), request có flash message,
+  response không phải 200 / có Set-Cookie / đụng tới session
+- Conditional GET: ETag + Last-Modified theo version nội dung
+  => If-None-Match / If-Modified-Since khớp => 304 ngay, không render template
+  trang chi tiết (còn đếm lượt xem mỗi request): @conditional_page + page_not_modified()
+- Fragment cache trong template: {% cache 'home:banner', ['banner', 'media'] %}...{% endcache %}
+  (cùng cơ chế tag; dùng cho cả admin / request có flash - vốn bỏ qua page cache)
+
+Usage:
+    from app.caching import cached_page
+
+    @main_bp.route('/san-pham')
+    @cached_page('product', 'media')
+    def products(): ...
+"""
+import math
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import wraps
+from hashlib import sha1
+
+from flask_caching.backends.base import BaseCache
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+from flask import current_app, g, has_app_context, has_request_context, make_response, request, session
+from flask_login import current_user
+
+from app.models.events import after_commit_of
+
+# Model => tag cache
+MODEL_TAGS = {
+    'Product': 'product',
+    'Category': 'category',
+    'Blog': 'blog',
+    'FAQ': 'faq',
+    'Project': 'project',
+    'Banner': 'banner',
+    'Media': 'media',
+    'Job': 'job',
+    'Settings': 'settings',
+}
+
+# Tag mọi trang đều phụ thuộc (base.html: settings + menu danh mục)
+BASE_TAGS = ('settings', 'category')
+
+# Tag => model có cột updated_at (dùng cho Last-Modified)
+_TAG_MODELS = {
+    'product': 'Product',
+    'blog': 'Blog',
+    'project': 'Project',
+    'media': 'Media',
+    'job': 'Job',
+    'settings': 'Settings',
+}
+
+_PAGE_PREFIX = 'page:'
+_TAG_PREFIX = 'tag:'
+_LASTMOD_PREFIX = 'lastmod:'
+_FRAGMENT_PREFIX = 'fragment:'
+
+# Chỉ giữ lại các header này khi lưu response
+_STORED_HEADERS = ('Content-Type',)
+
+
+# ==================== LRU BACKEND ====================
+class LRUCache(BaseCache):
+    """
+    Cache trong process, giới hạn số entry, loại bỏ entry ít dùng nhất (LRU)
+    - SimpleCache của cachelib chỉ xóa theo threshold, không theo LRU
+    - Thread-safe (gunicorn gthread)
+    """
+
+    def __init__(self, threshold=500, default_timeout=300):
+        super().__init__(default_timeout)
+        self._threshold = threshold
+        self._cache = OrderedDict()  # key -> (expires, value)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        kwargs.update({'threshold': config['CACHE_THRESHOLD']})
+        return cls(*args, **kwargs)
+
+    def _expires(self, timeout):
+        timeout = self._normalize_timeout(timeout)
+        return time.monotonic() + timeout if timeout > 0 else 0
+
+    def get(self, key):
+        with self._lock:
+            item = self._cache.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires and expires <= time.monotonic():
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout=None):
+        with self._lock:
+            self._cache[key] = (self._expires(timeout), value)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._threshold:
+                self._cache.popitem(last=False)
+        return True
+
+    def add(self, key, value, timeout=None):
+        with self._lock:
+            item = self._cache.get(key)
+            if item is not None and not (item[0] and item[0] <= time.monotonic()):
+                return False
+        return self.set(key, value, timeout)
+
+    def delete(self, key):
+        with self._lock:
+            return self._cache.pop(key, None) is not None
+
+    def has(self, key):
+        return self.get(key) is not None
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+        return True
+
+
+# ==================== TAG VERSIONS ====================
+def _extension():
+    from app import cache
+    return cache
+
+
+def _new_version():
+    """<thời điểm invalidate (ms, hex)>-<random> - phần đầu dùng cho Last-Modified"""
+    return f'{time.time_ns() // 1_000_000:x}-{uuid.uuid4().hex[:8]}'
+
+
+def _version_time(version):
+    try:
+        return int(version.split('-', 1)[0], 16) / 1000
+    except ValueError:
+        return 0
+
+
+def tag_versions(tags):
+    """
+    Version hiện tại của từng tag
+    - Tag chưa có version (lần đầu / bị LRU đẩy ra) => tạo version MỚI ngẫu nhiên,
+      không bao giờ quay lại version cũ => không thể trả nhầm page cũ
+    """
+    cache = _extension()
+    keys = [_TAG_PREFIX + tag for tag in tags]
+    versions = cache.get_many(*keys)
+    for i, version in enumerate(versions):
+        if version is None:
+            version = _new_version()
+            if not cache.add(keys[i], version, timeout=0):
+                version = cache.get(keys[i]) or version
+            versions[i] = version
+    return versions
+
+
+def invalidate_tags(*tags):
+    """Đổi version các tag => toàn bộ page cache dùng tag đó hết hiệu lực"""
+    cache = _extension()
+    cache.set_many({_TAG_PREFIX + tag: _new_version() for tag in tags}, timeout=0)
+
+
+def cached_value(prefix, key_parts, tags, compute, timeout=None):
+    """
+    Giá trị tính toán (count, facet...) có cache, hết hiệu lực khi tag đổi version
+    - key = prefix + sha1(key_parts + version các tag)
+    """
+    versions = tag_versions(tags)
+    raw = '|'.join([*map(str, key_parts), *versions])
+    key = prefix + sha1(raw.encode('utf-8')).hexdigest()
+
+    cache = _extension()
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache.set(key, value, timeout=timeout)
+    return value
+
+
+def clear_page_cache():
+    """Xóa toàn bộ page cache (CLI clear-cache)"""
+    invalidate_tags(*set(MODEL_TAGS.values()))
+
+
+@after_commit_of(*MODEL_TAGS)
+def _invalidate_changed_models(changed):
+    """Commit có thay đổi model => invalidate tag tương ứng"""
+    if not has_app_context():
+        return
+    invalidate_tags(*{MODEL_TAGS[name] for name in changed})
+
+
+# ==================== PAGE CACHE ====================
+def _page_cache_allowed():
+    if not current_app.config.get('PAGE_CACHE_ENABLED', True):
+        return False
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    if '_flashes' in session:
+        return False
+    if current_user.is_authenticated:
+        return False
+    return True
+
+
+def _page_key(tags, versions):
+    """host + path + query args (sắp xếp) + version tag => sha1"""
+    args = sorted(request.args.items(multi=True))
+    raw = '|'.join([
+        request.host,
+        request.path,
+        '&'.join(f'{k}={v}' for k, v in args),
+        ','.join(f'{tag}={version}' for tag, version in zip(tags, versions)),
+    ])
+    return _PAGE_PREFIX + sha1(raw.encode('utf-8')).hexdigest()
+
+
+def _cacheable(response):
+    return (response.status_code == 200
+            and not response.direct_passthrough
+            and 'Set-Cookie' not in response.headers
+            and not session.modified)
+
+
+# ==================== CONDITIONAL GET ====================
+def _max_updated_at(tag):
+    """max(updated_at) của model theo tag (timestamp, 0 nếu không có)"""
+    from sqlalchemy import func
+    from app import db
+    from app import models
+
+    model = getattr(models, _TAG_MODELS[tag])
+    value = db.session.query(func.max(model.updated_at)).scalar()
+    return value.replace(tzinfo=timezone.utc).timestamp() if value else 0
+
+
+def _tag_lastmod(tag, version):
+    """
+    Thời điểm nội dung của tag thay đổi gần nhất
+    = max(max(updated_at), thời điểm invalidate) - bắt được cả DELETE
+      và model không có updated_at (Category, FAQ, Banner)
+    - max(updated_at) nhớ theo version tag => chỉ query lại sau khi invalidate
+    """
+    lastmod = _version_time(version)
+    if tag in _TAG_MODELS:
+        cache = _extension()
+        key = f'{_LASTMOD_PREFIX}{tag}:{version}'
+        updated = cache.get(key)
+        if updated is None:
+            updated = _max_updated_at(tag)
+            cache.set(key, updated, timeout=0)
+        lastmod = max(lastmod, updated)
+    return lastmod
+
+
+def page_validators(tags, versions):
+    """(etag, last_modified) của trang phụ thuộc các tag"""
+    lastmods = [_tag_lastmod(tag, version) for tag, version in zip(tags, versions)]
+    etag = sha1('|'.join(versions).encode('utf-8')).hexdigest()[:20]
+    # Làm tròn LÊN giây (HTTP date chỉ tới giây) => 2 lần sửa trong cùng 1 giây vẫn khác Last-Modified
+    last_modified = datetime.fromtimestamp(math.ceil(max(lastmods, default=0)), tz=timezone.utc)
+    return etag, last_modified
+
+
+def not_modified(etag, last_modified):
+    """
+    Request có If-None-Match / If-Modified-Since khớp?
+    - Flask-Compress đổi ETag "abc" => "abc:gzip" / "abc:br" => bỏ hậu tố trước khi so
+    - Có If-None-Match thì bỏ qua If-Modified-Since (RFC 9110)
+    """
+    if request.if_none_match:
+        if request.if_none_match.star_tag:
+            return True
+        return any(tag.split(':', 1)[0] == etag
+                   for tag in request.if_none_match.as_set(include_weak=True))
+    if request.if_modified_since and last_modified:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def set_validators(response, etag, last_modified):
+    """Gắn ETag/Last-Modified, buộc trình duyệt hỏi lại server (no-cache) mỗi lần dùng"""
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.cache_control.no_cache = True
+    return response
+
+
+def not_modified_response(etag, last_modified):
+    """Response 304 rỗng kèm validators"""
+    return set_validators(current_app.response_class(status=304), etag, last_modified)
+
+
+# ==================== PAGE CACHE DECORATOR ====================
+def cached_page(*tags, timeout=None):
+    """
+    Decorator cache toàn bộ response của view public + conditional GET (304)
+    - tags: dữ liệu trang phụ thuộc (ngoài BASE_TAGS)
+    - timeout: mặc định PAGE_CACHE_TIMEOUT
+    """
+    all_tags = tuple(dict.fromkeys(BASE_TAGS + tags))
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not _page_cache_allowed():
+                return view(*args, **kwargs)
+
+            versions = tag_versions(all_tags)
+            etag, last_modified = page_validators(all_tags, versions)
+            if not_modified(etag, last_modified):
+                return not_modified_response(etag, last_modified)
+
+            cache = _extension()
+            key = _page_key(all_tags, versions)
+            entry = cache.get(key)
+            if entry is not None:
+                body, headers = entry
+                response = current_app.response_class(body, status=200, headers=headers)
+                response.headers['X-Cache'] = 'HIT'
+                return set_validators(response, etag, last_modified)
+
+            response = make_response(view(*args, **kwargs))
+            if _cacheable(response):
+                headers = [(name, response.headers[name])
+                           for name in _STORED_HEADERS if name in response.headers]
+                cache.set(key, (response.get_data(), headers),
+                          timeout=timeout or current_app.config.get('PAGE_CACHE_TIMEOUT'))
+                response.headers['X-Cache'] = 'MISS'
+                set_validators(response, etag, last_modified)
+            return response
+        return wrapper
+    return decorator
+
+
+def conditional_page(*tags):
+    """
+    Decorator chỉ conditional GET (ETag/Last-Modified theo version tag), không cache body
+    - Cho trang chi tiết: view vẫn chạy (404, count_view...), gọi page_not_modified()
+      trước khi render để trả 304
+    """
+    all_tags = tuple(dict.fromkeys(BASE_TAGS + tags))
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not _page_cache_allowed():
+                return view(*args, **kwargs)
+
+            etag, last_modified = page_validators(all_tags, tag_versions(all_tags))
+            g.page_validators = (etag, last_modified)
+            response = make_response(view(*args, **kwargs))
+            if _cacheable(response):
+                set_validators(response, etag, last_modified)
+            return response
+        return wrapper
+    return decorator
+
+
+def page_not_modified():
+    """Response 304 nếu request khớp validators của @conditional_page, None => render bình thường"""
+    validators = g.get('page_validators')
+    if validators and not_modified(*validators):
+        return not_modified_response(*validators)
+    return None
+
+
+# ==================== FRAGMENT CACHE ====================
+class FragmentCacheExtension(Extension):
+    """
+    Jinja tag cache HTML đã render của 1 đoạn template, invalidate theo tag
+
+        {% cache 'home:banner', ['banner', 'media'] %}
+            {% include 'plug-in-section/banner.html' %}
+        {% endcache %}
+
+    - Tham số: key, list tag (ngoài BASE_TAGS), timeout (tuỳ chọn, giây)
+    - Cache hit => không render body => biến lazy (LocalProxy) trong body không bị
+      resolve => query tương ứng không chạy
+    """
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        for _ in range(2):
+            if parser.stream.skip_if('comma'):
+                args.append(parser.parse_expression())
+        while len(args) < 3:
+            args.append(nodes.Const(None))
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        return nodes.CallBlock(
+            self.call_method('_render', args), [], [], body
+        ).set_lineno(lineno)
+
+    def _render(self, key, tags, timeout, caller):
+        all_tags = tuple(dict.fromkeys(BASE_TAGS + tuple(tags or ())))
+        versions = tag_versions(all_tags)
+        host = request.host if has_request_context() else ''
+        raw = '|'.join([host, str(key), ','.join(versions)])
+        cache_key = _FRAGMENT_PREFIX + sha1(raw.encode('utf-8')).hexdigest()
+
+        cache = _extension()
+        html = cache.get(cache_key)
+        if html is None:
+            html = caller()
+            cache.set(cache_key, str(html), timeout=timeout)
+        return Markup(html)
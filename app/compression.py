@@ -0,0 +1,190 @@
+"""
+Nén HTTP - Flask-Compress + cache kết quả nén trong RAM
+
+Trước: mỗi request nén lại body (br/gzip) kể cả khi body y hệt lần trước
+(page cache HIT, JSON /admin/api/media không đổi...)
+Giờ:
+- LRU giới hạn số entry + tổng bytes: key = (sha1 body, encoding, mức nén)
+  => body không đổi chỉ nén 1 lần cho mỗi encoding
+  (không dùng ETag làm key: ETag page cache theo version tag, nhiều URL dùng chung)
+- Theo kích thước:
+    + < COMPRESS_MIN_SIZE        => không nén (header/CPU lớn hơn lợi ích)
+    + >= COMPRESS_LARGE_SIZE và response dùng lại được (X-Cache / ETag)
+      => mức nén cao hơn (COMPRESS_LARGE_LEVEL / COMPRESS_LARGE_BR_LEVEL), chỉ tốn 1 lần nhờ cache
+    + còn lại                    => mức nén mặc định (COMPRESS_LEVEL / COMPRESS_BR_LEVEL)
+- Header X-Compress-Cache: HIT / MISS chỉ khi COMPRESS_DEBUG_HEADER hoặc app.debug (không lộ ra production)
+- Thống kê: compression_stats() (/admin/api/compression-stats)
+
+Usage:
+    from app.compression import CachingCompress
+    compress = CachingCompress()
+    compress.init_app(app)
+"""
+import gzip
+import threading
+import zlib
+from collections import OrderedDict
+from hashlib import sha1
+
+from flask import current_app
+from flask_compress import Compress
+from flask_compress.flask_compress import brotli
+
+_EXTENSION_KEY = 'compress_cache'
+
+
+# ==================== LRU ====================
+class CompressedBodyCache:
+    """
+    LRU body đã nén, giới hạn số entry + tổng bytes - thread-safe (gunicorn gthread)
+    - Entry lớn hơn 1/4 giới hạn bytes không lưu (tránh đẩy hết entry khác ra)
+    """
+
+    def __init__(self, max_entries=256, max_bytes=8 * 1024 * 1024):
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._data = OrderedDict()  # key -> bytes
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        if self._max_entries <= 0 or len(value) > self._max_bytes // 4:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._data[key] = value
+            self._bytes += len(value)
+            while len(self._data) > self._max_entries or self._bytes > self._max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def count_skipped(self):
+        with self._lock:
+            self.skipped += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0,
+                'skipped_small': self.skipped,
+                'evictions': self.evictions,
+                'entries': len(self._data),
+                'bytes': self._bytes,
+                'max_entries': self._max_entries,
+                'max_bytes': self._max_bytes,
+            }
+
+
+# ==================== FLASK-COMPRESS ====================
+def _reusable(response):
+    """Response sẽ được gửi lại y hệt (page cache / có ETag) và không cấm lưu"""
+    if response.cache_control.no_store or response.cache_control.private:
+        return False
+    return 'X-Cache' in response.headers or response.get_etag()[0] is not None
+
+
+class CachingCompress(Compress):
+    """Flask-Compress + cache kết quả nén + mức nén theo kích thước"""
+
+    def init_app(self, app):
+        app.config.setdefault('COMPRESS_LARGE_SIZE', 16 * 1024)
+        app.config.setdefault('COMPRESS_LARGE_LEVEL', 9)
+        app.config.setdefault('COMPRESS_LARGE_BR_LEVEL', 9)
+        app.config.setdefault('COMPRESS_RESULT_CACHE_SIZE', 256)
+        app.config.setdefault('COMPRESS_RESULT_CACHE_BYTES', 8 * 1024 * 1024)
+        app.config.setdefault('COMPRESS_DEBUG_HEADER', False)
+        super().init_app(app)
+        app.extensions[_EXTENSION_KEY] = CompressedBodyCache(
+            app.config['COMPRESS_RESULT_CACHE_SIZE'], app.config['COMPRESS_RESULT_CACHE_BYTES']
+        )
+
+    def after_request(self, response):
+        app = self.app or current_app
+        if (response.mimetype in app.config['COMPRESS_MIMETYPES']
+                and 'Content-Encoding' not in response.headers
+                and 200 <= response.status_code < 300
+                and response.content_length is not None
+                and response.content_length < app.config['COMPRESS_MIN_SIZE']):
+            app.extensions[_EXTENSION_KEY].count_skipped()
+        return super().after_request(response)
+
+    def compress(self, app, response, algorithm):
+        # Stream: không biết trước body => nén bình thường, không cache
+        if response.is_streamed:
+            return super().compress(app, response, algorithm)
+
+        data = response.get_data()
+        large = len(data) >= app.config['COMPRESS_LARGE_SIZE'] and _reusable(response)
+        results = app.extensions[_EXTENSION_KEY]
+        key = (sha1(data).digest(), algorithm, large)
+        debug_header = app.debug or app.config['COMPRESS_DEBUG_HEADER']
+
+        compressed = results.get(key)
+        if compressed is not None:
+            if debug_header:
+                response.headers['X-Compress-Cache'] = 'HIT'
+            return compressed
+
+        compressed = _compress_data(app, data, algorithm, large)
+        results.set(key, compressed)
+        if debug_header:
+            response.headers['X-Compress-Cache'] = 'MISS'
+        return compressed
+
+
+def _compress_data(app, data, algorithm, large):
+    """Nén data theo algorithm - large => mức nén cao"""
+    config = app.config
+    if algorithm == 'gzip':
+        level = config['COMPRESS_LARGE_LEVEL'] if large else config['COMPRESS_LEVEL']
+        return gzip.compress(data, compresslevel=level, mtime=0)
+    if algorithm == 'deflate':
+        level = config['COMPRESS_LARGE_LEVEL'] if large else config['COMPRESS_DEFLATE_LEVEL']
+        return zlib.compress(data, level)
+    if algorithm == 'br':
+        return brotli.compress(
+            data,
+            mode=config['COMPRESS_BR_MODE'],
+            quality=config['COMPRESS_LARGE_BR_LEVEL'] if large else config['COMPRESS_BR_LEVEL'],
+            lgwin=config['COMPRESS_BR_WINDOW'],
+            lgblock=config['COMPRESS_BR_BLOCK'],
+        )
+    raise ValueError(f'Unsupported compression algorithm: {algorithm}')
+
+
+# ==================== API ====================
+def compression_stats():
+    """Hit/miss/skip của cache nén (process hiện tại)"""
+    results = current_app.extensions.get(_EXTENSION_KEY)
+    return results.stats() if results is not None else {}
+
+
+def clear_compression_cache():
+    results = current_app.extensions.get(_EXTENSION_KEY)
+    if results is not None:
+        results.clear()
@@ -66,16 +66,45 @@ class Config:
     HOTLINE_ZALO = os.environ.get('HOTLINE_ZALO', '0901.180.094')
 
     # ===== FLASK-COMPRESS =====
+    # CSS/JS build có sẵn .br/.gz (asset_build.py) => gửi thẳng, Flask-Compress bỏ qua (đã có Content-Encoding)
     COMPRESS_MIMETYPES = [
         'text/html', 'text/css', 'text/xml', 'application/json',
         'application/javascript', 'text/javascript'
     ]
     COMPRESS_LEVEL = 6
-    COMPRESS_MIN_SIZE = 500
+    COMPRESS_MIN_SIZE = 500  # nhỏ hơn => không nén
+    # Body >= COMPRESS_LARGE_SIZE và dùng lại được (page cache / ETag) => nén mức cao (chỉ 1 lần nhờ cache)
+    COMPRESS_LARGE_SIZE = 16 * 1024
+    COMPRESS_LARGE_LEVEL = 9
+    COMPRESS_LARGE_BR_LEVEL = 9
+    # Cache body đã nén theo (hash body, encoding) - xem app/compression.py
+    COMPRESS_RESULT_CACHE_SIZE = int(os.environ.get('COMPRESS_RESULT_CACHE_SIZE', 256))  # số entry
+    COMPRESS_RESULT_CACHE_BYTES = int(os.environ.get('COMPRESS_RESULT_CACHE_BYTES', 8 * 1024 * 1024))
+    # Header X-Compress-Cache: HIT/MISS (debug) - luôn bật khi app.debug
+    COMPRESS_DEBUG_HEADER = os.environ.get('COMPRESS_DEBUG_HEADER', 'false').lower() == 'true'
 
     # ===== CACHING =====
-    CACHE_TYPE = 'simple'
+    # Mặc định LRU trong process (1 worker)
+    # Nhiều worker/instance: CACHE_TYPE=FileSystemCache + CACHE_DIR (dùng chung)
+    CACHE_TYPE = os.environ.get('CACHE_TYPE', 'app.caching.LRUCache')
+    CACHE_DIR = os.environ.get('CACHE_DIR', '/tmp/briconvn-cache')
+    CACHE_THRESHOLD = int(os.environ.get('CACHE_THRESHOLD', 300))  # số entry tối đa
     CACHE_DEFAULT_TIMEOUT = 300
+    # Tách key theo bản deploy (template/code mới => không dùng lại page cache/ETag cũ)
+    CACHE_KEY_PREFIX = f"briconvn:{os.environ.get('RENDER_GIT_COMMIT', '')[:7]}:"
+
+    # Page cache (toàn trang cho khách) - xem app/caching.py
+    PAGE_CACHE_ENABLED = os.environ.get('PAGE_CACHE_ENABLED', 'true').lower() == 'true'
+    PAGE_CACHE_TIMEOUT = int(os.environ.get('PAGE_CACHE_TIMEOUT', 600))
+
+    # Sitemap: số URL tối đa mỗi sitemap con (giới hạn giao thức 50.000) - xem app/sitemaps.py
+    SITEMAP_CHUNK_SIZE = int(os.environ.get('SITEMAP_CHUNK_SIZE', 10000))
+
+    # Search index chưa có => tự build ở thread nền (app/search.py), tắt => chỉ build bằng CLI
+    SEARCH_INDEX_AUTO_BUILD = os.environ.get('SEARCH_INDEX_AUTO_BUILD', 'true').lower() == 'true'
+
+    # Lượt xem: buffer trong RAM, ghi DB mỗi N giây (app/models/counters.py)
+    VIEW_COUNT_FLUSH_INTERVAL = int(os.environ.get('VIEW_COUNT_FLUSH_INTERVAL', 60))
 
     # ===== SECURITY / RATE LIMIT =====
     RATELIMIT_ENABLED = True
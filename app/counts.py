@@ -0,0 +1,128 @@
+"""
+Count service - COUNT(*) có cache cho phân trang + thống kê admin
+
+- cached_count(query): cache theo SQL + tham số, invalidate theo tag 'count:<Model>'
+  của mọi model có trong query (commit thay đổi model => đếm lại)
+- count_rows(Model, *điều kiện): tiện cho dict thống kê
+- Postgres + bảng lớn, không điều kiện: dùng ước lượng pg_class.reltuples
+  (không quét bảng); bảng nhỏ / DB khác => đếm chính xác (có cache)
+- cached_paginate(query, ...): như query.paginate() nhưng tổng số lấy từ cached_count
+
+Usage:
+    from app.counts import cached_paginate, count_rows
+
+    pagination = cached_paginate(query.order_by(...), page=page, per_page=20)
+    stats = {'unread': count_rows(Contact, Contact.is_read == False)}
+"""
+from flask_sqlalchemy.pagination import QueryPagination
+from sqlalchemy import func, select, text
+from sqlalchemy.sql.util import find_tables
+
+from app.models.events import after_commit_of
+
+_COUNT_PREFIX = 'count:'
+_TAG_PREFIX = 'count:'
+
+# Dưới ngưỡng này đếm chính xác (rẻ), trên ngưỡng mới dùng ước lượng reltuples
+ESTIMATE_MIN_ROWS = 10000
+
+
+def _tags(models):
+    return tuple(sorted(_TAG_PREFIX + model.__name__ for model in models))
+
+
+def _statement_models(statement):
+    """Các model có bảng nằm trong statement (FROM, JOIN, subquery)"""
+    from app import db
+
+    # So theo tên bảng (ORM statement chứa bản annotate của Table)
+    table_names = {
+        getattr(table, 'name', None)
+        for table in find_tables(statement, include_joins=True, include_aliases=True)
+    }
+    return {
+        mapper.class_ for mapper in db.Model.registry.mappers
+        if mapper.local_table.name in table_names
+    }
+
+
+def _cached(key_parts, tags, compute, timeout=None):
+    from app.caching import cached_value
+    return cached_value(_COUNT_PREFIX, key_parts, tags, compute, timeout)
+
+
+def cached_count(query, timeout=None):
+    """COUNT(*) của query (Query / select) có cache"""
+    from app import db
+
+    if hasattr(query, 'statement'):
+        statement = query.order_by(None).statement
+        compute = query.order_by(None).count
+    else:
+        statement = query.order_by(None)
+        compute = lambda: db.session.execute(  # noqa: E731
+            select(func.count()).select_from(statement.subquery())
+        ).scalar()
+
+    compiled = statement.compile(dialect=db.engine.dialect)
+    key_parts = [str(compiled), repr(sorted(compiled.params.items(), key=lambda item: item[0]))]
+    return _cached(key_parts, _tags(_statement_models(statement)), compute, timeout)
+
+
+def estimated_count(model):
+    """
+    Số row (ước lượng) của cả bảng
+    - Postgres: pg_class.reltuples nếu bảng đủ lớn (ANALYZE/autovacuum cập nhật)
+    - Còn lại: COUNT(*) chính xác có cache
+    """
+    from app import db
+
+    if db.engine.dialect.name != 'postgresql':
+        return cached_count(model.query)
+
+    def compute():
+        estimate = db.session.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+            {'table': model.__table__.fullname}
+        ).scalar()
+        if estimate is not None and estimate >= ESTIMATE_MIN_ROWS:
+            return int(estimate)
+        return model.query.count()
+
+    return _cached(['estimate', model.__table__.fullname], _tags([model]), compute)
+
+
+def count_rows(model, *criteria, estimate=False):
+    """
+    Đếm row của model theo điều kiện (có cache)
+    - estimate=True + không điều kiện => cho phép ước lượng (estimated_count)
+    """
+    if estimate and not criteria:
+        return estimated_count(model)
+    return cached_count(model.query.filter(*criteria))
+
+
+@after_commit_of()
+def _invalidate_counts(changed):
+    """Commit thay đổi model nào => bỏ count cache của model đó"""
+    from flask import has_app_context
+    from app.caching import invalidate_tags
+
+    if has_app_context():
+        invalidate_tags(*(_TAG_PREFIX + name for name in changed))
+
+
+# ==================== PAGINATION ====================
+class CachedCountPagination(QueryPagination):
+    """query.paginate() với tổng số từ cached_count (không COUNT mỗi trang)"""
+
+    def _query_count(self):
+        return cached_count(self._query_args['query'])
+
+
+def cached_paginate(query, page=None, per_page=None, error_out=False, max_per_page=100):
+    """Thay cho query.paginate(...) - cùng tham số"""
+    return CachedCountPagination(
+        query=query, page=page, per_page=per_page,
+        error_out=error_out, max_per_page=max_per_page,
+    )
@@ -0,0 +1,105 @@
+"""
+Facet service - số item theo từng giá trị lọc (danh mục, ...) cho sidebar filter
+
+- 1 query GROUP BY cho mọi giá trị (không COUNT / DISTINCT riêng từng facet)
+- Cache theo backend tìm kiếm + từ khóa đúng như lúc lọc (search_cache_key), invalidate theo tag model
+  => chỉ đếm lại sau khi Product / Category / Job được commit
+
+Usage:
+    from app.facets import product_category_facets, job_facets
+
+    facets = product_category_facets(search)
+    facets.total, facets.options  # [CategoryFacet(id, name, slug, count), ...]
+
+    facets = job_facets(department, location)
+    facets.total, facets.departments, facets.locations  # [FacetValue(value, count), ...]
+"""
+from collections import namedtuple
+
+from sqlalchemy import func
+
+_FACET_PREFIX = 'facet:'
+
+CategoryFacet = namedtuple('CategoryFacet', ['id', 'name', 'slug', 'count'])
+Facets = namedtuple('Facets', ['total', 'options'])
+FacetValue = namedtuple('FacetValue', ['value', 'count'])
+JobFacets = namedtuple('JobFacets', ['total', 'departments', 'locations'])
+
+
+# ==================== PRODUCT ====================
+def _product_category_counts(search):
+    """{category_id: số sản phẩm active} - 1 query GROUP BY (lọc thêm theo từ khóa nếu có)"""
+    from app import db
+    from app.models.product import Product
+    from app.search import apply_search
+
+    query = db.session.query(Product.category_id, func.count(Product.id)) \
+        .filter(Product.is_active == True)
+    if search:
+        query = apply_search(query, Product, search, rank=False)
+    return dict(query.group_by(Product.category_id).all())
+
+
+def product_category_facets(search=''):
+    """
+    Danh mục active + số sản phẩm active của từng danh mục (theo từ khóa hiện tại)
+    Returns: Facets(total, (CategoryFacet, ...)) - total gồm cả sản phẩm chưa có danh mục
+    """
+    from app.caching import cached_value
+    from app.models.product import get_active_categories
+    from app.search import search_cache_key
+
+    search = (search or '').strip()
+    counts = cached_value(
+        _FACET_PREFIX, ['product-category', search_cache_key(search) if search else ''], ('product', 'category'),
+        lambda: _product_category_counts(search)
+    )
+    options = tuple(
+        CategoryFacet(category.id, category.name, category.slug, counts.get(category.id, 0))
+        for category in get_active_categories()
+    )
+    return Facets(sum(counts.values()), options)
+
+
+# ==================== JOB ====================
+def _job_pair_counts():
+    """((phòng ban, địa điểm, số job active), ...) - 1 query GROUP BY"""
+    from app import db
+    from app.models.job import Job
+
+    rows = db.session.query(Job.department, Job.location, func.count(Job.id)) \
+        .filter(Job.is_active == True) \
+        .group_by(Job.department, Job.location).all()
+    return tuple(tuple(row) for row in rows)
+
+
+def _facet_values(pairs, index, other_index, other_value):
+    """Giá trị facet ở cột index + số job, lọc theo lựa chọn của facet còn lại"""
+    counts = {}
+    for row in pairs:
+        value = row[index]
+        if not value:
+            continue
+        counts.setdefault(value, 0)
+        if not other_value or row[other_index] == other_value:
+            counts[value] += row[2]
+    return tuple(FacetValue(value, count) for value, count in sorted(counts.items()))
+
+
+def job_facets(department='', location=''):
+    """
+    Phòng ban / địa điểm của job active + số job (đếm theo lựa chọn hiện tại của facet kia)
+    - total: số job khớp cả 2 lựa chọn
+    """
+    from app.caching import cached_value
+
+    pairs = cached_value(_FACET_PREFIX, ['job'], ('job',), _job_pair_counts)
+    total = sum(
+        count for dept, loc, count in pairs
+        if (not department or dept == department) and (not location or loc == location)
+    )
+    return JobFacets(
+        total=total,
+        departments=_facet_values(pairs, 0, 1, location),
+        locations=_facet_values(pairs, 1, 0, department),
+    )
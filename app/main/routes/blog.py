@@ -1,13 +1,20 @@
 from flask import render_template, request, redirect, url_for
 from app.main import main_bp
-from app import db
 from app.models.content import Blog, FAQ
 from app.models.settings import get_setting
-from sqlalchemy import or_
+from app.models.helpers import prefetch_media_seo
+from app.models.counters import count_view
+from app.caching import cached_page, conditional_page, page_not_modified
+from app.search import apply_search
+from app.counts import cached_paginate
+from app.pagination import KeysetOrder, keyset_paginate
+from app.related import related_items
+from app import lazy_request_value
 from sqlalchemy.orm import joinedload, load_only
 
 
 @main_bp.route('/tin-tuc')
+@cached_page('blog', 'media')
 def blog():
     """Trang danh sách blog"""
     page = request.args.get('page', 1, type=int)
@@ -25,26 +32,24 @@ def blog():
              .filter_by(is_active=True)
              )
 
-    # Search
+    # Search (search index, xếp theo độ liên quan, sau đó mới nhất)
     if search:
-        query = query.filter(
-            or_(
-                Blog.title.ilike(f'%{search}%'),
-                Blog.excerpt.ilike(f'%{search}%')
-            )
-        )
-
-    # Sắp xếp mới nhất
-    query = query.order_by(Blog.created_at.desc())
+        query = apply_search(query, Blog, search)
 
     # Phân trang
     per_page = 9
 
-    pagination = query.paginate(
-        page=page,
-        per_page=per_page,
-        error_out=False
-    )
+    if search:
+        # Xếp theo độ liên quan rồi mới nhất => OFFSET như cũ
+        pagination = cached_paginate(
+            query.order_by(Blog.created_at.desc()),
+            page=page,
+            per_page=per_page,
+            error_out=False
+        )
+    else:
+        # Mới nhất, phân trang keyset (?cursor=)
+        pagination = keyset_paginate(query, Blog, [KeysetOrder('created_at', True)], per_page=per_page)
 
     blogs = pagination.items
 
@@ -54,6 +59,8 @@ def blog():
                       .filter_by(is_featured=True, is_active=True)
                       ).limit(5).all()
 
+    prefetch_media_seo(blogs)
+
     return render_template('public/tin_tuc/blogs.html',
                            blogs=blogs,
                            pagination=pagination,
@@ -62,6 +69,7 @@ def blog():
 
 
 @main_bp.route('/tin-tuc/<slug>')
+@conditional_page('blog', 'media')
 def blog_detail(slug):
     """Trang chi tiết blog"""
     blog = (Blog.query
@@ -69,23 +77,25 @@ def blog_detail(slug):
             .filter_by(slug=slug, is_active=True)
             ).first_or_404()
 
-    # Tăng lượt xem
-    blog.views += 1
-    db.session.commit()
+    # Tăng lượt xem (write-behind, không commit trong request)
+    count_view(blog)
+
+    # Trình duyệt đã có bản mới nhất => 304, không render
+    not_modified = page_not_modified()
+    if not_modified:
+        return not_modified
 
-    # Bài viết liên quan
-    related_blogs = (Blog.query
-                     .options(load_only(Blog.slug, Blog.title, Blog.created_at, Blog.image))
-                     .filter(Blog.id != blog.id, Blog.is_active == True)
-                     .order_by(Blog.created_at.desc())
-                     ).limit(3).all()
+    prefetch_media_seo([blog])
 
+    # Bài viết liên quan: tính sẵn (app/related.py), lazy => fragment cache hit không query
     return render_template('public/tin_tuc/blog_detail.html',
                            blog=blog,
-                           related_blogs=related_blogs)
+                           related_blogs=lazy_request_value('related_blogs', lambda: prefetch_media_seo(
+                               related_items(blog, load_only(Blog.slug, Blog.title, Blog.created_at, Blog.image)))))
 
 
 @main_bp.route('/cau-hoi-thuong-gap')
+@cached_page('faq')
 def faq():
     """Trang câu hỏi thường gặp"""
     faqs = FAQ.query.filter_by(is_active=True).order_by(FAQ.order).all()
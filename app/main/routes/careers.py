@@ -1,49 +1,57 @@
 from flask import render_template, request, redirect, url_for
 from app.main import main_bp
-from app import db
 from app.models.job import Job
+from app.models.counters import count_view
+from app.caching import cached_page, conditional_page, page_not_modified
+from app.related import related_items
+from app.facets import job_facets
+from app import lazy_request_value
+
+# Số job tối đa hiển thị trên trang tuyển dụng
+CAREERS_MAX_JOBS = 50
 
 
 @main_bp.route('/tuyen-dung')
+@cached_page('job')
 def careers():
     """Trang tuyển dụng"""
     department = request.args.get('dept', '')
     location = request.args.get('loc', '')
 
-    query = Job.query.filter_by(is_active=True)
-
-    if department:
-        query = query.filter_by(department=department)
-    if location:
-        query = query.filter_by(location=location)
-
-    jobs = query.order_by(Job.is_urgent.desc(), Job.created_at.desc()).all()
+    # Phòng ban / địa điểm + số job: cache, chỉ đếm lại sau khi Job được commit
+    facets = job_facets(department, location)
 
-    # Lấy danh sách phòng ban và địa điểm unique
-    departments = db.session.query(Job.department).filter_by(is_active=True).distinct().all()
-    locations = db.session.query(Job.location).filter_by(is_active=True).distinct().all()
+    jobs = []
+    if facets.total:
+        query = Job.query.filter_by(is_active=True)
+        if department:
+            query = query.filter_by(department=department)
+        if location:
+            query = query.filter_by(location=location)
+        jobs = query.order_by(Job.is_urgent.desc(), Job.created_at.desc()).limit(CAREERS_MAX_JOBS).all()
 
     return render_template('public/tuyen_dung/careers.html',
                            jobs=jobs,
-                           departments=[d[0] for d in departments if d[0]],
-                           locations=[l[0] for l in locations if l[0]])
+                           total_jobs=facets.total,
+                           departments=facets.departments,
+                           locations=facets.locations)
 
 
 @main_bp.route('/tuyen-dung/<slug>')
+@conditional_page('job')
 def job_detail(slug):
     """Trang chi tiết tuyển dụng"""
     job = Job.query.filter_by(slug=slug, is_active=True).first_or_404()
 
-    # Tăng lượt xem
-    job.view_count += 1
-    db.session.commit()
+    # Tăng lượt xem (write-behind, không commit trong request)
+    count_view(job)
 
-    # Các vị trí khác
-    other_jobs = Job.query.filter(
-        Job.id != job.id,
-        Job.is_active == True
-    ).order_by(Job.is_urgent.desc()).limit(5).all()
+    # Trình duyệt đã có bản mới nhất => 304, không render
+    not_modified = page_not_modified()
+    if not_modified:
+        return not_modified
 
+    # Các vị trí khác: tính sẵn (app/related.py), lazy => chỉ query khi template dùng
     return render_template('public/tuyen_dung/job_detail.html',
                            job=job,
-                           other_jobs=other_jobs)
\ No newline at end of file
+                           other_jobs=lazy_request_value('other_jobs', lambda: related_items(job)))
\ No newline at end of file
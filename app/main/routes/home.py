@@ -7,41 +7,66 @@ from app.models.product import Product
 from app.models.media import Banner, Project
 from app.models.content import Blog
 from sqlalchemy.orm import load_only
-from app.models.settings import get_setting
+from app.models.settings import get_settings
+from app.models.helpers import prefetch_media_seo
+from app.caching import cached_page
+from app import lazy_request_value
 
 
 @main_bp.route('/')
+@cached_page('banner', 'product', 'blog', 'project', 'media')
 def index():
-    """Trang chủ"""
-    # Lấy banners đang active
+    """
+    Trang chủ
+    - Dữ liệu từng section là lazy: chỉ query khi section thực sự render
+    - Section đã có trong fragment cache ({% cache %} ở index.html) => không query
+    """
+    return render_template('public/index.html',
+                           banners=lazy_request_value('home_banners', _load_banners),
+                           featured_products=lazy_request_value('home_featured_products',
+                                                                _load_featured_products),
+                           featured_blogs=lazy_request_value('home_featured_blogs', _load_featured_blogs),
+                           featured_projects=lazy_request_value('home_featured_projects',
+                                                                _load_featured_projects))
+
+
+# ==================== HOME SECTIONS (lazy loaders) ====================
+def _load_banners():
+    """Banners đang active"""
     banners = Banner.query.filter_by(is_active=True).order_by(Banner.order).all()
+    prefetch_media_seo(banners)
+    return banners
+
 
-    # Lấy sản phẩm nổi bật (featured)
-    featured_products = Product.query.filter_by(
+def _load_featured_products():
+    """Sản phẩm nổi bật (featured)"""
+    products = Product.query.filter_by(
         is_featured=True,
         is_active=True
     ).limit(6).all()
-
-    # Lấy sản phẩm mới nhất
-    latest_products = Product.query.filter_by(
-        is_active=True
-    ).order_by(Product.created_at.desc()).limit(6).all()
-
-    # Lấy tin tức nổi bật
-    featured_blogs = (Blog.query
-                      .options(load_only(Blog.slug, Blog.title, Blog.created_at, Blog.image))
-                      .filter_by(is_featured=True, is_active=True)
-                      ).limit(3).all()
-
-    featured_projects = Project.query.filter_by(is_featured=True, is_active=True).order_by(
+    prefetch_media_seo(products)
+    return products
+
+
+def _load_featured_blogs():
+    """Tin tức nổi bật"""
+    # load_only đủ các cột card_blog.html + get_media_seo_info() dùng (tránh lazy-load từng cột)
+    blogs = (Blog.query
+             .options(load_only(Blog.slug, Blog.title, Blog.created_at, Blog.updated_at,
+                                Blog.image, Blog.excerpt, Blog.author, Blog.is_featured,
+                                Blog.image_alt_text, Blog.image_title, Blog.image_caption))
+             .filter_by(is_featured=True, is_active=True)
+             ).limit(3).all()
+    prefetch_media_seo(blogs)
+    return blogs
+
+
+def _load_featured_projects():
+    """Dự án nổi bật"""
+    projects = Project.query.filter_by(is_featured=True, is_active=True).order_by(
         Project.created_at.desc()).limit(6).all()
-
-    return render_template('public/index.html',
-                           banners=banners,
-                           featured_products=featured_products,
-                           latest_products=latest_products,
-                           featured_blogs=featured_blogs,
-                           featured_projects=featured_projects)
+    prefetch_media_seo(projects)
+    return projects
 
 
 @main_bp.route('/gioi-thieu')
@@ -52,38 +77,46 @@ def about():
 
 @main_bp.route('/chinh-sach', defaults={'policy_slug': None})
 @main_bp.route('/chinh-sach/<policy_slug>')
+@cached_page()
 def policy(policy_slug):
     """
     Hiển thị trang chính sách.
     Nếu có policy_slug, chỉ hiển thị chính sách đó.
     Nếu không, hiển thị chính sách đầu tiên có nội dung.
     """
-    # Lấy tất cả các cài đặt chính sách từ DB
+    # Lấy tất cả các cài đặt chính sách (1 lần từ settings snapshot)
+    contents = get_settings({
+        'terms_of_service': '',
+        'shipping_policy': '',
+        'return_policy': '',
+        'warranty_policy': '',
+        'privacy_policy': '',
+    })
     all_policies_settings = {
         'dieu-khoan-dich-vu': {
             'name': 'Điều khoản dịch vụ',
             'icon': 'bi-file-earmark-text',
-            'content': get_setting('terms_of_service', '')
+            'content': contents['terms_of_service']
         },
         'van-chuyen': {
             'name': 'Chính sách vận chuyển',
             'icon': 'bi-truck',
-            'content': get_setting('shipping_policy', '')
+            'content': contents['shipping_policy']
         },
         'doi-tra': {
             'name': 'Chính sách đổi trả',
             'icon': 'bi-arrow-repeat',
-            'content': get_setting('return_policy', '')
+            'content': contents['return_policy']
         },
         'bao-hanh': {
             'name': 'Chính sách bảo hành',
             'icon': 'bi-shield-check',
-            'content': get_setting('warranty_policy', '')
+            'content': contents['warranty_policy']
         },
         'bao-mat': {
             'name': 'Chính sách bảo mật',
             'icon': 'bi-lock',
-            'content': get_setting('privacy_policy', '')
+            'content': contents['privacy_policy']
         }
     }
 
@@ -1,9 +1,12 @@
-from flask import render_template, request, redirect, url_for, send_from_directory, current_app, abort
+from flask import render_template, request, redirect, url_for, current_app, abort, jsonify
 from app.main import main_bp
 from app.models.product import Product
 from app.models.content import Blog
-from sqlalchemy import or_
-import os
+from app.models.helpers import prefetch_media_seo
+from app.models.settings import get_setting
+from app.caching import not_modified, not_modified_response, set_validators
+from app.search import apply_search, suggest
+from app.sitemaps import sitemap_index, sitemap_part
 
 
 @main_bp.route('/tim-kiem')
@@ -14,27 +17,53 @@ def search():
     if not keyword:
         return redirect(url_for('main.index'))
 
-    # Tìm sản phẩm
-    products = Product.query.filter(
-        Product.name.ilike(f'%{keyword}%'),
-        Product.is_active == True
+    # Tìm sản phẩm (search index, xếp theo độ liên quan)
+    products = apply_search(
+        Product.query.filter(Product.is_active == True),
+        Product, keyword
     ).limit(10).all()
 
     # Tìm blog
-    blogs = Blog.query.filter(
-        or_(
-            Blog.title.ilike(f'%{keyword}%'),
-            Blog.excerpt.ilike(f'%{keyword}%')
-        ),
-        Blog.is_active == True
+    blogs = apply_search(
+        Blog.query.filter(Blog.is_active == True),
+        Blog, keyword
     ).limit(5).all()
 
+    prefetch_media_seo(products, blogs)
+
     return render_template('public/search.html',
                            keyword=keyword,
                            products=products,
                            blogs=blogs)
 
 
+# Endpoint tương ứng từng loại gợi ý
+SUGGEST_URLS = {
+    'category': lambda slug: url_for('main.products', category_slug=slug),
+    'product': lambda slug: url_for('main.product_detail', slug=slug),
+    'project': lambda slug: url_for('main.project_detail', slug=slug),
+    'blog': lambda slug: url_for('main.blog_detail', slug=slug),
+}
+
+
+@main_bp.route('/api/suggest')
+def api_suggest():
+    """Gợi ý tìm kiếm khi gõ (prefix index trong RAM, không query DB)"""
+    keyword = request.args.get('q', '')[:100]
+    limit = min(request.args.get('limit', 8, type=int), 20)
+
+    items = [{
+        'type': entry.type,
+        'title': entry.title,
+        'url': SUGGEST_URLS[entry.type](entry.slug),
+    } for entry in suggest(keyword, limit=limit)]
+
+    response = jsonify({'query': keyword, 'suggestions': items})
+    response.cache_control.public = True
+    response.cache_control.max_age = 60
+    return response
+
+
 # Route cũ redirect sang mới
 @main_bp.route('/search')
 def old_search():
@@ -43,21 +72,35 @@ def old_search():
     return redirect(url_for('main.search', q=keyword), code=301)
 
 
+def _xml_response(result, mimetype='application/xml'):
+    """Response XML + ETag/Last-Modified (khớp => 304)"""
+    if result is None:
+        abort(404)
+    body, etag, last_modified = result
+    if not_modified(etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    response = current_app.response_class(body, mimetype=mimetype)
+    return set_validators(response, etag, last_modified)
+
+
 @main_bp.route('/sitemap.xml')
 def sitemap():
-    """Phục vụ file sitemap.xml"""
-    sitemap_path = os.path.join(current_app.static_folder, 'sitemap.xml')
-    if os.path.exists(sitemap_path):
-        return send_from_directory(current_app.static_folder, 'sitemap.xml', mimetype='application/xml')
-    else:
-        abort(404, description="Sitemap not found")
+    """Sitemap index (tạo theo yêu cầu, cache theo lastmod nội dung)"""
+    return _xml_response(sitemap_index())
+
+
+@main_bp.route('/sitemap-<section>-<int:page>.xml')
+def sitemap_chunk(section, page):
+    """Sitemap con: trang tĩnh / sản phẩm / tin tức / dự án, mỗi chunk tối đa SITEMAP_CHUNK_SIZE URL"""
+    return _xml_response(sitemap_part(section, page))
 
 
 @main_bp.route('/robots.txt')
 def robots_txt():
-    """Phục vụ file robots.txt"""
-    robots_path = os.path.join(current_app.static_folder, 'robots.txt')
-    if os.path.exists(robots_path):
-        return send_from_directory(current_app.static_folder, 'robots.txt', mimetype='text/plain')
-    else:
-        abort(404, description="Robots.txt not found")
\ No newline at end of file
+    """robots.txt (tạo theo main_url hiện tại, không ghi file)"""
+    main_url = get_setting('main_url', request.url_root).rstrip('/')
+    content = f"User-agent: *\nDisallow: /admin/\nAllow: /\n\nSitemap: {main_url}/sitemap.xml\n"
+    response = current_app.response_class(content, mimetype='text/plain')
+    response.cache_control.public = True
+    response.cache_control.max_age = 3600
+    return response
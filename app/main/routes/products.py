@@ -1,15 +1,33 @@
-from flask import render_template, request, redirect, url_for, flash
+from flask import render_template, request, redirect, url_for, flash, abort
 from app.main import main_bp
-from app import db
-from app.models.product import Product, Category
-from app.models.settings import get_setting
+from app.models.product import Product, Category, get_active_category
+from app.models.settings import get_setting, get_settings
+from app.models.helpers import prefetch_media_seo
+from app.models.counters import count_view
+from app.caching import cached_page, conditional_page, page_not_modified
+from app.search import apply_search
+from app.counts import cached_paginate
+from app.pagination import KeysetOrder, keyset_paginate
+from app.related import related_items
+from app.facets import product_category_facets
+from app import lazy_request_value
 from sqlalchemy.orm import joinedload, load_only
 from jinja2 import Template
 from datetime import datetime, timedelta
 
 
+# sort => thứ tự keyset (tự thêm id làm tiêu chí phụ)
+PRODUCT_SORTS = {
+    'latest': [KeysetOrder('created_at', True)],
+    'price_asc': [KeysetOrder('price', False, 0)],
+    'price_desc': [KeysetOrder('price', True, 0)],
+    'popular': [KeysetOrder('views', True, 0)],
+}
+
+
 @main_bp.route('/san-pham')
 @main_bp.route('/loai-san-pham/<category_slug>')
+@cached_page('product', 'media')
 def products(category_slug=None):
     """Trang danh sách sản phẩm với filter"""
     page = request.args.get('page', 1, type=int)
@@ -58,41 +76,42 @@ def products(category_slug=None):
 
     # Filter theo danh mục slug
     if category_slug:
-        current_category = Category.query.filter_by(
-            slug=category_slug,
-            is_active=True
-        ).first_or_404()
+        current_category = get_active_category(category_slug)
+        if current_category is None:
+            abort(404)
         query = query.filter_by(category_id=current_category.id)
 
-    # Search theo tên
-    if search:
-        query = query.filter(Product.name.ilike(f'%{search}%'))
-
-    # Sắp xếp
-    if sort == 'latest':
-        query = query.order_by(Product.created_at.desc())
-    elif sort == 'price_asc':
-        query = query.order_by(Product.price.asc())
-    elif sort == 'price_desc':
-        query = query.order_by(Product.price.desc())
-    elif sort == 'popular':
-        query = query.order_by(Product.views.desc())
-
     # Phân trang
     per_page = 6
+    ranked = bool(search) and 'sort' not in request.args
 
-    pagination = query.paginate(
-        page=page,
-        per_page=per_page,
-        error_out=False
-    )
+    # Search (search index) - không chọn sort => xếp theo độ liên quan trước
+    if search:
+        query = apply_search(query, Product, search, rank=ranked)
+
+    if ranked:
+        # Thứ tự theo độ liên quan (không seek được) => OFFSET như cũ
+        pagination = cached_paginate(
+            query.order_by(Product.created_at.desc()),
+            page=page,
+            per_page=per_page,
+            error_out=False
+        )
+    else:
+        # Sắp xếp + phân trang keyset (?cursor=)
+        pagination = keyset_paginate(query, Product, PRODUCT_SORTS.get(sort, PRODUCT_SORTS['latest']),
+                                     per_page=per_page)
 
     products = pagination.items
-    categories = Category.query.filter_by(is_active=True).all()
+    prefetch_media_seo(products)
+
+    # Danh mục + số sản phẩm theo từ khóa hiện tại (1 query GROUP BY, có cache)
+    facets = product_category_facets(search)
 
     return render_template('public/san_pham/products.html',
                            products=products,
-                           categories=categories,
+                           categories=facets.options,
+                           total_products=facets.total,
                            pagination=pagination,
                            current_category=current_category,
                            current_search=search,
@@ -100,28 +119,32 @@ def products(category_slug=None):
 
 
 @main_bp.route('/san-pham/<slug>')
+@conditional_page('product', 'media')
 def product_detail(slug):
     """Trang chi tiết sản phẩm với render động meta description"""
     product = Product.query.options(joinedload(Product.category)) \
         .filter_by(slug=slug, is_active=True).first_or_404()
 
-    # Tăng lượt xem
-    product.views += 1
-    db.session.commit()
+    # Tăng lượt xem (write-behind, không commit trong request)
+    count_view(product)
+
+    # Trình duyệt đã có bản mới nhất => 304, không render
+    not_modified = page_not_modified()
+    if not_modified:
+        return not_modified
 
-    # Lấy sản phẩm liên quan (cùng danh mục)
-    related_products = Product.query.options(joinedload(Product.category)) \
-        .filter(
-        Product.category_id == product.category_id,
-        Product.id != product.id,
-        Product.is_active == True
-    ).limit(4).all()
+    prefetch_media_seo([product])
 
     # ✅ XỬ LÝ META DESCRIPTION ĐỘNG
     rendered_meta_description = None
 
-    # Lấy template từ settings
-    meta_template = get_setting('product_meta_description', '')
+    # Lấy template + tên website từ settings (1 lần)
+    seo_settings = get_settings({
+        'product_meta_description': '',
+        'website_name': 'BRICON VIỆT NAM',
+    })
+    meta_template = seo_settings['product_meta_description']
+    website_name = seo_settings['website_name']
 
     if meta_template and ('{{' in meta_template or '{%' in meta_template):
         try:
@@ -137,17 +160,19 @@ def product_detail(slug):
             rendered_meta_description = meta_template.replace('{{ product.name }}', product.name or '')
             rendered_meta_description = rendered_meta_description.replace(
                 '{{ get_setting(\'website_name\', \'BRICON VIỆT NAM\') }}',
-                get_setting('website_name', 'BRICON VIỆT NAM'))
+                website_name)
     elif meta_template:
         # Template không có biến động
         rendered_meta_description = meta_template
     else:
         # Fallback mặc định nếu không có template
-        rendered_meta_description = f"Mua {product.name} chất lượng cao từ {get_setting('website_name', 'BRICON VIỆT NAM')} với giá tốt nhất."
+        rendered_meta_description = f"Mua {product.name} chất lượng cao từ {website_name} với giá tốt nhất."
 
+    # Sản phẩm liên quan: tính sẵn (app/related.py), lazy => fragment cache hit không query
     return render_template('public/san_pham/product_detail.html',
                            product=product,
-                           related_products=related_products,
+                           related_products=lazy_request_value('related_products', lambda: prefetch_media_seo(
+                               related_items(product, joinedload(Product.category)))),
                            rendered_meta_description=rendered_meta_description,
                            now=datetime.now(),
                            timedelta=timedelta)
\ No newline at end of file
@@ -1,12 +1,17 @@
 from flask import render_template, request, redirect, url_for
 from app.main import main_bp
-from app import db
 from app.models.media import Project
 from app.project_config import PROJECT_TYPES
+from app.models.counters import count_view
 from sqlalchemy.orm import load_only
+from app.caching import cached_page, conditional_page, page_not_modified
+from app.pagination import KeysetOrder, keyset_paginate
+from app.related import related_items
+from app import lazy_request_value
 
 
 @main_bp.route('/du-an')
+@cached_page('project', 'media')
 def projects():
     """Trang danh sách dự án"""
     page = request.args.get('page', 1, type=int)
@@ -26,9 +31,8 @@ def projects():
     if project_type:
         query = query.filter_by(project_type=project_type)
 
-    projects = query.order_by(Project.year.desc()).paginate(
-        page=page, per_page=12, error_out=False
-    )
+    # Năm mới nhất trước, phân trang keyset (?cursor=)
+    projects = keyset_paginate(query, Project, [KeysetOrder('year', True, 0)], per_page=12)
 
     featured_projects = (Project.query
                          .options(load_only(Project.slug, Project.title, Project.image))
@@ -43,24 +47,21 @@ def projects():
 
 
 @main_bp.route('/du-an/<slug>')
+@conditional_page('project', 'media')
 def project_detail(slug):
     """Trang chi tiết dự án"""
     project = Project.query.filter_by(slug=slug, is_active=True).first_or_404()
 
-    # Tăng lượt xem
-    project.view_count += 1
-    db.session.commit()
+    # Tăng lượt xem (write-behind, không commit trong request)
+    count_view(project)
 
-    # Dự án liên quan
-    related = (Project.query
-    .options(load_only(Project.slug, Project.title, Project.image, Project.location))
-    .filter(
-        Project.id != project.id,
-        Project.project_type == project.project_type,
-        Project.is_active == True
-    )
-    ).limit(2).all()
+    # Trình duyệt đã có bản mới nhất => 304, không render
+    not_modified = page_not_modified()
+    if not_modified:
+        return not_modified
 
+    # Dự án liên quan: tính sẵn (app/related.py), lazy => fragment cache hit không query
     return render_template('public/du_an/project_detail.html',
                            project=project,
-                           related=related)
\ No newline at end of file
+                           related=lazy_request_value('related_projects', lambda: related_items(
+                               project, load_only(Project.slug, Project.title, Project.image, Project.location))))
\ No newline at end of file
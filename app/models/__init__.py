@@ -9,7 +9,10 @@ from app.models.media import Banner, Media, Project
 from app.models.job import Job
 from app.models.quiz import Quiz, Question, Answer, QuizAttempt, UserAnswer
 from app.models.contact import Contact
-from app.models.settings import Settings, get_setting, set_setting
+from app.models.settings import (
+    Settings, get_setting, get_settings, set_setting, set_settings,
+    clear_settings_cache
+)
 
 __all__ = [
     # Auth
@@ -27,5 +30,6 @@ __all__ = [
     # Contact
     'Contact',
     # Settings
-    'Settings', 'get_setting', 'set_setting'
+    'Settings', 'get_setting', 'get_settings', 'set_setting', 'set_settings',
+    'clear_settings_cache'
 ]
@@ -58,8 +58,8 @@ class Blog(db.Model):
         if not self.image:
             return None
 
-        from app.models.helpers import get_media_by_image_url
-        media = get_media_by_image_url(self.image)
+        from app.models.helpers import resolve_media
+        media = resolve_media(self, self.image)
 
         if media:
             return {
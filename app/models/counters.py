@@ -0,0 +1,146 @@
+"""
+View counters (write-behind)
+
+Trang chi tiết không còn `obj.views += 1; db.session.commit()` mỗi lượt xem:
+- count_view(obj): cộng dồn vào buffer trong RAM (thread-safe), không đụng DB
+- flush_view_counts(): gom buffer => executemany
+    UPDATE <bảng> SET views = COALESCE(views, 0) + :n WHERE id = :id
+  (cộng trong SQL => không mất lượt xem khi nhiều request đồng thời)
+- Tự flush định kỳ bằng thread nền (VIEW_COUNT_FLUSH_INTERVAL giây)
+  và khi worker thoát (gunicorn worker_exit / atexit)
+
+Usage:
+    from app.models.counters import count_view
+    count_view(product)
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from sqlalchemy import bindparam
+from sqlalchemy.orm.attributes import set_committed_value
+
+logger = logging.getLogger(__name__)
+
+# Tên model => cột đếm lượt xem
+COUNTER_COLUMNS = {
+    'Product': 'views',
+    'Blog': 'views',
+    'Project': 'view_count',
+    'Job': 'view_count',
+}
+
+# {(tên model, id): số lượt chưa ghi DB}
+_PENDING = defaultdict(int)
+_PENDING_LOCK = threading.Lock()
+
+_FLUSHER = None
+_FLUSHER_LOCK = threading.Lock()
+
+
+def count_view(obj):
+    """
+    Ghi nhận 1 lượt xem cho obj (Product/Blog/Project/Job)
+    - Giá trị hiển thị trên obj = giá trị DB + lượt đang chờ ghi (không làm obj dirty)
+    """
+    model_name = type(obj).__name__
+    column = COUNTER_COLUMNS[model_name]
+    key = (model_name, obj.id)
+
+    with _PENDING_LOCK:
+        _PENDING[key] += 1
+        pending = _PENDING[key]
+
+    set_committed_value(obj, column, (getattr(obj, column) or 0) + pending)
+    _ensure_flusher()
+
+
+def pending_view_counts():
+    """Bản sao buffer hiện tại (debug / thống kê)"""
+    with _PENDING_LOCK:
+        return dict(_PENDING)
+
+
+def flush_view_counts(app=None):
+    """
+    Ghi toàn bộ buffer xuống DB - 1 executemany UPDATE cho mỗi model
+    - Lỗi => rollback, trả lượt xem lại buffer để lần sau ghi tiếp
+    Returns: số row đã cập nhật
+    """
+    with _PENDING_LOCK:
+        if not _PENDING:
+            return 0
+        batch = dict(_PENDING)
+        _PENDING.clear()
+
+    if app is None:
+        return _write(batch)
+    with app.app_context():
+        return _write(batch)
+
+
+def _write(batch):
+    from app import db
+    from app import models
+
+    by_model = defaultdict(list)
+    for (model_name, obj_id), n in batch.items():
+        by_model[model_name].append({'_id': obj_id, '_n': n})
+
+    try:
+        for model_name, params in by_model.items():
+            table = getattr(models, model_name).__table__
+            column = table.c[COUNTER_COLUMNS[model_name]]
+            values = {column.name: db.func.coalesce(column, 0) + bindparam('_n')}
+            if 'updated_at' in table.c:
+                # Lượt xem không phải chỉnh sửa nội dung => giữ nguyên updated_at (onupdate)
+                values['updated_at'] = table.c.updated_at
+            stmt = table.update().where(table.c.id == bindparam('_id')).values(values)
+            db.session.execute(stmt, params)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        logger.exception('Flush view counts failed, giữ lại %d row trong buffer', len(batch))
+        with _PENDING_LOCK:
+            for key, n in batch.items():
+                _PENDING[key] += n
+        return 0
+
+    return len(batch)
+
+
+# ==================== BACKGROUND FLUSHER ====================
+def _ensure_flusher():
+    """
+    Khởi động thread flush định kỳ (lazy, lần đầu có lượt xem)
+    - Lazy để thread chạy trong worker (gunicorn preload_app fork xong mới có lượt xem)
+    """
+    global _FLUSHER
+    if _FLUSHER is not None and _FLUSHER.is_alive():
+        return
+
+    from flask import current_app
+    app = current_app._get_current_object()
+
+    with _FLUSHER_LOCK:
+        if _FLUSHER is not None and _FLUSHER.is_alive():
+            return
+        if _FLUSHER is None:
+            atexit.register(flush_view_counts, app)
+        interval = app.config.get('VIEW_COUNT_FLUSH_INTERVAL', 60)
+        _FLUSHER = threading.Thread(
+            target=_flush_loop, args=(app, interval),
+            name='view-counter-flush', daemon=True
+        )
+        _FLUSHER.start()
+
+
+def _flush_loop(app, interval):
+    while True:
+        time.sleep(interval)
+        try:
+            flush_view_counts(app)
+        except Exception:
+            logger.exception('View counter flush loop error')
@@ -0,0 +1,118 @@
+"""
+Model change events (after-commit hooks)
+
+Gom các model bị thay đổi trong 1 transaction rồi gọi callback SAU KHI
+commit thành công => cache chỉ bị xóa khi dữ liệu đã thực sự nằm trong DB.
+Rollback => bỏ qua, cache giữ nguyên.
+
+Usage:
+    from app.models.events import after_commit_of
+
+    @after_commit_of('Category', 'Product')
+    def _invalidate(changed):
+        # changed: set tên model thay đổi, vd {'Product'}
+        clear_my_cache()
+
+    # Cần biết row nào thay đổi (vd: cập nhật search index)
+    @after_commit_of('Product', rows=True)
+    def _reindex(changed, rows):
+        # rows: {'Product': {id: True nếu bị xóa}}
+        # id None = bulk query.update()/delete() không rõ row => xử lý toàn bộ
+        ...
+"""
+import logging
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# [(tuple tên model, callback, có truyền rows hay không)]
+_LISTENERS = []
+
+_INFO_KEY = 'changed_models'
+_ROWS_KEY = 'changed_rows'
+
+# Cột bộ đếm (lượt xem) - thay đổi CHỈ ở các cột này không tính là nội dung thay đổi
+# => xem trang chi tiết không làm mất cache danh sách / trang
+COUNTER_COLUMNS = frozenset({'views', 'view_count'})
+
+
+def after_commit_of(*model_names, rows=False):
+    """
+    Đăng ký callback chạy sau commit có thay đổi trên các model chỉ định
+    - Không truyền tên model => mọi model
+    - rows=True: callback(changed, rows) kèm id các row thay đổi
+    """
+    def decorator(callback):
+        _LISTENERS.append((frozenset(model_names), callback, rows))
+        return callback
+    return decorator
+
+
+def _mark(session, model_name, obj_id=None, deleted=False):
+    session.info.setdefault(_INFO_KEY, set()).add(model_name)
+    model_rows = session.info.setdefault(_ROWS_KEY, {}).setdefault(model_name, {})
+    model_rows[obj_id] = deleted
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_flushed(session, flush_context):
+    """Ghi nhận các model có INSERT/UPDATE/DELETE trong lần flush này"""
+    for obj in session.new:
+        _mark(session, type(obj).__name__, _identity(obj))
+    for obj in session.deleted:
+        _mark(session, type(obj).__name__, _identity(obj), deleted=True)
+    for obj in session.dirty:
+        if _content_changed(obj):
+            _mark(session, type(obj).__name__, _identity(obj))
+
+
+def _identity(obj):
+    """Primary key (1 cột) của obj, None nếu không xác định"""
+    # after_flush: row mới đã có id nhưng chưa có identity key => đọc từ thuộc tính
+    primary_key = inspect(obj).mapper.primary_key_from_instance(obj)
+    return primary_key[0] if len(primary_key) == 1 else None
+
+
+def _content_changed(obj):
+    """True nếu obj có thay đổi ngoài các cột bộ đếm"""
+    changed = {
+        attr.key for attr in inspect(obj).attrs
+        if attr.history.has_changes()
+    }
+    return bool(changed - COUNTER_COLUMNS)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _collect_bulk(orm_execute_state):
+    """Ghi nhận query.update()/query.delete() (không đi qua flush)"""
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None:
+            _mark(orm_execute_state.session, mapper.class_.__name__)
+
+
+@event.listens_for(Session, 'after_commit')
+def _dispatch(session):
+    changed = session.info.pop(_INFO_KEY, None)
+    changed_rows = session.info.pop(_ROWS_KEY, {})
+    if not changed:
+        return
+    for model_names, callback, with_rows in _LISTENERS:
+        hit = model_names & changed if model_names else changed
+        if hit:
+            try:
+                if with_rows:
+                    callback(hit, {name: changed_rows.get(name, {}) for name in hit})
+                else:
+                    callback(hit)
+            except Exception:
+                # Dữ liệu đã commit xong - lỗi xóa cache không được làm hỏng request
+                logger.exception('after_commit callback %r failed', callback)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard(session):
+    session.info.pop(_INFO_KEY, None)
+    session.info.pop(_ROWS_KEY, None)
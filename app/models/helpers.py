@@ -1,8 +1,82 @@
 """
 Helper functions cho models
 """
+import hashlib
+import re
+from urllib.parse import urlsplit
+
+from sqlalchemy import or_
+
 from app.models.media import Media
 
+# Các field ảnh có get_media_seo_info() tương ứng
+_IMAGE_FIELDS = ('image', 'image_mobile')
+
+# Segment transformation của Cloudinary: w_300,h_200,c_fill / f_auto / q_auto ...
+_CLOUDINARY_TRANSFORM = re.compile(r'^[a-z]{1,3}_[^/]*$')
+_CLOUDINARY_VERSION = re.compile(r'^v\d+$')
+
+
+def _normalize_local_path(image_url):
+    """uploads/a.jpg, /uploads/a.jpg -> /static/uploads/a.jpg"""
+    normalized_path = image_url
+    if not normalized_path.startswith('/'):
+        normalized_path = '/' + normalized_path
+    if not normalized_path.startswith('/static/'):
+        if normalized_path.startswith('/uploads/'):
+            normalized_path = '/static' + normalized_path
+        else:
+            normalized_path = '/static/' + normalized_path.lstrip('/')
+    return normalized_path
+
+
+def _is_remote(image_url):
+    return image_url.startswith('http://') or image_url.startswith('https://')
+
+
+def canonical_image_url(image_url):
+    """
+    Chuẩn hóa image URL về 1 dạng duy nhất
+
+    - Cloudinary: 'cloudinary:<public_id>' (bỏ version, transformation, đuôi file)
+        https://res.cloudinary.com/x/image/upload/v1759825641/enterprise/general/a.png
+        -> cloudinary:enterprise/general/a
+    - Local: 'local:/static/...'
+        uploads/products/a.jpg -> local:/static/uploads/products/a.jpg
+    - URL khác: 'url:<host>/<path>' (bỏ scheme + query)
+
+    Returns: str hoặc None nếu image_url rỗng
+    """
+    if not image_url:
+        return None
+
+    image_url = image_url.strip()
+
+    if not _is_remote(image_url):
+        path = image_url.split('?', 1)[0].split('#', 1)[0]
+        return 'local:' + _normalize_local_path(path)
+
+    parts = urlsplit(image_url)
+
+    if parts.netloc == 'res.cloudinary.com' and '/upload/' in parts.path:
+        segments = parts.path.split('/upload/', 1)[1].split('/')
+        # Bỏ transformation + version đứng trước public_id
+        while len(segments) > 1 and (_CLOUDINARY_TRANSFORM.match(segments[0])
+                                     or _CLOUDINARY_VERSION.match(segments[0])):
+            segments = segments[1:]
+        public_id = '/'.join(segments).rsplit('.', 1)[0]
+        return 'cloudinary:' + public_id
+
+    return f'url:{parts.netloc}{parts.path}'
+
+
+def image_url_key(image_url):
+    """Hash (sha1 hex, 40 ký tự) của canonical URL - giá trị cột Media.url_key"""
+    canonical = canonical_image_url(image_url)
+    if canonical is None:
+        return None
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
 
 def get_media_by_image_url(image_url):
     """
@@ -13,33 +87,118 @@ def get_media_by_image_url(image_url):
     - /static/uploads/products/image.jpg (Local)
     - uploads/products/image.jpg (Local không có /)
 
+    => Tất cả quy về image_url_key(), tra bằng 1 lần dò unique index url_key
+    => Không thấy (record chưa backfill url_key) thì tra kiểu cũ theo filename/filepath
+
     Returns: Media object hoặc None
     """
-    if not image_url:
+    key = image_url_key(image_url)
+    if key is None:
         return None
+    media = Media.query.filter_by(url_key=key).first()
+    if media:
+        return media
+    return _legacy_media_lookup(image_url)
+
 
-    # Case 1: URL Cloudinary đầy đủ - tìm theo filepath
-    if image_url.startswith('http://') or image_url.startswith('https://'):
+def _legacy_media_lookup(image_url):
+    """Tra Media theo filepath (Cloudinary) hoặc filename -> filepath (local) - cách tra cũ"""
+    if _is_remote(image_url):
         return Media.query.filter_by(filepath=image_url).first()
 
-    # Case 2: Local path - tìm theo filename
-    # Lấy tên file: /static/uploads/products/abc.jpg → abc.jpg
     filename = image_url.split('/')[-1]
-
-    # Tìm theo filename (ưu tiên)
     media = Media.query.filter_by(filename=filename).first()
-
     if media:
         return media
 
-    # Case 3: Nếu không tìm thấy, thử chuẩn hóa path và tìm lại
-    normalized_path = image_url
-    if not normalized_path.startswith('/'):
-        normalized_path = '/' + normalized_path
-    if not normalized_path.startswith('/static/'):
-        if normalized_path.startswith('/uploads/'):
-            normalized_path = '/static' + normalized_path
+    return Media.query.filter_by(filepath=_normalize_local_path(image_url)).first()
+
+
+def _legacy_media_batch(urls):
+    """
+    _legacy_media_lookup() cho nhiều URL trong 1 query
+    Returns: {image_url: Media} (chỉ các URL tìm thấy)
+    """
+    filepaths = set()
+    filenames = set()
+    for url in urls:
+        if _is_remote(url):
+            filepaths.add(url)
         else:
-            normalized_path = '/static/' + normalized_path.lstrip('/')
+            filenames.add(url.split('/')[-1])
+            filepaths.add(_normalize_local_path(url))
+
+    by_filepath = {}
+    by_filename = {}
+    for media in Media.query.filter(or_(Media.filepath.in_(filepaths),
+                                        Media.filename.in_(filenames))).order_by(Media.id):
+        by_filepath.setdefault(media.filepath, media)
+        by_filename.setdefault(media.filename, media)
 
-    return Media.query.filter_by(filepath=normalized_path).first()
\ No newline at end of file
+    found = {}
+    for url in urls:
+        if _is_remote(url):
+            media = by_filepath.get(url)
+        else:
+            media = (by_filename.get(url.split('/')[-1])
+                     or by_filepath.get(_normalize_local_path(url)))
+        if media:
+            found[url] = media
+    return found
+
+
+def prefetch_media_seo(*collections):
+    """
+    Batch resolver: gắn sẵn Media record cho nhiều Product/Blog/Banner/Project
+    => get_media_seo_info() trong template không query thêm (hết N+1)
+
+    - Gom tất cả image URL (image + image_mobile)
+    - 1 query Media ... WHERE url_key IN (...)
+    - URL không khớp url_key (chưa backfill) => thêm 1 query theo filename/filepath
+    - Kết quả lưu tại obj._prefetched_media = {image_url: Media | None}
+
+    Usage:
+        prefetch_media_seo(banners, featured_products, [product])
+    """
+    items = [obj for collection in collections if collection for obj in collection if obj is not None]
+
+    keys = {}
+    for obj in items:
+        for field in _IMAGE_FIELDS:
+            url = getattr(obj, field, None)
+            if url and url not in keys:
+                keys[url] = image_url_key(url)
+
+    if not keys:
+        return items
+
+    by_key = {
+        media.url_key: media
+        for media in Media.query.filter(Media.url_key.in_(set(keys.values()))).all()
+    }
+    found = {url: by_key[key] for url, key in keys.items() if key in by_key}
+
+    misses = [url for url in keys if url not in found]
+    if misses:
+        found.update(_legacy_media_batch(misses))
+
+    for obj in items:
+        obj._prefetched_media = {
+            url: found.get(url)
+            for url in (getattr(obj, field, None) for field in _IMAGE_FIELDS)
+            if url
+        }
+
+    return items
+
+
+def resolve_media(owner, image_url):
+    """
+    Lấy Media cho image_url của owner
+    - Đã prefetch_media_seo() => dùng kết quả có sẵn (0 query)
+    - Chưa prefetch => fallback get_media_by_image_url()
+    """
+    prefetched = getattr(owner, '_prefetched_media', None)
+    if prefetched is not None and image_url in prefetched:
+        return prefetched[image_url]
+    return get_media_by_image_url(image_url)
@@ -1,5 +1,6 @@
 from app import db
 from datetime import datetime
+from sqlalchemy.orm import validates
 
 
 # ==================== BANNER MODEL ====================
@@ -26,8 +27,8 @@ class Banner(db.Model):
         if not self.image:
             return None
 
-        from app.models.helpers import get_media_by_image_url
-        media = get_media_by_image_url(self.image)
+        from app.models.helpers import resolve_media
+        media = resolve_media(self, self.image)
 
         if media:
             return {
@@ -46,8 +47,8 @@ class Banner(db.Model):
         if not self.image_mobile:
             return self.get_media_seo_info()  # Fallback về ảnh desktop
 
-        from app.models.helpers import get_media_by_image_url
-        media = get_media_by_image_url(self.image_mobile)
+        from app.models.helpers import resolve_media
+        media = resolve_media(self, self.image_mobile)
 
         if media:
             return {
@@ -68,6 +69,9 @@ class Media(db.Model):
     filename = db.Column(db.String(255), nullable=False)
     original_filename = db.Column(db.String(255))
     filepath = db.Column(db.String(500), nullable=False)
+    # sha1 của canonical URL (xem app/models/helpers.image_url_key)
+    # => tra Media theo image URL bằng 1 lần dò unique index
+    url_key = db.Column(db.String(40), unique=True, index=True)
     file_type = db.Column(db.String(50))
     file_size = db.Column(db.Integer)
     width = db.Column(db.Integer)
@@ -89,6 +93,13 @@ class Media(db.Model):
     def __repr__(self):
         return f'<Media {self.filename}>'
 
+    @validates('filepath')
+    def _sync_url_key(self, key, filepath):
+        """Tự cập nhật url_key mỗi khi filepath thay đổi"""
+        from app.models.helpers import image_url_key
+        self.url_key = image_url_key(filepath)
+        return filepath
+
     def get_url(self):
         return self.filepath if self.filepath.startswith('/') else f'/{self.filepath}'
 
@@ -98,6 +109,35 @@ class Media(db.Model):
         return 0
 
 
+def ensure_media_url_key():
+    """
+    Thêm cột media.url_key + unique index cho DB đã tồn tại (db.create_all() không ALTER bảng cũ)
+    - Deploy: flask db upgrade (migrations/versions/3c1d9a7e52b4); hàm này chỉ dùng trong
+      CLI flask backfill-media-keys để backfill chạy được cả khi chưa migrate
+    - Chạy được nhiều lần: đã có cột / index thì bỏ qua
+    Returns: True nếu vừa thêm cột (cần chạy flask backfill-media-keys)
+    """
+    from sqlalchemy import inspect, text
+
+    inspector = inspect(db.engine)
+    if not inspector.has_table(Media.__tablename__):
+        return False
+
+    added = False
+    columns = {column['name'] for column in inspector.get_columns(Media.__tablename__)}
+    if 'url_key' not in columns:
+        with db.engine.begin() as conn:
+            conn.execute(text('ALTER TABLE media ADD COLUMN url_key VARCHAR(40)'))
+        added = True
+
+    indexes = {index['name'] for index in inspect(db.engine).get_indexes(Media.__tablename__)}
+    if 'ix_media_url_key' not in indexes:
+        with db.engine.begin() as conn:
+            conn.execute(text('CREATE UNIQUE INDEX ix_media_url_key ON media (url_key)'))
+
+    return added
+
+
 # ==================== PROJECT MODEL ====================
 class Project(db.Model):
     """Model cho Dự án tiêu biểu"""
@@ -152,8 +192,8 @@ class Project(db.Model):
         if not self.image:
             return None
 
-        from app.models.helpers import get_media_by_image_url
-        media = get_media_by_image_url(self.image)
+        from app.models.helpers import resolve_media
+        media = resolve_media(self, self.image)
 
         if media:
             return {
@@ -1,5 +1,8 @@
 from app import db
+from app.models.events import after_commit_of
+from collections import namedtuple
 from datetime import datetime
+import threading
 
 
 # ==================== CATEGORY MODEL ====================
@@ -73,10 +76,10 @@ class Product(db.Model):
             return None
 
         # Import helper function
-        from app.models.helpers import get_media_by_image_url
+        from app.models.helpers import resolve_media
 
         # Tìm Media record
-        media = get_media_by_image_url(self.image)
+        media = resolve_media(self, self.image)
 
         if media:
             return {
@@ -90,4 +93,52 @@ class Product(db.Model):
             'alt_text': self.image_alt_text or self.name,
             'title': self.image_title or self.name,
             'caption': self.image_caption
-        }
\ No newline at end of file
+        }
+
+
+# ==================== ACTIVE CATEGORIES CACHE ====================
+# Navbar/footer của mọi trang public đều cần danh sách danh mục.
+# Lưu dạng namedtuple (detached, immutable) => dùng chung an toàn giữa
+# các threads/sessions, không lazy-load, không DetachedInstanceError.
+CategoryRow = namedtuple('CategoryRow', ['id', 'name', 'slug', 'description', 'image'])
+
+_ACTIVE_CATEGORIES = None
+_CATEGORIES_GENERATION = 0  # tăng mỗi lần invalidate, chống ghi đè bởi lần load cũ
+_CATEGORIES_LOCK = threading.Lock()
+
+
+def get_active_categories():
+    """
+    Danh sách danh mục đang active (tuple CategoryRow)
+    - Cache process-level, chỉ query lại sau khi Category/Product được commit
+    """
+    global _ACTIVE_CATEGORIES
+    cached = _ACTIVE_CATEGORIES
+    if cached is not None:
+        return cached
+
+    generation = _CATEGORIES_GENERATION
+    rows = db.session.query(
+        Category.id, Category.name, Category.slug, Category.description, Category.image
+    ).filter_by(is_active=True).order_by(Category.id).all()
+    cached = tuple(CategoryRow(*row) for row in rows)
+
+    with _CATEGORIES_LOCK:
+        # Có commit xen giữa lúc đang load => không lưu kết quả cũ
+        if generation == _CATEGORIES_GENERATION:
+            _ACTIVE_CATEGORIES = cached
+    return cached
+
+
+def get_active_category(slug):
+    """CategoryRow active theo slug (từ cache danh mục, không query) - None nếu không có"""
+    return next((category for category in get_active_categories() if category.slug == slug), None)
+
+
+@after_commit_of('Category', 'Product')
+def clear_categories_cache(changed=None):
+    """Xóa cache danh mục (tự động gọi sau commit Category/Product)"""
+    global _ACTIVE_CATEGORIES, _CATEGORIES_GENERATION
+    with _CATEGORIES_LOCK:
+        _ACTIVE_CATEGORIES = None
+        _CATEGORIES_GENERATION += 1
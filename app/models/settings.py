@@ -1,5 +1,15 @@
 from app import db
 from datetime import datetime
+from collections import namedtuple
+from types import MappingProxyType
+import threading
+
+# ===== SNAPSHOT CACHE (process-level) =====
+# Toàn bộ bảng settings được nạp 1 lần vào dict bất biến (key -> value).
+# Reader chỉ đọc tham chiếu hiện tại, writer tạo snapshot mới rồi swap
+# => không cần lock khi đọc, không có trạng thái "nửa cập nhật".
+_SETTINGS_SNAPSHOT = None
+_SNAPSHOT_LOCK = threading.Lock()
 
 
 # ==================== SETTINGS MODEL ====================
@@ -18,17 +28,113 @@ class Settings(db.Model):
         return f'<Settings {self.key}: {self.value}>'
 
 
+# ==================== SNAPSHOT HELPERS ====================
+class _Snapshot(namedtuple('_Snapshot', ['values', 'groups'])):
+    """values: key -> value, groups: key -> group (cả 2 đều read-only)"""
+    __slots__ = ()
+
+
+def _load_snapshot():
+    """Nạp toàn bộ bảng settings bằng 1 query"""
+    rows = db.session.query(Settings.key, Settings.value, Settings.group).all()
+    return _Snapshot(
+        values=MappingProxyType({key: value for key, value, _ in rows}),
+        groups=MappingProxyType({key: group for key, _, group in rows}),
+    )
+
+
+def _get_snapshot():
+    """
+    Lấy snapshot hiện tại
+    - Lần đầu: query DB 1 lần (double-checked lock để 3 threads không cùng query)
+    - Các lần sau: trả về tham chiếu có sẵn, không chạm DB
+    """
+    global _SETTINGS_SNAPSHOT
+    snapshot = _SETTINGS_SNAPSHOT
+    if snapshot is None:
+        with _SNAPSHOT_LOCK:
+            if _SETTINGS_SNAPSHOT is None:
+                _SETTINGS_SNAPSHOT = _load_snapshot()
+            snapshot = _SETTINGS_SNAPSHOT
+    return snapshot
+
+
+def get_settings_snapshot():
+    """Lấy snapshot settings hiện tại (MappingProxyType key -> value, read-only)"""
+    return _get_snapshot().values
+
+
+def _swap_snapshot(changes):
+    """
+    Tạo snapshot mới = snapshot cũ + changes, rồi swap tham chiếu
+
+    Args:
+        changes: dict {key: (value, group)}
+    """
+    global _SETTINGS_SNAPSHOT
+    with _SNAPSHOT_LOCK:
+        if _SETTINGS_SNAPSHOT is None:
+            # Chưa warm-up: nạp lại toàn bộ (đã bao gồm changes vừa commit)
+            _SETTINGS_SNAPSHOT = _load_snapshot()
+            return
+        values = dict(_SETTINGS_SNAPSHOT.values)
+        groups = dict(_SETTINGS_SNAPSHOT.groups)
+        for key, (value, group) in changes.items():
+            values[key] = value
+            groups[key] = group
+        _SETTINGS_SNAPSHOT = _Snapshot(MappingProxyType(values), MappingProxyType(groups))
+
+
+def clear_settings_cache():
+    """Xóa snapshot, lần đọc kế tiếp sẽ nạp lại từ DB"""
+    global _SETTINGS_SNAPSHOT
+    with _SNAPSHOT_LOCK:
+        _SETTINGS_SNAPSHOT = None
+
+
 # ==================== HELPER FUNCTIONS ====================
 def get_setting(key, default=None):
-    """Lấy giá trị setting từ DB"""
-    setting = Settings.query.filter_by(key=key).first()
-    return setting.value if setting else default
+    """Lấy giá trị setting từ snapshot cache (không query DB sau warm-up)"""
+    return get_settings_snapshot().get(key, default)
 
 
-def set_setting(key, value, group='general', description=''):
-    """Lưu hoặc cập nhật setting"""
+def get_settings(keys=None, group=None):
+    """
+    Lấy nhiều settings cùng lúc từ snapshot (0 query sau warm-up)
+
+    Args:
+        keys: list key cần lấy, hoặc dict {key: default}
+        group: chỉ lấy settings thuộc nhóm này (general, seo, content, ...)
+
+    Returns: dict {key: value}
+        - keys=None, group=None  => toàn bộ settings
+        - có cả keys và group    => settings của group + các keys
+        - key không tồn tại      => default (dict) hoặc None (list)
+
+    Usage:
+        get_settings({'hotline': '0901.180.094', 'logo_url': ''})
+        get_settings(group='content')
+    """
+    snapshot = _get_snapshot()
+    values = snapshot.values
+
+    if group is not None:
+        result = {key: value for key, value in values.items() if snapshot.groups.get(key) == group}
+    else:
+        result = {} if keys is not None else dict(values)
+
+    if keys is not None:
+        defaults = keys if isinstance(keys, dict) else dict.fromkeys(keys)
+        for key, default in defaults.items():
+            result[key] = values.get(key, default)
 
-    # BƯỚC 1: XỬ LÝ TUPLE TRƯỚC KHI GÁN (chỉ 1 lần duy nhất)
+    return result
+
+
+def _normalize_value(value, description=''):
+    """Chuẩn hóa value về string, trả về (value, description)"""
+
+    # XỬ LÝ TUPLE TRƯỚC KHI GÁN (chỉ 1 lần duy nhất)
     if isinstance(value, tuple):
         if len(value) >= 1:
             value = str(value[0])  # Chỉ lấy URL từ tuple (filepath, metadata)
@@ -38,10 +144,19 @@ def set_setting(key, value, group='general', description=''):
         else:
             value = str(value)
 
-    # BƯỚC 2: ĐẢM BẢO VALUE LÀ STRING
+    # ĐẢM BẢO VALUE LÀ STRING
     if not isinstance(value, str):
         value = str(value) if value is not None else ''
 
+    return value, description
+
+
+def set_setting(key, value, group='general', description=''):
+    """Lưu hoặc cập nhật setting"""
+
+    # BƯỚC 1 + 2: CHUẨN HÓA VALUE
+    value, description = _normalize_value(value, description)
+
     # BƯỚC 3: TÌM HOẶC TẠO SETTING
     setting = Settings.query.filter_by(key=key).first()
 
@@ -55,4 +170,57 @@ def set_setting(key, value, group='general', description=''):
 
     # BƯỚC 4: COMMIT
     db.session.commit()
-    return setting
\ No newline at end of file
+
+    # BƯỚC 5: SWAP SNAPSHOT (chỉ sau khi commit thành công)
+    _swap_snapshot({key: (value, group)})
+    return setting
+
+
+def set_settings(updates):
+    """
+    Lưu nhiều settings trong 1 transaction
+
+    Args:
+        updates: dict {key: (value, group, description)}
+
+    - 1 query SELECT ... WHERE key IN (...) để lấy các row đang có
+    - Chỉ ghi những row thực sự thay đổi, 1 flush + 1 commit
+    - Lỗi ở bất kỳ key nào => rollback toàn bộ, snapshot giữ nguyên
+
+    Returns: số row đã thêm/cập nhật
+    """
+    if not updates:
+        return 0
+
+    existing = {
+        setting.key: setting
+        for setting in Settings.query.filter(Settings.key.in_(list(updates.keys()))).all()
+    }
+
+    changes = {}
+    for key, (value, group, description) in updates.items():
+        value, description = _normalize_value(value, description or '')
+        setting = existing.get(key)
+
+        if setting is None:
+            db.session.add(Settings(key=key, value=value, group=group, description=description))
+        elif (setting.value, setting.group, setting.description) != (value, group, description):
+            setting.value = value
+            setting.group = group
+            setting.description = description
+        else:
+            continue
+
+        changes[key] = (value, group)
+
+    if not changes:
+        return 0
+
+    try:
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    _swap_snapshot(changes)
+    return len(changes)
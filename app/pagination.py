@@ -0,0 +1,183 @@
+"""
+Keyset (seek) pagination cho danh sách public
+
+paginate() mặc định: OFFSET n + COUNT(*) mỗi trang => trang càng sâu càng chậm.
+Keyset: trang sau lọc theo giá trị sort của item cuối trang trước
+    WHERE (created_at, id) < (:created_at, :id) ORDER BY created_at DESC, id DESC LIMIT n
+=> mọi trang tốn như nhau (dùng index), không OFFSET.
+
+- Cursor: token ký bằng SECRET_KEY (opaque, không sửa được), chứa giá trị sort + số trang
+- Link số trang (1 2 3 ...) vẫn dùng ?page= (OFFSET) để nhảy trang
+- Trước / Sau dùng ?cursor= (infinite scroll, crawler đi tuần tự)
+- Tổng số item: COUNT có cache (app/counts.py), không đếm lại mỗi trang
+
+Usage:
+    pagination = keyset_paginate(query, Product, [KeysetOrder('created_at', True)], per_page=6)
+    pagination.items / .next_params / .prev_params  (dict cho url_for)
+"""
+from collections import namedtuple
+from datetime import datetime, date
+
+from flask import current_app, request
+from itsdangerous import BadSignature, URLSafeSerializer
+from sqlalchemy import and_, func, or_
+
+from app.counts import CachedCountPagination
+
+# attr: tên cột; descending: giảm dần; default: thay NULL (so sánh được)
+KeysetOrder = namedtuple('KeysetOrder', ['attr', 'descending', 'default'], defaults=(None,))
+
+_CURSOR_SALT = 'keyset-cursor'
+
+
+# ==================== CURSOR ====================
+def _serializer():
+    return URLSafeSerializer(current_app.secret_key, salt=_CURSOR_SALT)
+
+
+def _dump_value(value):
+    if isinstance(value, datetime):
+        return ['dt', value.isoformat()]
+    if isinstance(value, date):
+        return ['d', value.isoformat()]
+    return value
+
+
+def _load_value(value):
+    if isinstance(value, list) and len(value) == 2:
+        kind, raw = value
+        return datetime.fromisoformat(raw) if kind == 'dt' else date.fromisoformat(raw)
+    return value
+
+
+def encode_cursor(values, page, before=False):
+    """Token cho trang `page`, bắt đầu sau (hoặc trước) item có giá trị sort `values`"""
+    return _serializer().dumps({
+        'v': [_dump_value(value) for value in values],
+        'p': page,
+        'b': before,
+    })
+
+
+def decode_cursor(token):
+    """Returns: (values, page, before) hoặc None nếu token sai/bị sửa"""
+    try:
+        data = _serializer().loads(token)
+        return [_load_value(value) for value in data['v']], int(data['p']), bool(data['b'])
+    except (BadSignature, KeyError, TypeError, ValueError):
+        return None
+
+
+# ==================== KEYSET PAGINATION ====================
+class KeysetPagination(CachedCountPagination):
+    """
+    Pagination của Flask-SQLAlchemy + chế độ keyset
+    - Không có cursor: trang theo ?page= (OFFSET) như cũ
+    - Có cursor: lọc theo giá trị sort (seek)
+    - Luôn lấy per_page + 1 item để biết còn trang sau không (không cần COUNT)
+    """
+
+    def _order_columns(self):
+        model = self._query_args['model']
+        columns = []
+        for order in self._query_args['order']:
+            column = getattr(model, order.attr)
+            if order.default is not None:
+                column = func.coalesce(column, order.default)
+            columns.append((column, order))
+        return columns
+
+    def _item_values(self, item):
+        values = []
+        for order in self._query_args['order']:
+            value = getattr(item, order.attr)
+            values.append(order.default if value is None and order.default is not None else value)
+        return values
+
+    def _seek_filter(self, values, before):
+        """(c1, c2, ...) đứng sau / trước values theo thứ tự sort, viết dạng OR/AND (chạy mọi DB)"""
+        columns = self._order_columns()
+        clauses = []
+        for i, (column, order) in enumerate(columns):
+            forward = order.descending != before
+            step = column < values[i] if forward else column > values[i]
+            clauses.append(and_(*[columns[j][0] == values[j] for j in range(i)], step))
+        return or_(*clauses)
+
+    def _ordered(self, query, reverse=False):
+        return query.order_by(*[
+            column.desc() if order.descending != reverse else column.asc()
+            for column, order in self._order_columns()
+        ])
+
+    def _query_items(self):
+        query = self._query_args['query']
+        cursor = self._query_args.get('cursor')
+        self._has_more = False
+        self._before = False
+
+        if cursor is None:
+            rows = self._ordered(query).limit(self.per_page + 1).offset(self._query_offset).all()
+            self._has_more = len(rows) > self.per_page
+            return rows[:self.per_page]
+
+        values, _, before = cursor
+        self._before = before
+        query = query.filter(self._seek_filter(values, before))
+        rows = self._ordered(query, reverse=before).limit(self.per_page + 1).all()
+        self._has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if before:
+            rows.reverse()
+        return rows
+
+    @property
+    def has_next(self):
+        # Đi lùi (before) => chắc chắn còn trang sau (trang vừa rời đi)
+        return self._before or self._has_more
+
+    @property
+    def has_prev(self):
+        return self.page > 1
+
+    @property
+    def next_params(self):
+        """Tham số url_for cho trang sau"""
+        if not self.has_next or not self.items:
+            return {}
+        return {'cursor': encode_cursor(self._item_values(self.items[-1]), self.page + 1)}
+
+    @property
+    def prev_params(self):
+        """Tham số url_for cho trang trước (trang 1 => URL gốc, không cursor)"""
+        if not self.has_prev or not self.items:
+            return {}
+        if self.page - 1 == 1:
+            return {'page': None}
+        return {'cursor': encode_cursor(self._item_values(self.items[0]), self.page - 1, before=True)}
+
+
+def keyset_paginate(query, model, order, per_page, page=None):
+    """
+    Phân trang keyset cho query (CHƯA order_by)
+    - order: list KeysetOrder; tự thêm id (cùng chiều cột sort đầu) làm tiêu chí phụ
+    - ?cursor= hợp lệ => seek; không thì ?page= (OFFSET)
+    """
+    order = list(order)
+    if order[-1].attr != 'id':
+        order.append(KeysetOrder('id', order[0].descending))
+
+    cursor = None
+    token = request.args.get('cursor')
+    if token:
+        cursor = decode_cursor(token)
+    if cursor is not None and len(cursor[0]) == len(order):
+        page = cursor[1]
+    else:
+        cursor = None
+        page = page or request.args.get('page', 1, type=int)
+
+    return KeysetPagination(
+        page=max(page, 1), per_page=per_page, error_out=False,
+        query=query, model=model, order=order, cursor=cursor,
+    )
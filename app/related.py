@@ -0,0 +1,323 @@
+"""
+Related content - danh sách "liên quan" tính trước cho trang chi tiết
+
+Trước: mỗi lượt xem chạy 1 query "cùng danh mục" / "mới nhất" (không liên quan nội dung)
+Giờ: với mỗi loại (product, blog, project, job) tính sẵn cho từng item list id liên quan:
+    điểm = cosine TF-IDF (tiêu đề x2 + mô tả)
+         + RELATED_GROUP_WEIGHT    nếu cùng nhóm (danh mục / loại dự án / phòng ban)
+         + RELATED_KEYWORD_WEIGHT x Jaccard từ khóa (meta_keywords, ứng dụng, sản phẩm dùng...)
+- Snapshot bất biến trong RAM: {doc_type: {id: (id liên quan, ...)}}
+  worker gunicorn tính sẵn bằng thread nền ngay sau fork (warm_related_index), thiếu thì build lần đầu cần
+- Sau commit Product/Blog/Project/Job: đánh dấu loại bị thay đổi là cũ + build lại bằng thread nền
+  => request chỉ đọc snapshot đã build xong (cũ cho tới khi bản mới thay vào), không build O(n²)
+- Trang chi tiết: related_items(obj) => 1 query `id IN (...)`, giữ đúng thứ tự điểm
+
+Usage:
+    from app.related import related_items
+    related_products = related_items(product, joinedload(Product.category))
+"""
+import heapq
+import logging
+import math
+import threading
+from collections import defaultdict, namedtuple
+
+from flask import current_app, has_app_context
+from sqlalchemy import select
+
+from app.models.events import after_commit_of
+from app.search import _plain_text, tokenize
+
+logger = logging.getLogger(__name__)
+
+RELATED_GROUP_WEIGHT = 0.3
+RELATED_KEYWORD_WEIGHT = 0.2
+
+# Token xuất hiện ở quá nửa số item (khi đủ nhiều item) => bỏ, không phân biệt được
+_MAX_DF_RATIO = 0.5
+_MIN_DOCS_FOR_DF_CUT = 10
+# Số term nặng nhất giữ lại mỗi item
+_MAX_TERMS = 60
+
+# Cấu hình 1 loại nội dung
+# - text(row) -> (tiêu đề, mô tả); group(row) -> khóa nhóm; keywords(row) -> list từ khóa
+# - limit: số item liên quan; fill: thiếu thì bù bằng item mới nhất
+RelatedSource = namedtuple('RelatedSource', ['model', 'columns', 'text', 'group', 'keywords', 'limit', 'fill'])
+
+_RELATED = {}
+_RELATED_LOCK = threading.Lock()
+# Version dữ liệu mỗi loại (tăng sau commit) / version snapshot đang có / loại đang build lại
+_VERSIONS = {}
+_BUILT_VERSIONS = {}
+_REBUILDING = set()
+
+
+# ==================== SOURCES ====================
+def _split_keywords(value):
+    """'Keo dán, chống thấm' / list / JSON => {'keo dan', 'chong tham'}"""
+    if not value:
+        return []
+    if isinstance(value, (list, tuple)):
+        parts = [_plain_text(v) for v in value]
+    else:
+        parts = _plain_text(value).replace('\n', ',').replace(';', ',').split(',')
+    return [' '.join(tokenize(part)) for part in parts if tokenize(part)]
+
+
+def _sources():
+    from app.models.product import Product
+    from app.models.content import Blog
+    from app.models.media import Project
+    from app.models.job import Job
+
+    return {
+        'product': RelatedSource(
+            Product,
+            (Product.id, Product.name, Product.description, Product.category_id,
+             Product.application, Product.created_at),
+            lambda row: (row.name, row.description),
+            lambda row: row.category_id,
+            lambda row: _split_keywords(row.application),
+            limit=4, fill=False,
+        ),
+        'blog': RelatedSource(
+            Blog,
+            (Blog.id, Blog.title, Blog.excerpt, Blog.meta_keywords, Blog.created_at),
+            lambda row: (row.title, row.excerpt),
+            lambda row: None,
+            lambda row: _split_keywords(row.meta_keywords),
+            limit=3, fill=True,
+        ),
+        'project': RelatedSource(
+            Project,
+            (Project.id, Project.title, Project.description, Project.project_type,
+             Project.products_used, Project.location, Project.created_at),
+            lambda row: (row.title, row.description),
+            lambda row: row.project_type,
+            lambda row: _split_keywords(row.products_used) + _split_keywords(row.location),
+            limit=2, fill=False,
+        ),
+        'job': RelatedSource(
+            Job,
+            (Job.id, Job.title, Job.description, Job.department, Job.location, Job.created_at),
+            lambda row: (row.title, row.description),
+            lambda row: row.department,
+            lambda row: _split_keywords(row.location),
+            limit=5, fill=True,
+        ),
+    }
+
+
+_MODEL_RELATED_TYPES = {'Product': 'product', 'Blog': 'blog', 'Project': 'project', 'Job': 'job'}
+
+
+# ==================== BUILD ====================
+def _tfidf_vectors(documents):
+    """documents: list list token => list {term: weight} đã chuẩn hóa L2"""
+    n = len(documents)
+    df = defaultdict(int)
+    for tokens in documents:
+        for term in set(tokens):
+            df[term] += 1
+
+    max_df = n * _MAX_DF_RATIO if n >= _MIN_DOCS_FOR_DF_CUT else n
+    vectors = []
+    for tokens in documents:
+        tf = defaultdict(int)
+        for term in tokens:
+            if len(term) > 1 and df[term] <= max_df:
+                tf[term] += 1
+        weights = {
+            term: (1 + math.log(count)) * (math.log((1 + n) / (1 + df[term])) + 1)
+            for term, count in tf.items()
+        }
+        if len(weights) > _MAX_TERMS:
+            weights = dict(heapq.nlargest(_MAX_TERMS, weights.items(), key=lambda item: item[1]))
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        vectors.append({term: w / norm for term, w in weights.items()})
+    return vectors
+
+
+def _rank_related(source, rows):
+    """rows active của 1 loại => {id: (id liên quan, ...)} theo điểm giảm dần"""
+    documents = []
+    for row in rows:
+        title, body = source.text(row)
+        title_tokens = tokenize(_plain_text(title))
+        documents.append(title_tokens * 2 + tokenize(_plain_text(body)))
+    vectors = _tfidf_vectors(documents)
+
+    postings = defaultdict(list)
+    for i, vector in enumerate(vectors):
+        for term, weight in vector.items():
+            postings[term].append((i, weight))
+
+    groups = defaultdict(list)
+    keyword_sets = []
+    keyword_postings = defaultdict(list)
+    for i, row in enumerate(rows):
+        group = source.group(row)
+        if group:
+            groups[group].append(i)
+        keywords = set(source.keywords(row))
+        keyword_sets.append(keywords)
+        for keyword in keywords:
+            keyword_postings[keyword].append(i)
+
+    recency = sorted(range(len(rows)), key=lambda i: (rows[i].created_at is not None, rows[i].created_at,
+                                                      rows[i].id), reverse=True)
+
+    related = {}
+    for i, row in enumerate(rows):
+        scores = defaultdict(float)
+        for term, weight in vectors[i].items():
+            for j, other in postings[term]:
+                scores[j] += weight * other
+        group = source.group(row)
+        if group:
+            for j in groups[group]:
+                scores[j] += RELATED_GROUP_WEIGHT
+        shared = defaultdict(int)
+        for keyword in keyword_sets[i]:
+            for j in keyword_postings[keyword]:
+                shared[j] += 1
+        for j, count in shared.items():
+            union = len(keyword_sets[i] | keyword_sets[j])
+            scores[j] += RELATED_KEYWORD_WEIGHT * count / union
+        scores.pop(i, None)
+
+        best = heapq.nlargest(
+            source.limit, scores.items(),
+            key=lambda item: (item[1], rows[item[0]].created_at is not None,
+                              rows[item[0]].created_at, rows[item[0]].id)
+        )
+        chosen = [j for j, score in best if score > 0]
+        if source.fill and len(chosen) < source.limit:
+            taken = set(chosen) | {i}
+            chosen += [j for j in recency if j not in taken][:source.limit - len(chosen)]
+        related[row.id] = tuple(rows[j].id for j in chosen)
+    return related
+
+
+def _build(doc_type):
+    from app import db
+
+    source = _sources()[doc_type]
+    stmt = select(*source.columns).where(source.model.is_active == True)
+    with db.engine.connect() as conn:
+        rows = conn.execute(stmt).all()
+    return _rank_related(source, rows)
+
+
+def _get_related(doc_type):
+    """
+    Snapshot của doc_type
+    - Chưa có: build (dưới lock, 1 lần / process nếu warm_related_index chưa kịp)
+    - Đã cũ: trả snapshot cũ, build lại ở thread nền (commit ngoài app context không tự lên lịch được)
+    """
+    lists = _RELATED.get(doc_type)
+    if lists is None:
+        with _RELATED_LOCK:
+            lists = _RELATED.get(doc_type)
+            if lists is None:
+                version = _VERSIONS.get(doc_type, 0)
+                lists = _build(doc_type)
+                _RELATED[doc_type] = lists
+                _BUILT_VERSIONS[doc_type] = version
+        return lists
+
+    if _BUILT_VERSIONS.get(doc_type) != _VERSIONS.get(doc_type, 0):
+        _schedule_rebuild([doc_type])
+    return lists
+
+
+def _schedule_rebuild(doc_types):
+    """Build lại các loại đã có snapshot bằng thread nền (mỗi loại tối đa 1 thread)"""
+    if not has_app_context():
+        return
+    app = current_app._get_current_object()
+    with _RELATED_LOCK:
+        pending = [doc_type for doc_type in doc_types
+                   if doc_type in _RELATED and doc_type not in _REBUILDING]
+        _REBUILDING.update(pending)
+    for doc_type in pending:
+        threading.Thread(
+            target=_rebuild_loop, args=(app, doc_type),
+            name=f'related-rebuild-{doc_type}', daemon=True
+        ).start()
+
+
+def _rebuild_loop(app, doc_type):
+    """Build lại tới khi snapshot bắt kịp version (có commit trong lúc build => build thêm 1 vòng)"""
+    from app.caching import invalidate_tags
+
+    try:
+        with app.app_context():
+            while True:
+                with _RELATED_LOCK:
+                    version = _VERSIONS.get(doc_type, 0)
+                    # clear_related_index() trong lúc build => để lần đọc sau build lại
+                    if doc_type not in _RELATED or _BUILT_VERSIONS.get(doc_type) == version:
+                        _REBUILDING.discard(doc_type)
+                        return
+                rebuilt = _build(doc_type)
+                with _RELATED_LOCK:
+                    if doc_type in _RELATED:
+                        _RELATED[doc_type] = rebuilt
+                        _BUILT_VERSIONS[doc_type] = version
+                # Trang / fragment render trong lúc build đã cache list cũ theo version tag mới => đổi tag lần nữa
+                invalidate_tags(doc_type)
+    except Exception:
+        logger.exception('Không build lại được related %s, dùng snapshot cũ', doc_type)
+        with _RELATED_LOCK:
+            _REBUILDING.discard(doc_type)
+
+
+def warm_related_index(app):
+    """Tính sẵn snapshot mọi loại bằng thread nền (gunicorn post_fork) => request đầu không phải build"""
+    def warm():
+        with app.app_context():
+            for doc_type in _sources():
+                try:
+                    _get_related(doc_type)
+                except Exception:
+                    logger.exception('Không build được related %s', doc_type)
+
+    threading.Thread(target=warm, name='related-warm', daemon=True).start()
+
+
+@after_commit_of(*_MODEL_RELATED_TYPES)
+def _mark_changed(changed):
+    """Sau commit: đánh dấu loại bị thay đổi là cũ + build lại ở thread nền"""
+    doc_types = [_MODEL_RELATED_TYPES[model_name] for model_name in changed]
+    with _RELATED_LOCK:
+        for doc_type in doc_types:
+            _VERSIONS[doc_type] = _VERSIONS.get(doc_type, 0) + 1
+    _schedule_rebuild(doc_types)
+
+
+def clear_related_index():
+    """Bỏ toàn bộ snapshot, lần gọi sau build lại"""
+    with _RELATED_LOCK:
+        _RELATED.clear()
+        _BUILT_VERSIONS.clear()
+
+
+# ==================== API ====================
+def related_ids(doc_type, obj_id):
+    """Tuple id liên quan (đã sắp theo điểm) của item"""
+    return _get_related(doc_type).get(obj_id, ())
+
+
+def related_items(obj, *options):
+    """
+    Các item liên quan của obj (Product/Blog/Project/Job) - 1 query IN theo primary key
+    - options: loader options cho query (joinedload, load_only...)
+    """
+    model = type(obj)
+    ids = related_ids(_MODEL_RELATED_TYPES[model.__name__], obj.id)
+    if not ids:
+        return []
+    rows = model.query.options(*options).filter(model.id.in_(ids), model.is_active == True).all()
+    position = {obj_id: i for i, obj_id in enumerate(ids)}
+    return sorted(rows, key=lambda row: position[row.id])
@@ -0,0 +1,544 @@
+"""
+Search service - full-text search cho sản phẩm / tin tức
+
+- Index riêng: bảng search_documents (doc_type, doc_id, title, body)
+    + Postgres: cột tsvector + GIN index, xếp hạng ts_rank (title weight A, body weight B)
+    + SQLite:   bảng ảo FTS5, xếp hạng bm25 (title x10)
+    + DB khác / index chưa được tạo => fallback ILIKE như cũ
+- Text được bỏ dấu + tách token trước khi index và khi tìm
+  => "keo dan gach" khớp "Keo dán gạch"; mỗi token khớp theo tiền tố ("chong tha" => "chống thấm")
+- Đồng bộ tự động sau commit Product/Blog (app/models/events.py)
+- Index tạo + build bằng CLI: flask rebuild-search-index, hoặc tự build ở thread nền
+  khi request đầu tiên thấy chưa có (SEARCH_INDEX_AUTO_BUILD) - request không chờ DDL / build:
+  trong lúc đó dùng ILIKE (log warning), kiểm tra lại sau _RECHECK_SECONDS
+- Gợi ý khi gõ (suggest): prefix index trong RAM (sorted list + bisect),
+  không query DB khi trả lời; cập nhật theo row thay đổi sau commit
+
+Usage:
+    from app.search import apply_search, search_ids, suggest
+
+    query = apply_search(Product.query, Product, keyword)        # lọc (subquery) + xếp theo độ liên quan
+    ids = search_ids('blog', keyword, limit=5)                     # [id, ...] theo thứ hạng
+    items = suggest('keo chong', limit=8)                          # [SuggestEntry, ...]
+"""
+import heapq
+import logging
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+from collections import namedtuple
+
+from sqlalchemy import Float, Integer, false, inspect, or_, select, text
+
+from app.models.events import after_commit_of
+
+logger = logging.getLogger(__name__)
+
+TABLE_NAME = 'search_documents'
+
+# Số id tối đa search_ids() trả về (apply_search lọc bằng subquery, không giới hạn)
+MAX_RESULTS = 500
+
+# Tối đa số token lấy từ từ khóa
+_MAX_QUERY_TOKENS = 8
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+_HTML_TAG = re.compile(r'<[^>]+>')
+
+# Trạng thái index: None = chưa kiểm tra, 'postgresql' / 'sqlite' = sẵn sàng, False = fallback ILIKE
+_BACKEND = None
+_BACKEND_CHECKED_AT = 0.0
+_BACKEND_LOCK = threading.Lock()
+# Đang build index ở thread nền (đọc / ghi dưới _BACKEND_LOCK)
+_AUTO_BUILDING = False
+
+# Index chưa có => sau bao lâu kiểm tra lại (giây)
+_RECHECK_SECONDS = 60
+
+
+# ==================== TEXT ====================
+def fold_accents(value):
+    """Bỏ dấu tiếng Việt + lowercase: 'Chống Thấm Đa Năng' -> 'chong tham da nang'"""
+    if not value:
+        return ''
+    value = unicodedata.normalize('NFD', str(value))
+    value = ''.join(ch for ch in value if unicodedata.category(ch) != 'Mn')
+    return value.replace('đ', 'd').replace('Đ', 'D').lower()
+
+
+def tokenize(value):
+    """Danh sách token đã bỏ dấu"""
+    return _TOKEN.findall(fold_accents(value))
+
+
+def _plain_text(value):
+    """HTML / JSON (list, dict) -> text thường"""
+    if not value:
+        return ''
+    if isinstance(value, dict):
+        return ' '.join(f'{k} {_plain_text(v)}' for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return ' '.join(_plain_text(v) for v in value)
+    return _HTML_TAG.sub(' ', str(value))
+
+
+def _indexed_text(*values):
+    return ' '.join(tokenize(' '.join(_plain_text(v) for v in values)))
+
+
+# ==================== DOCUMENT SOURCES ====================
+def _sources():
+    """doc_type => (model, hàm tạo (title, body) từ row, cột cần select, cột fallback ILIKE)"""
+    from app.models.product import Product
+    from app.models.content import Blog
+
+    return {
+        'product': (
+            Product,
+            lambda row: (row.name, _indexed_text(row.description, row.composition, row.application)),
+            (Product.id, Product.name, Product.description, Product.composition, Product.application),
+            (Product.name,),
+        ),
+        'blog': (
+            Blog,
+            lambda row: (row.title, _indexed_text(row.excerpt, row.meta_keywords, row.content)),
+            (Blog.id, Blog.title, Blog.excerpt, Blog.meta_keywords, Blog.content),
+            (Blog.title, Blog.excerpt),
+        ),
+    }
+
+
+_MODEL_DOC_TYPES = {'Product': 'product', 'Blog': 'blog'}
+
+
+def _documents(conn, doc_type, ids=None):
+    """[(doc_id, title, body)] đọc từ bảng nguồn (ids None => toàn bộ)"""
+    model, build, columns, _ = _sources()[doc_type]
+    stmt = select(*columns)
+    if ids is not None:
+        stmt = stmt.where(model.id.in_(ids))
+    documents = []
+    for row in conn.execute(stmt):
+        title, body = build(row)
+        documents.append((row.id, _indexed_text(title), body))
+    return documents
+
+
+# ==================== BACKENDS ====================
+class _PostgresIndex:
+    name = 'postgresql'
+
+    @staticmethod
+    def create(conn):
+        conn.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
+                doc_type VARCHAR(20) NOT NULL,
+                doc_id INTEGER NOT NULL,
+                document TSVECTOR NOT NULL,
+                PRIMARY KEY (doc_type, doc_id)
+            )
+        """))
+        conn.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_{TABLE_NAME}_document ON {TABLE_NAME} USING GIN (document)"
+        ))
+
+    @staticmethod
+    def upsert(conn, doc_type, documents):
+        conn.execute(text(f"""
+            INSERT INTO {TABLE_NAME} (doc_type, doc_id, document)
+            VALUES (:doc_type, :doc_id,
+                    setweight(to_tsvector('simple', :title), 'A')
+                    || setweight(to_tsvector('simple', :body), 'B'))
+            ON CONFLICT (doc_type, doc_id) DO UPDATE SET document = EXCLUDED.document
+        """), [{'doc_type': doc_type, 'doc_id': doc_id, 'title': title, 'body': body}
+               for doc_id, title, body in documents])
+
+    @staticmethod
+    def match(doc_type, tokens):
+        """SELECT doc_id, rank (nhỏ hơn = liên quan hơn) của các document khớp"""
+        return text(f"""
+            SELECT doc_id, -ts_rank(document, search_query) AS rank
+            FROM {TABLE_NAME}, to_tsquery('simple', :search_query) AS search_query
+            WHERE doc_type = :search_doc_type AND document @@ search_query
+        """).bindparams(search_doc_type=doc_type,
+                        search_query=' & '.join(f'{t}:*' for t in tokens))
+
+
+class _SqliteIndex:
+    name = 'sqlite'
+
+    @staticmethod
+    def create(conn):
+        conn.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE_NAME} "
+            f"USING fts5(doc_type UNINDEXED, doc_id UNINDEXED, title, body, tokenize='unicode61')"
+        ))
+
+    @staticmethod
+    def upsert(conn, doc_type, documents):
+        _delete(conn, doc_type, [doc_id for doc_id, _, _ in documents])
+        conn.execute(text(
+            f"INSERT INTO {TABLE_NAME} (doc_type, doc_id, title, body) VALUES (:doc_type, :doc_id, :title, :body)"
+        ), [{'doc_type': doc_type, 'doc_id': doc_id, 'title': title, 'body': body}
+            for doc_id, title, body in documents])
+
+    @staticmethod
+    def match(doc_type, tokens):
+        """SELECT doc_id, rank (nhỏ hơn = liên quan hơn) của các document khớp"""
+        return text(f"""
+            SELECT doc_id, bm25({TABLE_NAME}, 0, 0, 10.0, 1.0) AS rank
+            FROM {TABLE_NAME}
+            WHERE {TABLE_NAME} MATCH :search_query AND doc_type = :search_doc_type
+        """).bindparams(search_doc_type=doc_type,
+                        search_query=' '.join(f'"{t}"*' for t in tokens))
+
+
+_INDEXES = {index.name: index for index in (_PostgresIndex, _SqliteIndex)}
+
+
+def _delete(conn, doc_type, ids=None):
+    stmt = f"DELETE FROM {TABLE_NAME} WHERE doc_type = :doc_type"
+    if ids is None:
+        conn.execute(text(stmt), {'doc_type': doc_type})
+    elif ids:
+        conn.execute(text(f"{stmt} AND doc_id = :doc_id"),
+                     [{'doc_type': doc_type, 'doc_id': doc_id} for doc_id in ids])
+
+
+def _reindex(conn, index, doc_type, ids=None):
+    """Build lại index cho doc_type (ids None => toàn bộ)"""
+    documents = _documents(conn, doc_type, ids)
+    if ids is None:
+        _delete(conn, doc_type)
+    else:
+        found = {doc_id for doc_id, _, _ in documents}
+        _delete(conn, doc_type, [doc_id for doc_id in ids if doc_id not in found])
+    if documents:
+        index.upsert(conn, doc_type, documents)
+    return len(documents)
+
+
+def _engine():
+    from app import db
+    return db.engine
+
+
+def _get_index():
+    """
+    Backend index đang dùng (None => fallback ILIKE)
+    - Chỉ kiểm tra bảng index đã tồn tại chưa (không DDL / build trong request)
+    - Chưa có => ILIKE, kiểm tra lại sau _RECHECK_SECONDS (deploy chạy CLI xong là tự dùng)
+    """
+    global _BACKEND, _BACKEND_CHECKED_AT
+    backend = _BACKEND
+    if backend is None or (backend is False and time.monotonic() - _BACKEND_CHECKED_AT > _RECHECK_SECONDS):
+        with _BACKEND_LOCK:
+            if _BACKEND is backend:
+                _BACKEND = _detect_index()
+                _BACKEND_CHECKED_AT = time.monotonic()
+            backend = _BACKEND
+    return _INDEXES.get(backend) if backend else None
+
+
+def _detect_index():
+    engine = _engine()
+    index = _INDEXES.get(engine.dialect.name)
+    if index is None:
+        return False
+    try:
+        if not inspect(engine).has_table(TABLE_NAME):
+            logger.warning('Chưa có search index (%s), tìm kiếm dùng ILIKE', TABLE_NAME)
+            _start_auto_build()
+            return False
+    except Exception:
+        logger.exception('Không kiểm tra được search index, dùng ILIKE')
+        return False
+    return index.name
+
+
+def _start_auto_build():
+    """Index chưa có => build ở thread nền (1 thread / process, gọi dưới _BACKEND_LOCK)"""
+    global _AUTO_BUILDING
+    from flask import current_app, has_app_context
+
+    if _AUTO_BUILDING or not has_app_context() or not current_app.config.get('SEARCH_INDEX_AUTO_BUILD', True):
+        return
+    _AUTO_BUILDING = True
+    threading.Thread(
+        target=_auto_build, args=(current_app._get_current_object(),),
+        name='search-index-build', daemon=True
+    ).start()
+
+
+def _auto_build(app):
+    global _AUTO_BUILDING
+    try:
+        with app.app_context():
+            counts = rebuild_search_index()
+        logger.info('Đã build search index: %s', counts)
+    except Exception:
+        logger.exception('Không build được search index, vẫn dùng ILIKE')
+    finally:
+        with _BACKEND_LOCK:
+            _AUTO_BUILDING = False
+
+
+def rebuild_search_index():
+    """
+    Tạo bảng index (nếu chưa có) + build lại toàn bộ - dùng cho CLI / deploy
+    Returns: {doc_type: số document}, {} nếu DB không hỗ trợ
+    """
+    global _BACKEND, _BACKEND_CHECKED_AT
+    engine = _engine()
+    index = _INDEXES.get(engine.dialect.name)
+    if index is None:
+        return {}
+    with engine.begin() as conn:
+        index.create(conn)
+        counts = {doc_type: _reindex(conn, index, doc_type) for doc_type in _sources()}
+    with _BACKEND_LOCK:
+        _BACKEND = index.name
+        _BACKEND_CHECKED_AT = time.monotonic()
+    return counts
+
+
+@after_commit_of(*_MODEL_DOC_TYPES, rows=True)
+def _sync_changed(changed, rows):
+    """Sau commit Product/Blog: cập nhật document của các row thay đổi"""
+    index = _get_index()
+    if index is None:
+        # Chưa có index => lần build (CLI / thread nền) sẽ đọc dữ liệu mới nhất
+        return
+    with _engine().begin() as conn:
+        for model_name in changed:
+            doc_type = _MODEL_DOC_TYPES[model_name]
+            model_rows = rows.get(model_name, {})
+            if None in model_rows:
+                _reindex(conn, index, doc_type)
+            else:
+                _reindex(conn, index, doc_type, list(model_rows))
+
+
+# ==================== SEARCH API ====================
+def search_ids(doc_type, keyword, limit=MAX_RESULTS):
+    """
+    Id các document khớp keyword, xếp theo độ liên quan
+    Returns: list id, hoặc None nếu không có index (caller tự fallback)
+    """
+    index = _get_index()
+    if index is None:
+        return None
+    tokens = tokenize(keyword)[:_MAX_QUERY_TOKENS]
+    if not tokens:
+        return []
+    matches = _match_subquery(index, doc_type, tokens)
+    with _engine().connect() as conn:
+        rows = conn.execute(
+            select(matches.c.doc_id).order_by(matches.c.rank, matches.c.doc_id.desc()).limit(limit)
+        )
+        return [row[0] for row in rows]
+
+
+def search_cache_key(keyword):
+    """
+    Khóa cache cho kết quả apply_search(keyword): backend + đúng giá trị backend dùng để lọc
+    - Index: token đã bỏ dấu ('gạch' / 'gach' cùng kết quả)
+    - ILIKE: từ khóa gốc ('gạch' != 'gach') - tránh dùng chung cache khác kết quả
+    """
+    index = _get_index()
+    if index is None:
+        return f'ilike:{keyword}'
+    return f'{index.name}:' + ' '.join(tokenize(keyword)[:_MAX_QUERY_TOKENS])
+
+
+def _match_subquery(index, doc_type, tokens):
+    """Subquery (doc_id, rank) các document khớp token"""
+    return index.match(doc_type, tokens).columns(doc_id=Integer, rank=Float).subquery(f'search_{doc_type}')
+
+
+def apply_search(query, model, keyword, rank=True):
+    """
+    Lọc query theo keyword qua search index
+    - Lọc bằng subquery trên index => mọi filter của query (is_active, danh mục...)
+      áp dụng trên toàn bộ kết quả khớp, không bị cắt trước
+    - rank=True: JOIN subquery, sắp xếp theo độ liên quan (order_by sau đó chỉ là tiêu chí phụ)
+    - Không có index => ILIKE trên các cột như trước
+    """
+    doc_type = _MODEL_DOC_TYPES[model.__name__]
+    index = _get_index()
+
+    if index is None:
+        fallback_columns = _sources()[doc_type][3]
+        return query.filter(or_(*[column.ilike(f'%{keyword}%') for column in fallback_columns]))
+
+    tokens = tokenize(keyword)[:_MAX_QUERY_TOKENS]
+    if not tokens:
+        return query.filter(false())
+
+    matches = _match_subquery(index, doc_type, tokens)
+    if not rank:
+        return query.filter(model.id.in_(select(matches.c.doc_id)))
+    return query.join(matches, matches.c.doc_id == model.id).order_by(matches.c.rank)
+
+
+# ==================== SUGGEST (PREFIX INDEX) ====================
+# Gợi ý: 1 entry / row active; key = mọi hậu tố bắt đầu từ đầu 1 từ của tiêu đề đã bỏ dấu
+#   "Keo chống thấm" => "keo chong tham", "chong tham", "tham"
+#   => gõ "chong th" hay "keo ch" đều khớp
+SuggestEntry = namedtuple('SuggestEntry', ['type', 'id', 'title', 'slug'])
+
+# Thứ tự ưu tiên khi xếp gợi ý
+SUGGEST_TYPES = ('category', 'product', 'project', 'blog')
+
+# Số key tối đa quét cho 1 truy vấn (tránh prefix 1 ký tự quét cả index)
+_SUGGEST_SCAN_LIMIT = 200
+
+
+class _SuggestIndex(namedtuple('_SuggestIndex', ['keys', 'refs', 'entries'])):
+    """
+    Snapshot bất biến, thay nguyên khối khi cập nhật
+    - keys: list key đã sort (bisect); refs[i] = (type, id, vị trí từ) của keys[i]
+    - entries: {(type, id): SuggestEntry}
+    """
+
+
+_SUGGEST_INDEX = None
+_SUGGEST_LOCK = threading.Lock()
+
+
+def _suggest_sources():
+    """type => (model, cột tiêu đề)"""
+    from app.models.product import Product, Category
+    from app.models.content import Blog
+    from app.models.media import Project
+
+    return {
+        'category': (Category, Category.name),
+        'product': (Product, Product.name),
+        'project': (Project, Project.title),
+        'blog': (Blog, Blog.title),
+    }
+
+
+_MODEL_SUGGEST_TYPES = {'Category': 'category', 'Product': 'product', 'Project': 'project', 'Blog': 'blog'}
+
+
+def _word_keys(title):
+    tokens = tokenize(title)
+    return [' '.join(tokens[i:]) for i in range(len(tokens))]
+
+
+def _index_rows(entries):
+    """[(key, (type, id, vị trí)), ...] đã sort cho các entry"""
+    return sorted(
+        (key, (entry.type, entry.id, position))
+        for entry in entries
+        for position, key in enumerate(_word_keys(entry.title))
+    )
+
+
+def _load_suggest_entries(conn, entry_type, ids=None):
+    """Entry active đọc từ DB (ids None => toàn bộ)"""
+    model, title_column = _suggest_sources()[entry_type]
+    stmt = select(model.id, title_column, model.slug).where(model.is_active == True)
+    if ids is not None:
+        stmt = stmt.where(model.id.in_(ids))
+    return [SuggestEntry(entry_type, row[0], row[1], row[2]) for row in conn.execute(stmt) if row[1]]
+
+
+def _build_suggest_index():
+    with _engine().connect() as conn:
+        entries = [entry for entry_type in SUGGEST_TYPES for entry in _load_suggest_entries(conn, entry_type)]
+    rows = _index_rows(entries)
+    return _SuggestIndex(
+        keys=[key for key, _ in rows],
+        refs=[ref for _, ref in rows],
+        entries={(entry.type, entry.id): entry for entry in entries},
+    )
+
+
+def _get_suggest_index():
+    global _SUGGEST_INDEX
+    index = _SUGGEST_INDEX
+    if index is None:
+        with _SUGGEST_LOCK:
+            if _SUGGEST_INDEX is None:
+                _SUGGEST_INDEX = _build_suggest_index()
+            index = _SUGGEST_INDEX
+    return index
+
+
+def _apply_suggest_changes(index, removed, added):
+    """
+    Snapshot mới = snapshot cũ - entry bị đổi/xóa + entry mới (merge 2 list đã sort)
+    - removed: set (type, id); added: list SuggestEntry
+    """
+    kept = [(key, ref) for key, ref in zip(index.keys, index.refs) if ref[:2] not in removed]
+    rows = list(heapq.merge(kept, _index_rows(added)))
+    entries = {ref: entry for ref, entry in index.entries.items() if ref not in removed}
+    entries.update({(entry.type, entry.id): entry for entry in added})
+    return _SuggestIndex(keys=[key for key, _ in rows], refs=[ref for _, ref in rows], entries=entries)
+
+
+@after_commit_of(*_MODEL_SUGGEST_TYPES, rows=True)
+def _sync_suggest(changed, rows):
+    """Sau commit: đọc lại các row thay đổi, cập nhật snapshot (chưa build => bỏ qua)"""
+    global _SUGGEST_INDEX
+    if _SUGGEST_INDEX is None:
+        return
+
+    with _SUGGEST_LOCK:
+        index = _SUGGEST_INDEX
+        if index is None:
+            return
+        with _engine().connect() as conn:
+            for model_name in changed:
+                entry_type = _MODEL_SUGGEST_TYPES[model_name]
+                model_rows = rows.get(model_name, {})
+                if None in model_rows:
+                    ids = None
+                    removed = {ref for ref in index.entries if ref[0] == entry_type}
+                else:
+                    ids = list(model_rows)
+                    removed = {(entry_type, obj_id) for obj_id in ids}
+                added = _load_suggest_entries(conn, entry_type, ids)
+                index = _apply_suggest_changes(index, removed, added)
+        _SUGGEST_INDEX = index
+
+
+def clear_suggest_index():
+    """Bỏ snapshot gợi ý, lần gọi sau build lại"""
+    global _SUGGEST_INDEX
+    with _SUGGEST_LOCK:
+        _SUGGEST_INDEX = None
+
+
+def suggest(keyword, limit=8):
+    """
+    Gợi ý theo tiền tố (không query DB)
+    - Ưu tiên: khớp từ đầu tiêu đề > loại (SUGGEST_TYPES) > tiêu đề ngắn
+    Returns: list SuggestEntry
+    """
+    prefix = ' '.join(tokenize(keyword)[:_MAX_QUERY_TOKENS])
+    if not prefix:
+        return []
+
+    index = _get_suggest_index()
+    keys, refs = index.keys, index.refs
+    matches = {}
+    i = bisect_left(keys, prefix)
+    end = min(len(keys), i + _SUGGEST_SCAN_LIMIT)
+    while i < end and keys[i].startswith(prefix):
+        entry_type, entry_id, position = refs[i]
+        ref = (entry_type, entry_id)
+        if ref not in matches or position < matches[ref]:
+            matches[ref] = position
+        i += 1
+
+    ranked = sorted(
+        matches.items(),
+        key=lambda item: (item[1] > 0, SUGGEST_TYPES.index(item[0][0]), len(index.entries[item[0]].title))
+    )
+    return [index.entries[ref] for ref, _ in ranked[:limit]]
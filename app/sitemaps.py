@@ -0,0 +1,182 @@
+"""
+Sitemap service - sitemap index + sitemap con theo loại, chia chunk
+
+Trước: lưu cài đặt => load toàn bộ Product/Blog/Project, ghi static/sitemap.xml
+(cũ ngay khi sửa nội dung, 1 file => vượt giới hạn 50.000 URL khi dữ liệu lớn)
+Giờ: tạo theo yêu cầu, không ghi file
+- /sitemap.xml                        => sitemap index: mỗi loại / mỗi chunk 1 <sitemap>
+- /sitemap-<loại>-<chunk>.xml          => tối đa SITEMAP_CHUNK_SIZE URL
+- Đọc DB bằng yield_per + load_only(slug, updated_at) (không giữ cả bảng trong RAM)
+- XML cache trong RAM theo version tag của loại (commit => lastmod đổi => build lại)
+- ETag / Last-Modified theo cùng version => crawler hỏi lại nhận 304
+
+Usage:
+    from app.sitemaps import sitemap_index, sitemap_part
+    body, etag, last_modified = sitemap_index()
+"""
+import math
+from collections import namedtuple
+from datetime import datetime, timezone
+from hashlib import sha1
+from xml.sax.saxutils import escape
+
+from flask import current_app, request, url_for
+from sqlalchemy import select
+from sqlalchemy.orm import lazyload, load_only
+
+_SITEMAP_PREFIX = 'sitemap:'
+_XMLNS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+# Giới hạn của giao thức sitemap
+MAX_URLS_PER_SITEMAP = 50000
+
+# Trang tĩnh: (endpoint, changefreq, priority, tag quyết định lastmod)
+STATIC_PAGES = (
+    ('main.about', 'weekly', '0.8', 'settings'),
+    ('main.products', 'daily', '0.9', 'product'),
+    ('main.contact', 'weekly', '0.7', 'settings'),
+    ('main.policy', 'monthly', '0.6', 'settings'),
+    ('main.faq', 'weekly', '0.7', 'faq'),
+    ('main.careers', 'weekly', '0.7', 'job'),
+    ('main.projects', 'weekly', '0.8', 'project'),
+)
+
+# Loại nội dung: model, endpoint chi tiết, changefreq, priority, tag
+SitemapSection = namedtuple('SitemapSection', ['model', 'endpoint', 'changefreq', 'priority', 'tag'])
+
+
+def _sections():
+    from app.models.product import Product
+    from app.models.content import Blog
+    from app.models.media import Project
+
+    return {
+        'products': SitemapSection(Product, 'main.product_detail', 'weekly', '0.8', 'product'),
+        'blogs': SitemapSection(Blog, 'main.blog_detail', 'weekly', '0.7', 'blog'),
+        'projects': SitemapSection(Project, 'main.project_detail', 'weekly', '0.8', 'project'),
+    }
+
+
+def _chunk_size():
+    return min(current_app.config.get('SITEMAP_CHUNK_SIZE', 10000), MAX_URLS_PER_SITEMAP)
+
+
+# ==================== XML ====================
+def _w3c_date(value):
+    if isinstance(value, (int, float)):
+        value = datetime.fromtimestamp(value, tz=timezone.utc)
+    return value.strftime('%Y-%m-%d')
+
+
+def _url_xml(loc, lastmod, changefreq, priority):
+    return (f'<url><loc>{escape(loc)}</loc><lastmod>{_w3c_date(lastmod)}</lastmod>'
+            f'<changefreq>{changefreq}</changefreq><priority>{priority}</priority></url>')
+
+
+def _document(root, parts):
+    return ''.join([
+        '<?xml version="1.0" encoding="UTF-8"?>\n',
+        f'<{root} xmlns="{_XMLNS}">\n',
+        *(part + '\n' for part in parts),
+        f'</{root}>\n',
+    ]).encode('utf-8')
+
+
+# ==================== VALIDATORS ====================
+def _validators(tags):
+    """(versions, etag, last_modified) theo các tag (+ BASE_TAGS: main_url, menu)"""
+    from app.caching import BASE_TAGS, page_validators, tag_versions
+
+    tags = tuple(dict.fromkeys(BASE_TAGS + tuple(tags)))
+    versions = tag_versions(tags)
+    etag, last_modified = page_validators(tags, versions)
+    return versions, etag, last_modified
+
+
+def _tag_lastmod(tag):
+    return _validators((tag,))[2]
+
+
+def _cached_xml(name, tags, build):
+    """(xml bytes, etag, last_modified) - build lại khi version tag đổi"""
+    from app.caching import cached_value
+
+    versions, etag, last_modified = _validators(tags)
+    body = cached_value(_SITEMAP_PREFIX, [request.host, name, _chunk_size(), *versions], (), build)
+    return body, f'{etag}-{sha1(name.encode("utf-8")).hexdigest()[:8]}', last_modified
+
+
+# ==================== BUILD ====================
+def _home_url():
+    from app.models.settings import get_setting
+    return get_setting('main_url', request.url_root)
+
+
+def _section_total(section):
+    from app.counts import count_rows
+    return count_rows(section.model, section.model.is_active == True)
+
+
+def _build_pages():
+    lastmods = [_tag_lastmod(tag) for tag in ('product', 'blog', 'project')]
+    parts = [_url_xml(_home_url(), max(lastmods), 'daily', '1.0')]
+    for endpoint, changefreq, priority, tag in STATIC_PAGES:
+        parts.append(_url_xml(url_for(endpoint, _external=True), _tag_lastmod(tag), changefreq, priority))
+    return _document('urlset', parts)
+
+
+def _iter_section_urls(section, page):
+    """URL của 1 chunk - đọc DB theo lô (yield_per), chỉ lấy slug + updated_at, không eager-load quan hệ"""
+    from app import db
+
+    model = section.model
+    size = _chunk_size()
+    stmt = (select(model)
+            .options(load_only(model.slug, model.updated_at), lazyload('*'))
+            .where(model.is_active == True)
+            .order_by(model.id)
+            .offset((page - 1) * size)
+            .limit(size)
+            .execution_options(yield_per=1000))
+    fallback = datetime.utcnow()
+    for row in db.session.execute(stmt).scalars():
+        yield _url_xml(url_for(section.endpoint, slug=row.slug, _external=True),
+                       row.updated_at or fallback, section.changefreq, section.priority)
+
+
+def _build_index():
+    size = _chunk_size()
+    parts = [f'<sitemap><loc>{escape(url_for("main.sitemap_chunk", section="pages", page=1, _external=True))}'
+             f'</loc><lastmod>{_w3c_date(_validators(("product", "blog", "project"))[2])}</lastmod></sitemap>']
+    for name, section in _sections().items():
+        lastmod = _w3c_date(_tag_lastmod(section.tag))
+        for page in range(1, math.ceil(_section_total(section) / size) + 1):
+            loc = url_for('main.sitemap_chunk', section=name, page=page, _external=True)
+            parts.append(f'<sitemap><loc>{escape(loc)}</loc><lastmod>{lastmod}</lastmod></sitemap>')
+    return _document('sitemapindex', parts)
+
+
+# ==================== API ====================
+def sitemap_index():
+    """Sitemap index - (xml bytes, etag, last_modified)"""
+    tags = ('product', 'blog', 'project', 'faq', 'job')
+    return _cached_xml('index', tags, _build_index)
+
+
+def sitemap_part(name, page):
+    """
+    Sitemap con của loại name, chunk page (bắt đầu từ 1)
+    Returns: (xml bytes, etag, last_modified) hoặc None nếu không tồn tại
+    """
+    if name == 'pages':
+        if page != 1:
+            return None
+        return _cached_xml('pages', ('product', 'blog', 'project', 'faq', 'job'), _build_pages)
+
+    section = _sections().get(name)
+    if section is None or page < 1:
+        return None
+    if (page - 1) * _chunk_size() >= max(_section_total(section), 1):
+        return None
+    return _cached_xml(f'{name}:{page}', (section.tag,),
+                       lambda: _document('urlset', _iter_section_urls(section, page)))
@@ -0,0 +1,1435 @@
+/*! 
+ * ============================================================================
+ * BRICON - Page Chunk: public-index
+ * ============================================================================
+ * Generated: 18/10/2026 14:53:16
+ * Modules: 10 files
+ * Description: Auto-generated optimized JavaScript
+ * DO NOT EDIT THIS FILE DIRECTLY - Edit individual modules instead
+ * ============================================================================
+ */
+
+"use strict";
+
+/**
+ * ==================== BANNER CAROUSEL TRANG CHỦ ====================
+ * File: 08-banner-carousel.js
+ * Tạo tự động từ: main.js
+ * Ngày tạo: 02/11/2025 22:14:15
+ * ==========================================================================
+ * 
+
+        📍 Vị trí: Trang chủ (index.html)
+        🎯 Chức năng: Quản lý carousel banner với đầy đủ tính năng
+        📄 Sử dụng tại:
+           - public/index.html (id="bannerCarousel")
+           - CSS: 04-banner.css
+        🔧 Các tính năng:
+           1. ✅ LAZY LOAD: IntersectionObserver tải ảnh khi cần
+           2. ✅ PRELOAD: Tải trước slide hiện tại và 2 slide kế (prev/next)
+           3. ✅ PAUSE ON HOVER: Desktop dừng khi hover
+           4. ✅ PAUSE ON TOUCH: Mobile dừng khi chạm, resume sau 3s
+           5. ✅ KEYBOARD: Arrow Left/Right điều khiển
+           6. ✅ REDUCED MOTION: Tôn trọng prefers-reduced-motion
+           7. ✅ SMOOTH CTA: Banner buttons scroll mượt
+           8. ✅ FALLBACK: Force load tất cả ảnh sau 3s
+           9. ✅ ANALYTICS: Track views nếu có Google Analytics/GTM
+           10. ✅ PRECONNECT: Nếu dùng Cloudinary/ImgIX CDN
+        
+ * ==========================================================================
+ */
+document.addEventListener('DOMContentLoaded', function() {
+  const carousel = document.getElementById('bannerCarousel');
+  if (!carousel) return;
+  const lazyBannerImages = carousel.querySelectorAll('.banner-img[loading="lazy"]');
+  if ('IntersectionObserver' in window && lazyBannerImages.length > 0) {
+    const bannerObserver = new IntersectionObserver((entries, observer) => {
+      entries.forEach(entry => {
+        if (entry.isIntersecting) {
+          const img = entry.target;
+          const parent = img.closest('.carousel-item');
+          if (parent) parent.classList.add('loading');
+          img.onload = function() {
+            img.classList.add('loaded');
+            if (parent) parent.classList.remove('loading');
+            observer.unobserve(img);
+          };
+          if (img.dataset.src) {
+            img.src = img.dataset.src;
+          } else {
+            img.classList.add('loaded');
+            if (parent) parent.classList.remove('loading');
+          }
+        }
+      });
+    }, {
+      rootMargin: '100px'
+    });
+    lazyBannerImages.forEach(img => bannerObserver.observe(img));
+  } else {
+    lazyBannerImages.forEach(img => img.classList.add('loaded'));
+  }
+  carousel.addEventListener('slide.bs.carousel', function(e) {
+    const slides = carousel.querySelectorAll('.carousel-item');
+    const nextIndex = e.to;
+    const currentSlide = slides[nextIndex];
+    if (currentSlide) {
+      const currentImg = currentSlide.querySelector('.banner-img');
+      if (currentImg && !currentImg.classList.contains('loaded')) {
+        currentImg.classList.add('loaded');
+      }
+    }
+    const prevIndex = nextIndex - 1 < 0 ? slides.length - 1 : nextIndex - 1;
+    const nextSlideIndex = nextIndex + 1 >= slides.length ? 0 : nextIndex + 1;
+    [prevIndex, nextSlideIndex].forEach(index => {
+      const slide = slides[index];
+      if (slide) {
+        const img = slide.querySelector('.banner-img');
+        if (img && !img.classList.contains('loaded')) {
+          img.classList.add('loaded');
+        }
+      }
+    });
+  });
+  if (window.innerWidth >= 768) {
+    let isHovering = false;
+    carousel.addEventListener('mouseenter', function() {
+      isHovering = true;
+      const bsCarousel = bootstrap.Carousel.getInstance(carousel);
+      if (bsCarousel) bsCarousel.pause();
+    });
+    carousel.addEventListener('mouseleave', function() {
+      if (isHovering) {
+        isHovering = false;
+        const bsCarousel = bootstrap.Carousel.getInstance(carousel);
+        if (bsCarousel) bsCarousel.cycle();
+      }
+    });
+  }
+  carousel.addEventListener('touchstart', function() {
+    const bsCarousel = bootstrap.Carousel.getInstance(carousel);
+    if (bsCarousel) bsCarousel.pause();
+  });
+  carousel.addEventListener('touchend', function() {
+    const bsCarousel = bootstrap.Carousel.getInstance(carousel);
+    if (bsCarousel) {
+      setTimeout(() => bsCarousel.cycle(), 3000);
+    }
+  });
+  carousel.addEventListener('keydown', function(e) {
+    const bsCarousel = bootstrap.Carousel.getInstance(carousel);
+    if (!bsCarousel) return;
+    if (e.key === 'ArrowLeft') {
+      e.preventDefault();
+      bsCarousel.prev();
+    } else if (e.key === 'ArrowRight') {
+      e.preventDefault();
+      bsCarousel.next();
+    }
+  });
+  if (window.matchMedia('(prefers-reduced-motion: reduce)').matches) {
+    carousel.setAttribute('data-bs-interval', 'false');
+    carousel.querySelectorAll('.carousel-item').forEach(item => {
+      item.style.transition = 'none';
+    });
+  }
+  const bannerCTAs = carousel.querySelectorAll('.carousel-caption .btn[href^="#"]');
+  bannerCTAs.forEach(btn => {
+    btn.addEventListener('click', function(e) {
+      const href = this.getAttribute('href');
+      if (href && href !== '#') {
+        const target = document.querySelector(href);
+        if (target) {
+          e.preventDefault();
+          target.scrollIntoView({
+            behavior: 'smooth',
+            block: 'start'
+          });
+        }
+      }
+    });
+  });
+  setTimeout(() => {
+    const unloadedImages = carousel.querySelectorAll('.banner-img:not(.loaded)');
+    unloadedImages.forEach(img => {
+      img.classList.add('loaded');
+      const parent = img.closest('.carousel-item');
+      if (parent) parent.classList.remove('loading');
+    });
+  }, 3000);
+  if (typeof gtag !== 'undefined') {
+    carousel.addEventListener('slid.bs.carousel', function(e) {
+      const activeSlide = carousel.querySelector('.carousel-item.active');
+      const bannerTitle = activeSlide?.querySelector('h1, h2')?.textContent;
+      gtag('event', 'banner_view', {
+        'event_category': 'Banner',
+        'event_label': bannerTitle || `Slide ${e.to + 1}`,
+        'value': e.to + 1
+      });
+    });
+  }
+  const firstBanner = carousel.querySelector('.banner-img');
+  if (firstBanner) {
+    const src = firstBanner.getAttribute('src') || '';
+    if (src.includes('cloudinary.com') || src.includes('imgix.net')) {
+      const preconnect = document.createElement('link');
+      preconnect.rel = 'preconnect';
+      preconnect.href = src.includes('cloudinary')
+        ? 'https://res.cloudinary.com'
+        : 'https://assets.imgix.net';
+      preconnect.crossOrigin = 'anonymous';
+      document.head.appendChild(preconnect);
+    }
+  }
+});
+let resizeTimer;
+window.addEventListener('resize', function() {
+  clearTimeout(resizeTimer);
+  resizeTimer = setTimeout(function() {
+    const carousel = document.getElementById('bannerCarousel');
+    if (!carousel) return;
+    const pictures = carousel.querySelectorAll('picture');
+    pictures.forEach(picture => {
+      const img = picture.querySelector('img');
+      if (img) {
+        img.src = img.src;
+      }
+    });
+  }, 250);
+});
+(function () {
+  "use strict";
+  const carousel = document.getElementById("projectsCarousel");
+  const prevBtn = document.getElementById("prevBtn");
+  const nextBtn = document.getElementById("nextBtn");
+  const dotsContainer = document.getElementById("carouselDots");
+  if (!carousel || !dotsContainer) {
+    console.warn("Featured Projects Carousel: Required elements not found");
+    return;
+  }
+  const slides = carousel.querySelectorAll(".project-slide");
+  const totalSlides = slides.length;
+  if (totalSlides === 0) {
+    console.warn("Featured Projects Carousel: No slides found");
+    return;
+  }
+  let currentIndex = 0;
+  let autoSlideInterval = null;
+  let isDragging = false;
+  let startPos = 0;
+  let currentTranslate = 0;
+  let prevTranslate = 0;
+  let animationID = 0;
+  const config = {
+    autoSlideDelay: 3000,
+    transitionDuration: 600,
+    dragThreshold: 50,
+  };
+  function init() {
+    createDots();
+    setupEventListeners();
+    updateCarousel(false);
+    startAutoSlide();
+    document.addEventListener("visibilitychange", handleVisibilityChange);
+    window.addEventListener("resize", debounce(handleResize, 250));
+    console.log(
+      `Featured Projects Carousel: Initialized with ${totalSlides} slides`
+    );
+  }
+  function createDots() {
+    dotsContainer.innerHTML = "";
+    slides.forEach((_, index) => {
+      const dot = document.createElement("div");
+      dot.className = "dot";
+      if (index === 0) dot.classList.add("active");
+      dot.setAttribute("aria-label", `Go to slide ${index + 1}`);
+      dot.setAttribute("data-index", index);
+      dot.addEventListener("click", () => goToSlide(index));
+      dotsContainer.appendChild(dot);
+    });
+    console.log(`Created ${slides.length} dots`);
+  }
+  function updateCarousel(smooth = true) {
+    if (smooth) {
+      carousel.style.transition = `transform ${config.transitionDuration}ms cubic-bezier(0.4, 0, 0.2, 1)`;
+    } else {
+      carousel.style.transition = "none";
+    }
+    const offset = -currentIndex * 100;
+    carousel.style.transform = `translateX(${offset}%)`;
+    const currentDots = dotsContainer.querySelectorAll(".dot");
+    currentDots.forEach((dot, index) => {
+      dot.classList.toggle("active", index === currentIndex);
+    });
+    slides.forEach((slide, index) => {
+      slide.setAttribute("aria-hidden", index !== currentIndex);
+    });
+  }
+  function goToSlide(index) {
+    if (index < 0 || index >= totalSlides) return;
+    currentIndex = index;
+    updateCarousel();
+    resetAutoSlide();
+  }
+  function nextSlide() {
+    currentIndex = (currentIndex + 1) % totalSlides;
+    updateCarousel();
+  }
+  function prevSlide() {
+    currentIndex = (currentIndex - 1 + totalSlides) % totalSlides;
+    updateCarousel();
+  }
+  function startAutoSlide() {
+    stopAutoSlide();
+    autoSlideInterval = setInterval(nextSlide, config.autoSlideDelay);
+  }
+  function stopAutoSlide() {
+    if (autoSlideInterval) {
+      clearInterval(autoSlideInterval);
+      autoSlideInterval = null;
+    }
+  }
+  function resetAutoSlide() {
+    stopAutoSlide();
+    startAutoSlide();
+  }
+  function getPositionX(event) {
+    return event.type.includes("mouse")
+      ? event.pageX
+      : event.touches[0].clientX;
+  }
+  function dragStart(event) {
+    if (event.target.closest("a, button")) {
+      return;
+    }
+    isDragging = true;
+    startPos = getPositionX(event);
+    animationID = requestAnimationFrame(animation);
+    stopAutoSlide();
+    carousel.style.cursor = "grabbing";
+    carousel.classList.add("dragging");
+  }
+  function dragMove(event) {
+    if (!isDragging) return;
+    const currentPosition = getPositionX(event);
+    const diff = currentPosition - startPos;
+    currentTranslate = prevTranslate + diff;
+  }
+  function dragEnd() {
+    if (!isDragging) return;
+    isDragging = false;
+    cancelAnimationFrame(animationID);
+    carousel.style.cursor = "grab";
+    carousel.classList.remove("dragging");
+    const movedBy = currentTranslate - prevTranslate;
+    if (Math.abs(movedBy) > config.dragThreshold) {
+      if (movedBy < 0) {
+        nextSlide();
+      } else {
+        prevSlide();
+      }
+    } else {
+      updateCarousel();
+    }
+    prevTranslate = -currentIndex * carousel.offsetWidth;
+    currentTranslate = prevTranslate;
+    startAutoSlide();
+  }
+  function animation() {
+    if (!isDragging) return;
+    const slideWidth = carousel.offsetWidth;
+    const maxTranslate = 0;
+    const minTranslate = -(totalSlides - 1) * slideWidth;
+    if (currentTranslate > maxTranslate) {
+      currentTranslate = maxTranslate + (currentTranslate - maxTranslate) * 0.3;
+    }
+    if (currentTranslate < minTranslate) {
+      currentTranslate = minTranslate + (currentTranslate - minTranslate) * 0.3;
+    }
+    const percentageTranslate = (currentTranslate / slideWidth) * 100;
+    carousel.style.transition = "none";
+    carousel.style.transform = `translateX(${percentageTranslate}%)`;
+    animationID = requestAnimationFrame(animation);
+  }
+  function setupEventListeners() {
+    carousel.addEventListener("mousedown", dragStart);
+    carousel.addEventListener("mousemove", dragMove);
+    carousel.addEventListener("mouseup", dragEnd);
+    carousel.addEventListener("mouseleave", () => {
+      if (isDragging) dragEnd();
+    });
+    carousel.addEventListener("touchstart", dragStart, { passive: true });
+    carousel.addEventListener("touchmove", dragMove, { passive: true });
+    carousel.addEventListener("touchend", dragEnd);
+    carousel.addEventListener("contextmenu", (e) => e.preventDefault());
+    carousel.addEventListener("dragstart", (e) => e.preventDefault());
+    carousel.style.cursor = "grab";
+    carousel.addEventListener("mouseenter", stopAutoSlide);
+    carousel.addEventListener("mouseleave", () => {
+      if (!isDragging) startAutoSlide();
+    });
+    document.addEventListener("keydown", handleKeyboard);
+    if (nextBtn) {
+      nextBtn.addEventListener("click", () => {
+        nextSlide();
+        resetAutoSlide();
+      });
+    }
+    if (prevBtn) {
+      prevBtn.addEventListener("click", () => {
+        prevSlide();
+        resetAutoSlide();
+      });
+    }
+  }
+  function handleKeyboard(e) {
+    const rect = carousel.getBoundingClientRect();
+    const isInView = rect.top < window.innerHeight && rect.bottom >= 0;
+    if (!isInView) return;
+    if (e.key === "ArrowLeft") {
+      prevSlide();
+      resetAutoSlide();
+    } else if (e.key === "ArrowRight") {
+      nextSlide();
+      resetAutoSlide();
+    }
+  }
+  function handleVisibilityChange() {
+    if (document.hidden) {
+      stopAutoSlide();
+    } else {
+      startAutoSlide();
+    }
+  }
+  function handleResize() {
+    prevTranslate = -currentIndex * carousel.offsetWidth;
+    currentTranslate = prevTranslate;
+    updateCarousel(false);
+  }
+  function debounce(func, wait) {
+    let timeout;
+    return function executedFunction(...args) {
+      const later = () => {
+        clearTimeout(timeout);
+        func(...args);
+      };
+      clearTimeout(timeout);
+      timeout = setTimeout(later, wait);
+    };
+  }
+  function destroy() {
+    stopAutoSlide();
+    document.removeEventListener("visibilitychange", handleVisibilityChange);
+    window.removeEventListener("resize", handleResize);
+    document.removeEventListener("keydown", handleKeyboard);
+    console.log("Featured Projects Carousel: Destroyed");
+  }
+  window.destroyProjectsCarousel = destroy;
+  init();
+})();
+window.EnhancedEffects = window.EnhancedEffects || {};
+(function(EE) {
+  'use strict';
+EE.AnimatedCounter = {
+  counters: [],
+  isAnimated: new Set(),
+  init: function() {
+    this.counters = document.querySelectorAll('.about-stats h3, .stat-number h3');
+    if (this.counters.length === 0) return;
+    const observer = new IntersectionObserver(
+      (entries) => {
+        entries.forEach(entry => {
+          if (entry.isIntersecting && !this.isAnimated.has(entry.target)) {
+            this.animateCounter(entry.target);
+            this.isAnimated.add(entry.target);
+          }
+        });
+      },
+      { threshold: 0.5 }
+    );
+    this.counters.forEach(counter => observer.observe(counter));
+  },
+  animateCounter: function(element) {
+    let text = element.textContent.trim();
+    const match = text.match(/[\d.,]+/);
+    if (!match) return;
+    const targetNumber = parseInt(match[0].replace(/[.,]/g, ''), 10);
+    const suffix = text.replace(match[0], '').trim();
+    const duration = 2000;
+    const step = 300;
+    const totalSteps = Math.ceil(targetNumber / step);
+    const intervalTime = duration / totalSteps;
+    let current = 0;
+    const originalColor = window.getComputedStyle(element).color;
+    element.style.color = 'var(--brand-primary)';
+    element.style.transition = 'color 0.3s ease';
+    const timer = setInterval(() => {
+      current += step;
+      if (current >= targetNumber) {
+        current = targetNumber;
+        clearInterval(timer);
+        element.style.color = originalColor;
+      }
+      element.textContent = `${current.toLocaleString('vi-VN')}${suffix}`;
+    }, intervalTime);
+  }
+};
+  EE.ParallaxEffect = {
+    elements: [],
+    init: function() {
+      const parallaxConfig = [
+        { selector: '.video-container img', speed: 0.3 },
+      ];
+      parallaxConfig.forEach(config => {
+        const els = document.querySelectorAll(config.selector);
+        els.forEach(el => {
+          this.elements.push({ el: el, speed: config.speed });
+        });
+      });
+      if (this.elements.length > 0) {
+        this.handleScroll();
+        window.addEventListener('scroll', this.throttle(this.handleScroll.bind(this), 10));
+      }
+    },
+    handleScroll: function() {
+      const scrolled = window.pageYOffset;
+      this.elements.forEach(item => {
+        const rect = item.el.getBoundingClientRect();
+        const elementTop = rect.top + scrolled;
+        const windowHeight = window.innerHeight;
+        if (rect.top < windowHeight && rect.bottom > 0) {
+          const yPos = -((scrolled - elementTop) * item.speed);
+          item.el.style.transform = `translateY(${yPos}px)`;
+          item.el.style.willChange = 'transform';
+        }
+      });
+    },
+    throttle: function(func, delay) {
+      let lastCall = 0;
+      return function(...args) {
+        const now = Date.now();
+        if (now - lastCall >= delay) {
+          lastCall = now;
+          return func(...args);
+        }
+      };
+    }
+  };
+  EE.SmoothReveal = {
+    elements: [],
+    init: function() {
+      this.elements = document.querySelectorAll(`
+        .product-card:not(.animate-on-scroll),
+        .blog-card:not(.animate-on-scroll),
+        .process-step,
+        .feature-item,
+        section h2,
+        .title-underline
+      `);
+      if (this.elements.length === 0) return;
+      const observer = new IntersectionObserver(
+        (entries) => {
+          entries.forEach((entry, index) => {
+            if (entry.isIntersecting) {
+              setTimeout(() => {
+                entry.target.classList.add('revealed');
+              }, index * 100);
+              observer.unobserve(entry.target);
+            }
+          });
+        },
+        { threshold: 0.1, rootMargin: '0px 0px -50px 0px' }
+      );
+      this.elements.forEach(el => {
+        el.style.opacity = '0';
+        el.style.transform = 'translateY(30px)';
+        el.style.transition = 'opacity 0.6s ease, transform 0.6s ease';
+        observer.observe(el);
+      });
+      const style = document.createElement('style');
+      style.textContent = `
+        .revealed {
+          opacity: 1 !important;
+          transform: translateY(0) !important;
+        }
+      `;
+      document.head.appendChild(style);
+    }
+  };
+  EE.MagneticButtons = {
+    buttons: [],
+    init: function() {
+      if (window.innerWidth < 768) return;
+      this.buttons = document.querySelectorAll(`
+        .btn-warning:not(.mobile-blog-carousel-btn),
+        .btn-dark,
+        .btn-outline-warning
+      `);
+      this.buttons.forEach(btn => {
+        btn.style.transition = 'transform 0.2s ease-out';
+        btn.addEventListener('mousemove', this.handleMouseMove.bind(this));
+        btn.addEventListener('mouseleave', this.handleMouseLeave.bind(this));
+      });
+    },
+    handleMouseMove: function(e) {
+      const btn = e.currentTarget;
+      const rect = btn.getBoundingClientRect();
+      const x = e.clientX - rect.left - rect.width / 2;
+      const y = e.clientY - rect.top - rect.height / 2;
+      const moveX = x * 0.15;
+      const moveY = y * 0.15;
+      btn.style.transform = `translate(${moveX}px, ${moveY}px)`;
+    },
+    handleMouseLeave: function(e) {
+      const btn = e.currentTarget;
+      btn.style.transform = 'translate(0, 0)';
+    }
+  };
+  EE.TypingAnimation = {
+    elements: [],
+    init: function() {
+      const heading = document.querySelector('.about-content h2, #featured-projects h2:first-of-type');
+      if (!heading) return;
+      const originalText = heading.textContent;
+      heading.setAttribute('data-original-text', originalText);
+      heading.textContent = '';
+      heading.style.borderRight = '2px solid var(--brand-primary)';
+      heading.style.animation = 'blink 0.7s step-end infinite';
+      const style = document.createElement('style');
+      style.textContent = `
+        @keyframes blink {
+          from, to { border-color: transparent; }
+          50% { border-color: var(--brand-primary); }
+        }
+      `;
+      document.head.appendChild(style);
+      const observer = new IntersectionObserver(
+        (entries) => {
+          entries.forEach(entry => {
+            if (entry.isIntersecting) {
+              this.typeText(heading, originalText);
+              observer.unobserve(entry.target);
+            }
+          });
+        },
+        { threshold: 0.5 }
+      );
+      observer.observe(heading);
+    },
+    typeText: function(element, text) {
+      let index = 0;
+      const speed = 80;
+      const type = () => {
+        if (index < text.length) {
+          element.textContent += text.charAt(index);
+          index++;
+          setTimeout(type, speed);
+        } else {
+          setTimeout(() => {
+            element.style.borderRight = 'none';
+            element.style.animation = 'none';
+          }, 500);
+        }
+      };
+      type();
+    }
+  };
+  EE.init = function() {
+    if (document.readyState === 'loading') {
+      document.addEventListener('DOMContentLoaded', () => {
+        this.initAll();
+      });
+    } else {
+      this.initAll();
+    }
+  };
+  EE.initAll = function() {
+    console.log('🎨 Initializing Enhanced Effects...');
+    try {
+      this.AnimatedCounter.init();
+      this.MagneticButtons.init();
+      this.TypingAnimation.init();
+      setTimeout(() => {
+        this.ParallaxEffect.init();
+        this.SmoothReveal.init();
+      }, 100);
+      console.log('✅ Enhanced Effects loaded successfully!');
+    } catch (error) {
+      console.error('❌ Enhanced Effects error:', error);
+    }
+  };
+  EE.init();
+})(window.EnhancedEffects);
+window.addEventListener('beforeunload', function() {
+  if (window.EnhancedEffects) {
+    window.EnhancedEffects = null;
+  }
+});
+(function() {
+  'use strict';
+  window.BlogCarousel = window.BlogCarousel || {};
+  const BC = window.BlogCarousel;
+  BC.state = {
+    isCreated: false,
+    carouselInstance: null
+  };
+  BC.config = {
+    transitionDuration: 400,
+    snapThreshold: 0.3
+  };
+  BC.createOnce = function() {
+    if (this.state.isCreated) {
+      console.log('📱 Blog Carousel: Already exists, ensuring visibility');
+      return;
+    }
+    const blogSection = document.querySelector('#featured-blogs-section');
+    if (!blogSection) {
+      console.log('📱 Blog Carousel: Section not found');
+      return;
+    }
+    const originalGrid = blogSection.querySelector('.row.g-4');
+    if (!originalGrid) {
+      console.log('📱 Blog Carousel: Grid not found');
+      return;
+    }
+    const blogCards = originalGrid.querySelectorAll('.col-lg-4');
+    if (blogCards.length === 0) {
+      console.log('📱 Blog Carousel: No blog cards found');
+      return;
+    }
+    const wrapper = document.createElement('div');
+    wrapper.className = 'blog-carousel-wrapper';
+    const container = document.createElement('div');
+    container.className = 'blog-carousel-container';
+    const track = document.createElement('div');
+    track.className = 'blog-carousel-track';
+    blogCards.forEach((card) => {
+      const slide = document.createElement('div');
+      slide.className = 'blog-carousel-slide';
+      slide.innerHTML = card.innerHTML;
+      track.appendChild(slide);
+    });
+    const prevBtn = document.createElement('button');
+    prevBtn.className = 'blog-carousel-nav-btn blog-carousel-prev';
+    prevBtn.innerHTML = '<i class="bi bi-chevron-left"></i>';
+    prevBtn.setAttribute('aria-label', 'Previous');
+    const nextBtn = document.createElement('button');
+    nextBtn.className = 'blog-carousel-nav-btn blog-carousel-next';
+    nextBtn.innerHTML = '<i class="bi bi-chevron-right"></i>';
+    nextBtn.setAttribute('aria-label', 'Next');
+    container.appendChild(track);
+    wrapper.appendChild(container);
+    wrapper.appendChild(prevBtn);
+    wrapper.appendChild(nextBtn);
+    originalGrid.parentNode.insertBefore(wrapper, originalGrid);
+    this.state.carouselInstance = this.setupCarousel(track, container, prevBtn, nextBtn);
+    this.state.isCreated = true;
+    console.log(`✅ Blog Carousel: Created with ${blogCards.length} cards (PERMANENT)`);
+  };
+  BC.setupCarousel = function(track, container, prevBtn, nextBtn) {
+    const slides = track.querySelectorAll('.blog-carousel-slide');
+    let currentIndex = 0;
+    let itemsPerView = 1;
+    let isDragging = false;
+    let startPos = 0;
+    let currentTranslate = 0;
+    let prevTranslate = 0;
+    let dragDistance = 0;
+    function updateItemsPerView() {
+      const width = window.innerWidth;
+      if (width < 768) {
+        itemsPerView = 1;
+      } else if (width <= 991) {
+        itemsPerView = 2;
+      }
+    }
+    function getSlideWidth() {
+      return container.offsetWidth / itemsPerView;
+    }
+    function updateCarousel(animate = true) {
+      const slideWidth = getSlideWidth();
+      const offset = -currentIndex * slideWidth;
+      if (animate) {
+        track.style.transition = `transform ${BC.config.transitionDuration}ms cubic-bezier(0.25, 0.46, 0.45, 0.94)`;
+      } else {
+        track.style.transition = 'none';
+      }
+      track.style.transform = `translateX(${offset}px)`;
+      currentTranslate = offset;
+      prevTranslate = offset;
+    }
+    function next() {
+      const maxIndex = slides.length - itemsPerView;
+      if (currentIndex < maxIndex) {
+        currentIndex++;
+      } else {
+        currentIndex = 0;
+      }
+      updateCarousel();
+    }
+    function prev() {
+      if (currentIndex > 0) {
+        currentIndex--;
+      } else {
+        currentIndex = slides.length - itemsPerView;
+      }
+      updateCarousel();
+    }
+    function goToSlide(index) {
+      const maxIndex = slides.length - itemsPerView;
+      currentIndex = Math.max(0, Math.min(index, maxIndex));
+      updateCarousel();
+    }
+    function getPositionX(event) {
+      return event.type.includes('mouse') ? event.pageX : event.touches[0].clientX;
+    }
+    function dragStart(event) {
+      isDragging = true;
+      startPos = getPositionX(event);
+      dragDistance = 0;
+      track.style.cursor = 'grabbing';
+      track.style.transition = 'none';
+      if (event.type === 'touchstart') {
+      }
+    }
+    function dragMove(event) {
+      if (!isDragging) return;
+      const currentPosition = getPositionX(event);
+      dragDistance = currentPosition - startPos;
+      currentTranslate = prevTranslate + dragDistance;
+      track.style.transform = `translateX(${currentTranslate}px)`;
+      if (Math.abs(dragDistance) > 10) {
+        event.preventDefault();
+      }
+    }
+    function dragEnd() {
+      if (!isDragging) return;
+      isDragging = false;
+      track.style.cursor = 'grab';
+      const slideWidth = getSlideWidth();
+      const movedBy = dragDistance;
+      const movePercentage = Math.abs(movedBy) / slideWidth;
+      if (movePercentage > BC.config.snapThreshold || Math.abs(movedBy) > 50) {
+        if (movedBy < 0) {
+          next();
+        } else {
+          prev();
+        }
+      } else {
+        updateCarousel();
+      }
+    }
+    track.addEventListener('mousedown', dragStart);
+    track.addEventListener('mousemove', dragMove);
+    track.addEventListener('mouseup', dragEnd);
+    track.addEventListener('mouseleave', dragEnd);
+    track.addEventListener('touchstart', dragStart, { passive: true });
+    track.addEventListener('touchmove', dragMove, { passive: false });
+    track.addEventListener('touchend', dragEnd);
+    track.addEventListener('click', function(e) {
+      if (Math.abs(dragDistance) > 5) {
+        e.preventDefault();
+        e.stopPropagation();
+        return false;
+      }
+    }, true);
+    track.addEventListener('mousedown', function(e) {
+      dragDistance = 0;
+    });
+    track.addEventListener('touchstart', function(e) {
+      dragDistance = 0;
+    });
+    prevBtn.addEventListener('click', function(e) {
+      e.preventDefault();
+      prev();
+    });
+    nextBtn.addEventListener('click', function(e) {
+      e.preventDefault();
+      next();
+    });
+    track.style.cursor = 'grab';
+    track.style.userSelect = 'none';
+    document.addEventListener('keydown', function(e) {
+      if (!container.closest('.blog-carousel-wrapper')) return;
+      if (e.key === 'ArrowLeft') {
+        e.preventDefault();
+        prev();
+      } else if (e.key === 'ArrowRight') {
+        e.preventDefault();
+        next();
+      }
+    });
+    let resizeTimeout;
+    window.addEventListener('resize', () => {
+      clearTimeout(resizeTimeout);
+      resizeTimeout = setTimeout(() => {
+        updateItemsPerView();
+        goToSlide(currentIndex);
+      }, 250);
+    });
+    updateItemsPerView();
+    updateCarousel();
+    return {
+      next,
+      prev,
+      goToSlide,
+      updateItemsPerView,
+      updateCarousel,
+      getCurrentIndex: () => currentIndex
+    };
+  };
+  function init() {
+    BC.createOnce();
+  }
+  if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', init);
+  } else {
+    init();
+  }
+  window.addEventListener('pageshow', function(event) {
+    console.log('📱 pageshow:', event.persisted ? 'from cache' : 'normal load');
+    init();
+  });
+  console.log('📦 Blog Carousel: Module loaded (Smooth drag + Infinite loop)');
+})();
+(function() {
+  'use strict';
+  window.BannerEffect = window.BannerEffect || {};
+  const BannerEffect = window.BannerEffect;
+  BannerEffect.config = {
+    carouselId: 'bannerCarousel',
+    animationDelay: 100,
+    animationTypes: ['banner-fade-in', 'banner-slide-up', 'banner-slide-left', 'banner-zoom-in'],
+    defaultAnimation: 'banner-fade-in',
+    observerThreshold: 0.2,
+    enableIntersectionObserver: true,
+    dragThreshold: 50,
+    enableDrag: true
+  };
+  BannerEffect.state = {
+    carousel: null,
+    captions: [],
+    hasAnimated: false,
+    isInitialized: false,
+    currentAnimation: null,
+    bsCarousel: null,
+    isDragging: false,
+    startX: 0,
+    currentX: 0,
+    dragStartTime: 0
+  };
+  BannerEffect.init = function() {
+    console.log('🎬 Banner Effect: Initializing...');
+    this.state.carousel = document.getElementById(this.config.carouselId);
+    if (!this.state.carousel) {
+      console.warn('Banner Effect: Carousel not found');
+      return;
+    }
+    if (typeof bootstrap !== 'undefined' && bootstrap.Carousel) {
+      this.state.bsCarousel = bootstrap.Carousel.getInstance(this.state.carousel) ||
+                              new bootstrap.Carousel(this.state.carousel, {
+                                ride: 'carousel',
+                                interval: 5000,
+                                pause: 'hover'
+                              });
+    }
+    this.state.captions = Array.from(
+      this.state.carousel.querySelectorAll('.carousel-caption')
+    );
+    if (this.state.captions.length === 0) {
+      console.warn('Banner Effect: No captions found');
+      return;
+    }
+    this.setupInitialAnimation();
+    this.setupCarouselEvents();
+    if (this.config.enableIntersectionObserver) {
+      this.setupIntersectionObserver();
+    } else {
+      this.animateCaption(this.state.captions[0]);
+    }
+    if (this.config.enableDrag) {
+      this.setupDragEvents();
+    }
+    this.state.isInitialized = true;
+    console.log('✅ Banner Effect: Initialized successfully (with drag/swipe)');
+  };
+  BannerEffect.setupInitialAnimation = function() {
+    this.state.captions.forEach((caption, index) => {
+      const animationType = caption.dataset.animation ||
+                          this.config.defaultAnimation;
+      caption.dataset.animationType = animationType;
+      caption.classList.remove(...this.config.animationTypes);
+      caption.style.opacity = '0';
+      caption.style.visibility = 'hidden';
+    });
+  };
+  BannerEffect.animateCaption = function(caption) {
+    if (!caption) return;
+    const animationType = caption.dataset.animationType ||
+                         this.config.defaultAnimation;
+    caption.classList.remove(...this.config.animationTypes);
+    setTimeout(() => {
+      caption.style.visibility = 'visible';
+      caption.classList.add(animationType);
+      this.state.currentAnimation = animationType;
+    }, this.config.animationDelay);
+  };
+  BannerEffect.setupCarouselEvents = function() {
+    this.state.carousel.addEventListener('slide.bs.carousel', (event) => {
+      const nextIndex = event.to;
+      const nextCaption = this.state.captions[nextIndex];
+      if (nextCaption) {
+        this.state.captions.forEach(cap => {
+          cap.classList.remove(...this.config.animationTypes);
+          cap.style.opacity = '0';
+          cap.style.visibility = 'hidden';
+        });
+        this.animateCaption(nextCaption);
+      }
+    });
+    this.state.carousel.addEventListener('slid.bs.carousel', (event) => {
+      console.log(`Banner slid to index: ${event.to}`);
+    });
+  };
+  BannerEffect.setupIntersectionObserver = function() {
+    if ('IntersectionObserver' in window) {
+      const observerOptions = {
+        threshold: this.config.observerThreshold,
+        rootMargin: '0px'
+      };
+      const observer = new IntersectionObserver((entries) => {
+        entries.forEach(entry => {
+          if (entry.isIntersecting && !this.state.hasAnimated) {
+            const activeSlide = this.state.carousel.querySelector('.carousel-item.active');
+            const activeCaption = activeSlide ?
+                                 activeSlide.querySelector('.carousel-caption') :
+                                 this.state.captions[0];
+            if (activeCaption) {
+              this.animateCaption(activeCaption);
+              this.state.hasAnimated = true;
+              observer.unobserve(entry.target);
+            }
+          }
+        });
+      }, observerOptions);
+      observer.observe(this.state.carousel);
+    } else {
+      this.animateCaption(this.state.captions[0]);
+      this.state.hasAnimated = true;
+    }
+  };
+  BannerEffect.setupDragEvents = function() {
+    const carousel = this.state.carousel;
+    carousel.style.cursor = 'grab';
+    carousel.addEventListener('mousedown', this.handleDragStart.bind(this));
+    carousel.addEventListener('mousemove', this.handleDragMove.bind(this));
+    carousel.addEventListener('mouseup', this.handleDragEnd.bind(this));
+    carousel.addEventListener('mouseleave', this.handleDragEnd.bind(this));
+    carousel.addEventListener('touchstart', this.handleDragStart.bind(this), { passive: true });
+    carousel.addEventListener('touchmove', this.handleDragMove.bind(this), { passive: true });
+    carousel.addEventListener('touchend', this.handleDragEnd.bind(this));
+    carousel.addEventListener('contextmenu', (e) => {
+      if (this.state.isDragging) {
+        e.preventDefault();
+      }
+    });
+    const images = carousel.querySelectorAll('img');
+    images.forEach(img => {
+      img.addEventListener('dragstart', (e) => e.preventDefault());
+    });
+    console.log('👆 Banner Effect: Drag/Swipe enabled');
+  };
+  BannerEffect.handleDragStart = function(e) {
+    if (e.target.closest('a, button')) {
+      return;
+    }
+    this.state.isDragging = true;
+    this.state.startX = this.getPositionX(e);
+    this.state.currentX = this.state.startX;
+    this.state.dragStartTime = Date.now();
+    this.state.carousel.style.cursor = 'grabbing';
+    if (this.state.bsCarousel) {
+      this.state.bsCarousel.pause();
+    }
+  };
+  BannerEffect.handleDragMove = function(e) {
+    if (!this.state.isDragging) return;
+    this.state.currentX = this.getPositionX(e);
+  };
+  BannerEffect.handleDragEnd = function(e) {
+    if (!this.state.isDragging) return;
+    this.state.isDragging = false;
+    this.state.carousel.style.cursor = 'grab';
+    const dragDistance = this.state.currentX - this.state.startX;
+    const dragTime = Date.now() - this.state.dragStartTime;
+    const dragVelocity = Math.abs(dragDistance) / dragTime;
+    const shouldSlide = Math.abs(dragDistance) > this.config.dragThreshold ||
+                       dragVelocity > 0.5;
+    if (shouldSlide && this.state.bsCarousel) {
+      if (dragDistance > 0) {
+        this.state.bsCarousel.prev();
+      } else {
+        this.state.bsCarousel.next();
+      }
+    }
+    setTimeout(() => {
+      if (this.state.bsCarousel) {
+        this.state.bsCarousel.cycle();
+      }
+    }, 300);
+    this.state.startX = 0;
+    this.state.currentX = 0;
+    this.state.dragStartTime = 0;
+  };
+  BannerEffect.getPositionX = function(e) {
+    return e.type.includes('mouse') ? e.pageX : e.touches[0].clientX;
+  };
+  BannerEffect.setAnimationType = function(type) {
+    if (this.config.animationTypes.includes(type)) {
+      this.config.defaultAnimation = type;
+      console.log(`Banner Effect: Animation type set to ${type}`);
+    } else {
+      console.warn(`Banner Effect: Invalid animation type "${type}"`);
+    }
+  };
+  BannerEffect.toggleDrag = function(enable) {
+    this.config.enableDrag = enable;
+    if (enable && this.state.isInitialized) {
+      this.setupDragEvents();
+    }
+    console.log(`Banner Effect: Drag ${enable ? 'enabled' : 'disabled'}`);
+  };
+  BannerEffect.refresh = function() {
+    if (!this.state.isInitialized) return;
+    console.log('🔄 Banner Effect: Refreshing...');
+    this.setupInitialAnimation();
+    const activeCaption = this.state.carousel.querySelector('.carousel-item.active .carousel-caption');
+    if (activeCaption) {
+      this.animateCaption(activeCaption);
+    }
+  };
+  BannerEffect.destroy = function() {
+    if (!this.state.isInitialized) return;
+    console.log('🗑️ Banner Effect: Destroying...');
+    this.state.captions.forEach(caption => {
+      caption.classList.remove(...this.config.animationTypes);
+      caption.style.opacity = '';
+      caption.style.visibility = '';
+    });
+    if (this.state.carousel) {
+      this.state.carousel.style.cursor = '';
+    }
+    this.state = {
+      carousel: null,
+      captions: [],
+      hasAnimated: false,
+      isInitialized: false,
+      currentAnimation: null,
+      bsCarousel: null,
+      isDragging: false,
+      startX: 0,
+      currentX: 0,
+      dragStartTime: 0
+    };
+  };
+  if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', () => {
+      BannerEffect.init();
+    });
+  } else {
+    BannerEffect.init();
+  }
+  window.addEventListener('load', () => {
+    if (!BannerEffect.state.isInitialized) {
+      BannerEffect.init();
+    }
+  });
+  window.addEventListener('beforeunload', () => {
+    BannerEffect.destroy();
+  });
+  console.log('📦 Banner Effect: Module loaded (with drag/swipe support)');
+})();
+(function() {
+  'use strict';
+  window.Newsletter = window.Newsletter || {};
+  const newsletter = window.Newsletter;
+  newsletter.init = function() {
+    const form = document.getElementById('newsletterForm');
+    if (!form) return;
+    form.addEventListener('submit', this.handleSubmit.bind(this));
+    console.log('✅ Newsletter: Initialized');
+  };
+  newsletter.handleSubmit = async function(e) {
+    e.preventDefault();
+    const form = e.target;
+    const emailInput = form.querySelector('#newsletter-email');
+    const consentCheckbox = form.querySelector('#newsletter-consent');
+    const messageEl = document.getElementById('newsletterMessage');
+    const submitBtn = form.querySelector('#newsletter-submit-btn');
+    const btnText = submitBtn.querySelector('.btn-text');
+    const btnIcon = submitBtn.querySelector('.btn-icon');
+    const btnSpinner = submitBtn.querySelector('.btn-spinner');
+    messageEl.className = 'newsletter-message';
+    messageEl.textContent = '';
+    if (!emailInput.value.trim()) {
+      this.showMessage(messageEl, 'Vui lòng nhập email!', 'error');
+      emailInput.focus();
+      return;
+    }
+    if (!consentCheckbox.checked) {
+      this.showMessage(messageEl, 'Vui lòng đồng ý nhận email marketing!', 'error');
+      return;
+    }
+    submitBtn.disabled = true;
+    btnText.classList.add('d-none');
+    btnIcon.classList.add('d-none');
+    btnSpinner.classList.remove('d-none');
+    try {
+      const response = await fetch('/newsletter/subscribe', {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+          'X-Requested-With': 'XMLHttpRequest'
+        },
+        body: JSON.stringify({
+          email: emailInput.value.trim(),
+          consent: consentCheckbox.checked
+        })
+      });
+      const data = await response.json();
+      if (response.ok && data.success) {
+        this.showMessage(messageEl, data.message, 'success');
+        form.reset();
+        if (typeof gtag !== 'undefined') {
+          gtag('event', 'newsletter_signup', {
+            'event_category': 'Newsletter',
+            'event_label': 'Success'
+          });
+        }
+      } else {
+        this.showMessage(messageEl, data.message || 'Có lỗi xảy ra!', 'error');
+      }
+    } catch (error) {
+      console.error('Newsletter subscription error:', error);
+      this.showMessage(
+        messageEl,
+        'Không thể kết nối đến server. Vui lòng thử lại!',
+        'error'
+      );
+    } finally {
+      submitBtn.disabled = false;
+      btnText.classList.remove('d-none');
+      btnIcon.classList.remove('d-none');
+      btnSpinner.classList.add('d-none');
+    }
+  };
+  newsletter.showMessage = function(element, message, type) {
+    element.textContent = message;
+    element.className = `newsletter-message ${type}`;
+    if (type === 'success') {
+      setTimeout(() => {
+        element.style.opacity = '0';
+        setTimeout(() => {
+          element.className = 'newsletter-message';
+          element.textContent = '';
+          element.style.opacity = '1';
+        }, 300);
+      }, 5000);
+    }
+  };
+  if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', () => newsletter.init());
+  } else {
+    newsletter.init();
+  }
+})();
+(function() {
+  'use strict';
+  window.TestimonialsCarousel = window.TestimonialsCarousel || {};
+  const testimonials = window.TestimonialsCarousel;
+  testimonials.config = {
+    autoSlideDelay: 4000,
+    transitionDuration: 500,
+    dragThreshold: 50
+  };
+  testimonials.state = {
+    currentSlide: 0,
+    totalSlides: 0,
+    isDragging: false,
+    startX: 0,
+    currentX: 0,
+    autoSlideInterval: null,
+    isInitialized: false
+  };
+  testimonials.elements = {
+    track: null,
+    cards: [],
+    dots: []
+  };
+  testimonials.init = function() {
+    const section = document.getElementById('testimonials-section');
+    if (!section) return;
+    this.elements.track = section.querySelector('.testimonials-track');
+    this.elements.cards = Array.from(section.querySelectorAll('.testimonial-card'));
+    this.state.totalSlides = this.elements.cards.length;
+    if (this.state.totalSlides === 0) return;
+    this.createDots();
+    this.setupEventListeners();
+    this.startAutoSlide();
+    this.state.isInitialized = true;
+    console.log(`✅ Testimonials Carousel: Initialized with ${this.state.totalSlides} slides`);
+  };
+  testimonials.createDots = function() {
+    const dotsContainer = document.querySelector('.testimonials-dots');
+    if (!dotsContainer) return;
+    for (let i = 0; i < this.state.totalSlides; i++) {
+      const dot = document.createElement('button');
+      dot.className = 'testimonial-dot';
+      dot.setAttribute('aria-label', `Go to testimonial ${i + 1}`);
+      if (i === 0) dot.classList.add('active');
+      dot.addEventListener('click', () => {
+        this.goToSlide(i);
+        this.resetAutoSlide();
+      });
+      dotsContainer.appendChild(dot);
+      this.elements.dots.push(dot);
+    }
+  };
+  testimonials.setupEventListeners = function() {
+    const track = this.elements.track;
+    track.addEventListener('mousedown', this.handleDragStart.bind(this));
+    track.addEventListener('mousemove', this.handleDragMove.bind(this));
+    track.addEventListener('mouseup', this.handleDragEnd.bind(this));
+    track.addEventListener('mouseleave', this.handleDragEnd.bind(this));
+    track.addEventListener('touchstart', this.handleDragStart.bind(this), { passive: true });
+    track.addEventListener('touchmove', this.handleDragMove.bind(this), { passive: true });
+    track.addEventListener('touchend', this.handleDragEnd.bind(this));
+    track.addEventListener('mouseenter', () => this.stopAutoSlide());
+    track.addEventListener('mouseleave', () => this.startAutoSlide());
+    document.addEventListener('visibilitychange', () => {
+      document.hidden ? this.stopAutoSlide() : this.startAutoSlide();
+    });
+  };
+  testimonials.goToSlide = function(index) {
+    if (index < 0 || index >= this.state.totalSlides) return;
+    this.state.currentSlide = index;
+    const translateX = -index * 100;
+    this.elements.track.style.transition = `transform ${this.config.transitionDuration}ms ease`;
+    this.elements.track.style.transform = `translateX(${translateX}%)`;
+    this.updateDots();
+  };
+  testimonials.nextSlide = function() {
+    const next = (this.state.currentSlide + 1) % this.state.totalSlides;
+    this.goToSlide(next);
+  };
+  testimonials.updateDots = function() {
+    this.elements.dots.forEach((dot, index) => {
+      dot.classList.toggle('active', index === this.state.currentSlide);
+    });
+  };
+  testimonials.handleDragStart = function(e) {
+    if (e.target.closest('a, button')) return;
+    this.state.isDragging = true;
+    this.state.startX = this.getPositionX(e);
+    this.elements.track.classList.add('dragging');
+    this.stopAutoSlide();
+  };
+  testimonials.handleDragMove = function(e) {
+    if (!this.state.isDragging) return;
+    this.state.currentX = this.getPositionX(e);
+  };
+  testimonials.handleDragEnd = function() {
+    if (!this.state.isDragging) return;
+    this.state.isDragging = false;
+    this.elements.track.classList.remove('dragging');
+    const diff = this.state.currentX - this.state.startX;
+    if (Math.abs(diff) > this.config.dragThreshold) {
+      if (diff > 0 && this.state.currentSlide > 0) {
+        this.goToSlide(this.state.currentSlide - 1);
+      } else if (diff < 0 && this.state.currentSlide < this.state.totalSlides - 1) {
+        this.goToSlide(this.state.currentSlide + 1);
+      }
+    }
+    this.startAutoSlide();
+  };
+  testimonials.getPositionX = function(e) {
+    return e.type.includes('mouse') ? e.pageX : e.touches[0].clientX;
+  };
+  testimonials.startAutoSlide = function() {
+    this.stopAutoSlide();
+    this.state.autoSlideInterval = setInterval(() => {
+      this.nextSlide();
+    }, this.config.autoSlideDelay);
+  };
+  testimonials.stopAutoSlide = function() {
+    if (this.state.autoSlideInterval) {
+      clearInterval(this.state.autoSlideInterval);
+      this.state.autoSlideInterval = null;
+    }
+  };
+  testimonials.resetAutoSlide = function() {
+    this.stopAutoSlide();
+    this.startAutoSlide();
+  };
+  testimonials.destroy = function() {
+    if (!this.state.isInitialized) return;
+    this.stopAutoSlide();
+    console.log('Testimonials Carousel: Destroyed');
+  };
+  if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', () => testimonials.init());
+  } else {
+    testimonials.init();
+  }
+  window.addEventListener('beforeunload', () => testimonials.destroy());
+})();
+(function() {
+  'use strict';
+  window.TrustBadges = {
+    init: function() {
+      const badges = document.querySelectorAll('.trust-badge');
+      if (badges.length === 0) return;
+      const observer = new IntersectionObserver((entries) => {
+        entries.forEach((entry, index) => {
+          if (entry.isIntersecting) {
+            setTimeout(() => {
+              entry.target.classList.add('revealed');
+            }, index * 100);
+            observer.unobserve(entry.target);
+          }
+        });
+      }, { threshold: 0.2 });
+      badges.forEach(badge => observer.observe(badge));
+      console.log('✅ Trust Badges: Initialized');
+    }
+  };
+  if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', () => TrustBadges.init());
+  } else {
+    TrustBadges.init();
+  }
+})();
+(function() {
+  'use strict';
+  window.Timeline = {
+    init: function() {
+      const items = document.querySelectorAll('.timeline-item');
+      if (items.length === 0) return;
+      const observer = new IntersectionObserver((entries) => {
+        entries.forEach(entry => {
+          if (entry.isIntersecting) {
+            entry.target.classList.add('revealed');
+            observer.unobserve(entry.target);
+          }
+        });
+      }, { threshold: 0.3 });
+      items.forEach(item => observer.observe(item));
+      console.log('✅ Timeline: Initialized');
+    }
+  };
+  if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', () => Timeline.init());
+  } else {
+    Timeline.init();
+  }
+})();
\ No newline at end of file
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Asset fingerprint - dùng chung cho build_css.py / build_js.py
+
+- publish_asset(): ghi thêm bản có hash nội dung trong tên file
+    css/main.min.css  =>  css/main.min.3f2a1b9c0d4e.css
+  và cập nhật app/static/assets-manifest.json: {"css/main.min.css": "css/main.min.3f2a1b9c0d4e.css"}
+- Nội dung đổi => tên đổi => trình duyệt/CDN cache vĩnh viễn (immutable) bản cũ vẫn đúng
+- Hash bỏ qua dòng "Generated: <thời gian>" trong banner => build lại cùng source, cùng tên file
+- Bản hash cũ của cùng file bị xóa khi publish bản mới
+- File gốc (main.min.css) vẫn giữ để dùng khi chưa có manifest
+- precompress(): ghi kèm .br (Brotli quality 11) + .gz (gzip level 9) cạnh file
+  => app/assets.py gửi thẳng bản nén theo Accept-Encoding, không nén lúc request
+
+- Bản hash, .br/.gz và manifest KHÔNG commit (.gitignore) - tạo ở bước build khi deploy:
+    pip install -r requirements.txt && python asset_build.py
+  chưa chạy => app dùng URL gốc (main.min.css), nén lúc request
+
+Usage:
+    from asset_build import publish_asset
+    publish_asset(OUTPUT_FILE)
+
+    python asset_build.py      # fingerprint + nén sẵn mọi file đã build (main.min.*, chunk JS)
+"""
+
+import gzip
+import hashlib
+import json
+import re
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli đi kèm Flask-Compress
+    brotli = None
+
+BASE_DIR = Path(__file__).parent.resolve()
+STATIC_DIR = BASE_DIR / 'app' / 'static'
+MANIFEST_FILE = STATIC_DIR / 'assets-manifest.json'
+
+CHUNK_MAP_FILE = STATIC_DIR / 'js' / 'chunks.json'
+
+# File build luôn có (chunk JS lấy thêm từ js/chunks.json)
+BUILT_ASSETS = ('css/main.min.css', 'js/main.min.js')
+
+HASH_LENGTH = 12
+
+# Dòng thời gian build trong banner (build_css.py / build_js.py) - đổi mỗi lần build
+_BUILD_TIME_LINE = re.compile(rb'^ \* Generated: .*$\n?', re.MULTILINE)
+
+
+def content_hash(data):
+    """Hash nội dung, bỏ qua dòng "Generated:" của banner (hex, HASH_LENGTH ký tự)"""
+    return hashlib.sha256(_BUILD_TIME_LINE.sub(b'', data)).hexdigest()[:HASH_LENGTH]
+
+
+def hashed_name(path, digest):
+    """main.min.css + hash => main.min.<hash>.css"""
+    return path.with_name(f'{path.stem}.{digest}{path.suffix}')
+
+
+def _old_versions(path):
+    """Các bản hash cũ của path trong cùng thư mục"""
+    pattern = re.compile(
+        rf'^{re.escape(path.stem)}\.[0-9a-f]{{{HASH_LENGTH}}}{re.escape(path.suffix)}(\.br|\.gz)?$'
+    )
+    return [p for p in path.parent.iterdir() if pattern.match(p.name)]
+
+
+def load_manifest():
+    if MANIFEST_FILE.exists():
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def save_manifest(manifest):
+    with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(manifest.items())), f, indent=2)
+        f.write('\n')
+
+
+def _write_if_changed(path, data):
+    if not path.exists() or path.read_bytes() != data:
+        path.write_bytes(data)
+
+
+def precompress(path):
+    """
+    Ghi path.br / path.gz (mức nén cao nhất, nén 1 lần lúc build)
+    - gzip mtime=0 => cùng nội dung cho ra cùng bytes
+    Returns: list Path đã ghi
+    """
+    path = Path(path)
+    data = path.read_bytes()
+    written = []
+
+    gz_path = path.with_name(path.name + '.gz')
+    _write_if_changed(gz_path, gzip.compress(data, compresslevel=9, mtime=0))
+    written.append(gz_path)
+
+    br_path = path.with_name(path.name + '.br')
+    if brotli is not None:
+        _write_if_changed(br_path, brotli.compress(data, quality=11))
+        written.append(br_path)
+    elif br_path.exists():
+        br_path.unlink()  # bản .br cũ không còn khớp nội dung
+    return written
+
+
+def publish_asset(path):
+    """
+    Ghi bản fingerprint (+ .br/.gz) của file đã build + cập nhật manifest
+    Returns: Path của file đã hash
+    """
+    path = Path(path)
+    data = path.read_bytes()
+    target = hashed_name(path, content_hash(data))
+
+    keep = {target, target.with_name(target.name + '.br'), target.with_name(target.name + '.gz')}
+    for old in _old_versions(path):
+        if old not in keep:
+            old.unlink()
+    _write_if_changed(target, data)
+    precompress(path)
+    precompress(target)
+
+    manifest = load_manifest()
+    manifest[path.relative_to(STATIC_DIR).as_posix()] = target.relative_to(STATIC_DIR).as_posix()
+    save_manifest(manifest)
+    return target
+
+
+def built_assets():
+    """Đường dẫn (trong static/) các file đã build cần fingerprint"""
+    paths = list(BUILT_ASSETS)
+    if CHUNK_MAP_FILE.exists():
+        with open(CHUNK_MAP_FILE, 'r', encoding='utf-8') as f:
+            chunk_map = json.load(f)
+        paths += sorted({chunk for chunks in chunk_map.values() for chunk in chunks})
+    return paths
+
+
+def publish_all():
+    """
+    Fingerprint + nén sẵn toàn bộ file đã build (bước build khi deploy)
+    - Entry manifest của file không còn tồn tại bị bỏ
+    Returns: {logical: hashed}
+    """
+    published = {}
+    for logical in built_assets():
+        path = STATIC_DIR / logical
+        if path.exists():
+            published[logical] = publish_asset(path).relative_to(STATIC_DIR).as_posix()
+
+    manifest = load_manifest()
+    for logical in list(manifest):
+        if logical not in published:
+            del manifest[logical]
+    save_manifest(manifest)
+    return published
+
+
+if __name__ == '__main__':
+    for logical, hashed in publish_all().items():
+        print(f"✓ {logical} => {hashed}")
@@ -8,9 +8,12 @@ pip install watchdog
 
 import os
 import re
+from collections import namedtuple
 from pathlib import Path
 from datetime import datetime
 
+from asset_build import publish_asset, MANIFEST_FILE
+
 # ==================== CẤU HÌNH DỰ ÁN ====================
 BASE_DIR = Path(__file__).parent.resolve()
 STATIC_DIR = BASE_DIR / 'app' / 'static'
@@ -19,6 +22,34 @@ MODULES_DIR = CSS_DIR / 'modules'
 INPUT_FILE = CSS_DIR / 'style.css'
 OUTPUT_FILE = CSS_DIR / 'main.min.css'
 
+# ==================== CRITICAL CSS ====================
+# Mỗi template trang (extends layout) => css/critical/<template>.css (inline trong <head>, xem app/assets.py)
+TEMPLATES_DIR = BASE_DIR / 'app' / 'templates'
+CRITICAL_DIR = CSS_DIR / 'critical'
+CRITICAL_LAYOUT = 'layouts/base.html'
+CRITICAL_TEMPLATE_DIRS = ('public', 'errors')
+# Phần nội dung trang coi là "above the fold": N ký tự markup đầu tiên của block content
+# (layout phía trên block content - topbar, navbar, page loader - luôn tính)
+ABOVE_THE_FOLD_CHARS = 6000
+
+# ==================== TREE SHAKING ====================
+# Bỏ rule có class/id không xuất hiện trong template (app/templates/**) và JS (main.js + modules)
+CSS_TREE_SHAKING = True
+JS_SOURCE_DIR = STATIC_DIR / 'js'
+# Class gắn lúc chạy (Bootstrap JS, CKEditor trong nội dung bài viết, code Python...)
+CSS_SAFELIST = {
+    'show', 'showing', 'hiding', 'collapsing', 'collapsed', 'active', 'fade', 'disabled',
+    'modal-open', 'modal-backdrop', 'offcanvas-backdrop', 'was-validated', 'is-valid', 'is-invalid',
+    'image', 'table', 'media', 'raw-html-embed', 'marker-yellow', 'marker-green', 'text-tiny',
+    'text-small', 'text-big', 'text-huge',
+}
+CSS_SAFELIST_PATTERNS = (
+    re.compile(r'^carousel-item-'),       # Bootstrap carousel: -start/-end/-next/-prev
+    re.compile(r'^(tooltip|popover|bs-)'),
+    re.compile(r'^(ck|image-|image_|table-)'),  # CKEditor content
+    re.compile(r'^alert-'),               # flash(category) => alert-{{ category }}
+)
+
 # ==================== CẤU TRÚC MODULE CSS ====================
 CSS_MODULES = {
     '01-variables.css': {
@@ -271,22 +302,25 @@ def print_warning(message):
     print(f"⚠️  {message}")
 
 
-def extract_css_section(content, start_marker, end_marker):
-    """Trích xuất section CSS giữa 2 marker"""
+def extract_css_section(content, start_marker, end_marker, position=0):
+    """
+    Trích xuất section CSS giữa 2 marker, tìm từ vị trí position
+    => (section, vị trí kết thúc) - module sau tìm tiếp từ đó
+    (marker như ACCESSIBILITY lặp lại nhiều lần trong style.css, tìm từ đầu file sẽ lấy trùng module khác)
+    """
     if not start_marker:
-        return ""
+        return "", position
 
-    start_idx = content.find(start_marker)
+    start_idx = content.find(start_marker, position)
     if start_idx == -1:
-        return ""
+        return "", position
 
     if end_marker:
-        end_idx = content.find(end_marker, start_idx)
-        if end_idx == -1:
-            return content[start_idx:]
-        return content[start_idx:end_idx]
+        end_idx = content.find(end_marker, start_idx + len(start_marker))
+        if end_idx != -1:
+            return content[start_idx:end_idx], end_idx
 
-    return content[start_idx:]
+    return content[start_idx:], len(content)
 
 
 def minify_css(css_content):
@@ -309,6 +343,390 @@ def minify_css(css_content):
     return (header + "\n" + css_content.strip()) if header else css_content.strip()
 
 
+# ==================== CSS RULE PARSER ====================
+# prelude: selector / at-rule; body: khai báo (str) hoặc list CssRule con (@media, @supports)
+CssRule = namedtuple('CssRule', ['prelude', 'body'])
+
+# At-rule chứa rule con (lọc đệ quy); at-rule khác (@keyframes, @font-face...) giữ nguyên khối
+NESTED_AT_RULES = ('@media', '@supports')
+
+
+def _block_end(css, start):
+    """Vị trí '}' đóng khối mở tại css[start] == '{' (bỏ qua chuỗi trong dấu nháy)"""
+    depth = 0
+    quote = None
+    i = start
+    while i < len(css):
+        char = css[i]
+        if quote:
+            if char == '\\':
+                i += 1
+            elif char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    return len(css)
+
+
+def parse_css_rules(css):
+    """CSS (đã bỏ comment) => list CssRule theo đúng thứ tự"""
+    rules = []
+    i = 0
+    while i < len(css):
+        brace = css.find('{', i)
+        semicolon = css.find(';', i)
+        # @import / @charset không có khối
+        if semicolon != -1 and (brace == -1 or semicolon < brace) and css[i:semicolon].strip().startswith('@'):
+            rules.append(CssRule(css[i:semicolon].strip(), None))
+            i = semicolon + 1
+            continue
+        if brace == -1:
+            break
+        end = _block_end(css, brace)
+        prelude = css[i:brace].strip()
+        body = css[brace + 1:end]
+        if prelude.lower().startswith(NESTED_AT_RULES):
+            body = parse_css_rules(body)
+        else:
+            body = body.strip()
+        rules.append(CssRule(prelude, body))
+        i = end + 1
+    return rules
+
+
+def serialize_css_rules(rules):
+    """list CssRule => CSS minify"""
+    parts = []
+    for rule in rules:
+        if rule.body is None:
+            parts.append(rule.prelude + ';')
+        elif isinstance(rule.body, list):
+            parts.append(f'{rule.prelude}{{{serialize_css_rules(rule.body)}}}')
+        else:
+            parts.append(f'{rule.prelude}{{{rule.body}}}')
+    return minify_css(''.join(parts))
+
+
+def dedupe_css_rules(rules):
+    """
+    Bỏ rule trùng hệt (cùng selector + khai báo, cùng ngữ cảnh) - giữ lần xuất hiện cuối
+    - Bản sau thắng cascade => bản trước thừa, bỏ không đổi kết quả
+    - @media / @supports: dedupe đệ quy trong khối; @import / @charset giữ nguyên thứ tự
+    """
+    rules = [CssRule(rule.prelude, dedupe_css_rules(rule.body)) if isinstance(rule.body, list) else rule
+             for rule in rules]
+    seen = set()
+    kept = []
+    for rule in reversed(rules):
+        if rule.body is not None:
+            key = serialize_css_rules([rule])
+            if key in seen:
+                continue
+            seen.add(key)
+        kept.append(rule)
+    kept.reverse()
+    return kept
+
+
+def split_selectors(prelude):
+    """'a, b:not(.x, .y)' => ['a', 'b:not(.x, .y)'] (không tách dấu phẩy trong ngoặc)"""
+    selectors, depth, current = [], 0, []
+    for char in prelude:
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        if char == ',' and depth == 0:
+            selectors.append(''.join(current).strip())
+            current = []
+        else:
+            current.append(char)
+    selectors.append(''.join(current).strip())
+    return [s for s in selectors if s]
+
+
+# Pseudo-class/element (kể cả :not(...)) + attribute selector không dùng để so khớp
+_PSEUDO_RE = re.compile(r'::?[a-zA-Z-]+(\([^()]*(\([^()]*\)[^()]*)*\))?')
+_ATTRIBUTE_RE = re.compile(r'\[[^\]]*\]')
+_SELECTOR_TOKEN_RE = re.compile(r'([.#]?)(-?[_a-zA-Z][\w-]*|\\.)')
+
+
+def selector_tokens(selector):
+    """Selector => (tags, classes, ids) cần có trong markup"""
+    selector = _ATTRIBUTE_RE.sub(' ', _PSEUDO_RE.sub(' ', selector))
+    tags, classes, ids = set(), set(), set()
+    for prefix, name in _SELECTOR_TOKEN_RE.findall(selector):
+        if prefix == '.':
+            classes.add(name)
+        elif prefix == '#':
+            ids.add(name)
+        else:
+            tags.add(name.lower())
+    return tags, classes, ids
+
+
+def filter_css_rules(rules, keep_selector):
+    """
+    Giữ selector thỏa keep_selector(selector); rule không còn selector => bỏ
+    - @media / @supports lọc đệ quy, rỗng => bỏ
+    - At-rule khác giữ nguyên
+    """
+    kept = []
+    for rule in rules:
+        if rule.body is None or (rule.prelude.startswith('@') and not isinstance(rule.body, list)):
+            kept.append(rule)
+        elif isinstance(rule.body, list):
+            children = filter_css_rules(rule.body, keep_selector)
+            if children:
+                kept.append(CssRule(rule.prelude, children))
+        else:
+            selectors = [s for s in split_selectors(rule.prelude) if keep_selector(s)]
+            if selectors:
+                kept.append(CssRule(','.join(selectors), rule.body))
+    return kept
+
+
+# ==================== TEMPLATE MARKUP ====================
+_JINJA_COMMENT_RE = re.compile(r'{#.*?#}', re.DOTALL)
+_JINJA_INCLUDE_RE = re.compile(r'{%-?\s*include\s+[\'"]([^\'"]+)[\'"][^%]*-?%}')
+_JINJA_TAG_RE = re.compile(r'{%.*?%}', re.DOTALL)
+_JINJA_EXPR_RE = re.compile(r'{{(.*?)}}', re.DOTALL)
+_JINJA_STRING_RE = re.compile(r'\'([^\']*)\'|"([^"]*)"')
+_CONTENT_BLOCK_RE = re.compile(r'{%-?\s*block\s+content\s*-?%}')
+_SCRIPT_STYLE_RE = re.compile(r'<(script|style)\b.*?</\1\s*>', re.DOTALL | re.IGNORECASE)
+_HTML_TAG_RE = re.compile(r'<([a-zA-Z][\w-]*)')
+_HTML_ATTR_RE = re.compile(r'\b(class|id)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+_NAME_RE = re.compile(r'-?[_a-zA-Z][\w-]*')
+
+
+def read_template(name, depth=0):
+    """Source template, {% include %} tên cố định được thay bằng source (đệ quy)"""
+    path = TEMPLATES_DIR / name
+    if not path.exists():
+        return ''
+    source = _JINJA_COMMENT_RE.sub('', path.read_text(encoding='utf-8'))
+    if depth >= 5:
+        return source
+    return _JINJA_INCLUDE_RE.sub(lambda m: read_template(m.group(1), depth + 1), source)
+
+
+def template_markup(source):
+    """Source Jinja => HTML thô: bỏ tag {% %}, biểu thức {{ }} chỉ giữ chuỗi literal (vd 'active')"""
+    source = _JINJA_TAG_RE.sub('', source)
+    source = _JINJA_EXPR_RE.sub(
+        lambda m: ' '.join(a or b for a, b in _JINJA_STRING_RE.findall(m.group(1))), source
+    )
+    return _SCRIPT_STYLE_RE.sub('', source)
+
+
+def markup_names(markup):
+    """HTML => (tags, classes, ids) xuất hiện"""
+    tags = {tag.lower() for tag in _HTML_TAG_RE.findall(markup)}
+    classes, ids = set(), set()
+    for attr, double, single in _HTML_ATTR_RE.findall(markup):
+        names = _NAME_RE.findall(double or single)
+        (classes if attr.lower() == 'class' else ids).update(names)
+    return tags, classes, ids
+
+
+def page_templates():
+    """Các template trang (extends CRITICAL_LAYOUT) trong CRITICAL_TEMPLATE_DIRS"""
+    names = []
+    for folder in CRITICAL_TEMPLATE_DIRS:
+        for path in sorted((TEMPLATES_DIR / folder).rglob('*.html')):
+            if CRITICAL_LAYOUT in path.read_text(encoding='utf-8').split('%}', 1)[0]:
+                names.append(path.relative_to(TEMPLATES_DIR).as_posix())
+    return names
+
+
+def above_the_fold_markup(name):
+    """Markup hiển thị trước khi cuộn: layout phía trên block content + đầu block content của trang"""
+    layout = read_template(CRITICAL_LAYOUT)
+    match = _CONTENT_BLOCK_RE.search(layout)
+    head = layout[:match.start()] if match else layout
+
+    page = read_template(name)
+    match = _CONTENT_BLOCK_RE.search(page)
+    content = template_markup(page[match.end():] if match else '')
+    return template_markup(head) + content[:ABOVE_THE_FOLD_CHARS]
+
+
+def critical_selector_filter(markup):
+    """keep_selector(selector) => True nếu mọi tag/class/id của selector có trong markup"""
+    tags, classes, ids = markup_names(markup)
+    tags |= {'html', 'body'}
+
+    def keep(selector):
+        selector_tags, selector_classes, selector_ids = selector_tokens(selector)
+        return selector_tags <= tags and selector_classes <= classes and selector_ids <= ids
+    return keep
+
+
+# ==================== TREE SHAKING ====================
+_SCRIPT_STRING_RE = re.compile(r'\'((?:\\.|[^\'\\\n])*)\'|"((?:\\.|[^"\\\n])*)"|`((?:\\.|[^`\\])*)`')
+_SCRIPT_BLOCK_RE = re.compile(r'<script\b[^>]*>(.*?)</script\s*>', re.DOTALL | re.IGNORECASE)
+
+
+def script_names(source):
+    """Mọi tên trong chuỗi literal của JS / Jinja ('show', `card ${x}`, '#id .class') - thừa còn hơn thiếu"""
+    names = set()
+    for groups in _SCRIPT_STRING_RE.findall(source):
+        for value in groups:
+            names.update(_NAME_RE.findall(value))
+    return names
+
+
+def collect_used_names():
+    """
+    (classes, ids) có thể xuất hiện trên trang
+    - Template: class/id trong markup + chuỗi trong {% %} / {{ }} / <script>
+    - JS: chuỗi trong main.js + js/modules/*.js
+    """
+    classes, ids, strings = set(), set(), set()
+    for path in sorted(TEMPLATES_DIR.rglob('*.html')):
+        source = _JINJA_COMMENT_RE.sub('', path.read_text(encoding='utf-8'))
+        _, template_classes, template_ids = markup_names(template_markup(source))
+        classes |= template_classes
+        ids |= template_ids
+        for block in _JINJA_TAG_RE.findall(source) + _JINJA_EXPR_RE.findall(source) \
+                + _SCRIPT_BLOCK_RE.findall(source):
+            strings |= script_names(block)
+
+    for path in sorted(JS_SOURCE_DIR.rglob('*.js')):
+        if '.min.' not in path.name:
+            strings |= script_names(path.read_text(encoding='utf-8'))
+    return classes | strings, ids | strings
+
+
+def used_selector_filter(classes, ids):
+    """keep_selector(selector) => True nếu mọi class/id của selector có thể xuất hiện (tag không xét)"""
+    # class="badge bg-{{ color }}" => 'bg-' : giữ mọi class bắt đầu bằng 'bg-'
+    prefixes = tuple(name for name in classes if name.endswith('-'))
+
+    def class_used(name):
+        return (name in classes or name in CSS_SAFELIST or name.startswith(prefixes)
+                or any(pattern.match(name) for pattern in CSS_SAFELIST_PATTERNS))
+
+    def keep(selector):
+        _, selector_classes, selector_ids = selector_tokens(selector)
+        return all(class_used(name) for name in selector_classes) and \
+            all(name in ids or name in CSS_SAFELIST for name in selector_ids)
+    return keep
+
+
+_KEYFRAMES_RE = re.compile(r'^@(-webkit-|-moz-)?keyframes\s+(.+)$')
+_ANIMATION_RE = re.compile(r'animation(?:-name)?\s*:([^;}]*)')
+
+
+def _animation_names(rules):
+    names = set()
+    for rule in rules:
+        if isinstance(rule.body, list):
+            names |= _animation_names(rule.body)
+        elif rule.body and not _KEYFRAMES_RE.match(rule.prelude):
+            for value in _ANIMATION_RE.findall(rule.body):
+                names.update(_NAME_RE.findall(value))
+    return names
+
+
+def _drop_keyframes(rules, used_animations):
+    kept = []
+    for rule in rules:
+        match = _KEYFRAMES_RE.match(rule.prelude)
+        if match and match.group(2).strip().strip('"\'') not in used_animations:
+            continue
+        if isinstance(rule.body, list):
+            rule = CssRule(rule.prelude, _drop_keyframes(rule.body, used_animations))
+        kept.append(rule)
+    return kept
+
+
+def tree_shake_modules(modules):
+    """
+    modules: {tên module: CSS} => {tên module: CSS đã bỏ rule không dùng} + in báo cáo từng module
+    - Rule: bỏ selector có class/id không xuất hiện; hết selector => bỏ rule
+    - @keyframes không còn được animation nào dùng => bỏ
+    """
+    print_header("🌳 TREE SHAKING - BỎ SELECTOR KHÔNG DÙNG")
+
+    keep = used_selector_filter(*collect_used_names())
+    parsed = {
+        name: filter_css_rules(parse_css_rules(re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL)), keep)
+        for name, css in modules.items()
+    }
+    used_animations = set()
+    for rules in parsed.values():
+        used_animations |= _animation_names(rules)
+
+    shaken = {}
+    total_before = total_after = 0
+    for name, css in modules.items():
+        before = len(minify_css(re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL)).encode('utf-8'))
+        shaken[name] = serialize_css_rules(_drop_keyframes(parsed[name], used_animations))
+        after = len(shaken[name].encode('utf-8'))
+        total_before += before
+        total_after += after
+        saved = before - after
+        percent = saved / before * 100 if before else 0
+        print(f"  ✓ {name:35s} | {before / 1024:6.1f} KB => {after / 1024:6.1f} KB | "
+              f"-{saved / 1024:5.1f} KB ({percent:4.1f}%)")
+
+    saved = total_before - total_after
+    print(f"\n{'─' * 70}")
+    print(f"  📊 Tree shaking: {total_before / 1024:.1f} KB => {total_after / 1024:.1f} KB "
+          f"(tiết kiệm {saved / 1024:.1f} KB, {saved / total_before * 100 if total_before else 0:.1f}%)")
+    print(f"{'─' * 70}")
+    return shaken
+
+
+def critical_path(name):
+    """'public/index.html' => css/critical/public/index.css"""
+    return CRITICAL_DIR / Path(name).with_suffix('.css')
+
+
+def build_critical_css(css):
+    """
+    Ghi critical CSS cho từng template trang từ CSS đã build
+    - Chỉ rule có selector khớp markup above-the-fold (@keyframes / @font-face bỏ, đến cùng file đầy đủ)
+    - Phần còn lại: main.min.css tải bất đồng bộ (layouts/base.html)
+    """
+    print_header("⚡ CRITICAL CSS THEO TEMPLATE")
+
+    rules = parse_css_rules(re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL))
+    rules = [rule for rule in rules if not (rule.prelude.startswith('@') and not isinstance(rule.body, list))]
+    written = set()
+
+    for name in page_templates():
+        keep = critical_selector_filter(above_the_fold_markup(name))
+        critical = serialize_css_rules(filter_css_rules(rules, keep))
+        if '</' in critical:
+            print_warning(f"{name:45s} | Bỏ qua: CSS chứa '</' (không inline được)")
+            continue
+
+        path = critical_path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if not path.exists() or path.read_text(encoding='utf-8') != critical:
+            path.write_text(critical, encoding='utf-8')
+        written.add(path)
+        print(f"  ✓ {name:45s} | {len(critical) / 1024:6.1f} KB")
+
+    # Template đã xóa / đổi tên => xóa critical cũ
+    if CRITICAL_DIR.exists():
+        for path in CRITICAL_DIR.rglob('*.css'):
+            if path not in written:
+                path.unlink()
+
+    print_success(f"Critical CSS: {len(written)} template => {CRITICAL_DIR}")
+    return True
+
+
 def split_css(input_file):
     """Tách file CSS lớn thành các module nhỏ"""
     print_header("🎨 TÁCH FILE CSS THÀNH CÁC MODULE")
@@ -333,8 +751,9 @@ def split_css(input_file):
     success_count = 0
     warning_count = 0
 
+    position = 0
     for filename, config in CSS_MODULES.items():
-        section = extract_css_section(content, config['start'], config['end'])
+        section, position = extract_css_section(content, config['start'], config['end'], position)
 
         if section:
             output_path = MODULES_DIR / filename
@@ -383,7 +802,7 @@ def build_css():
         print_info("Chạy: python build_css.py split")
         return False
 
-    combined_css = []
+    module_css = {}
     total_size = 0
     module_count = 0
     missing_files = []
@@ -397,7 +816,7 @@ def build_css():
         if file_path.exists():
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
-                combined_css.append(content)
+                module_css[filename] = content
                 size = len(content) / 1024
                 total_size += size
                 module_count += 1
@@ -406,6 +825,11 @@ def build_css():
             missing_files.append(filename)
             print_warning(f"Không tìm thấy: {filename}")
 
+    # Bỏ rule có class/id không dùng ở template / JS (báo cáo theo module)
+    if CSS_TREE_SHAKING:
+        module_css = tree_shake_modules(module_css)
+    combined_css = list(module_css.values())
+
     # Tạo header cho file build
     build_header = f"""/*! 
  * ============================================================================
@@ -421,11 +845,19 @@ def build_css():
 
 """
 
-    # Gộp và minify
-    full_css = '\n\n'.join(combined_css)
-    minified_css = minify_css(full_css)
+    # Gộp, bỏ rule trùng giữa các module rồi minify
+    full_css = re.sub(r'/\*.*?\*/', '', '\n\n'.join(combined_css), flags=re.DOTALL)
+    minified_css = serialize_css_rules(dedupe_css_rules(parse_css_rules(full_css)))
     final_css = build_header + minified_css
 
+    # Build lớn hơn style.css gốc => module bị trùng / tách sai marker, không ghi đè output
+    source_size = INPUT_FILE.stat().st_size if INPUT_FILE.exists() else None
+    output_size = len(minified_css.encode('utf-8'))
+    if source_size is not None and output_size > source_size:
+        print_error(f"Build ({output_size / 1024:.1f} KB) lớn hơn {INPUT_FILE.name} "
+                    f"({source_size / 1024:.1f} KB) - kiểm tra module trùng (python build_css.py split)")
+        return False
+
     # Ghi file output
     with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
         f.write(final_css)
@@ -450,6 +882,13 @@ def build_css():
         print_warning(f"Một số module bị thiếu: {', '.join(missing_files)}")
 
     print_success(f"Build thành công: {OUTPUT_FILE}")
+
+    # Bản fingerprint (tên có hash nội dung) + manifest cho asset_url()
+    hashed_file = publish_asset(OUTPUT_FILE)
+    print_success(f"Fingerprint: {hashed_file.name} (manifest: {MANIFEST_FILE.name})")
+
+    # Critical CSS theo template (inline trong <head>, main.min.css tải sau)
+    build_critical_css(minified_css)
     return True
 
 
@@ -465,7 +904,7 @@ def watch_and_build():
 
     class CSSChangeHandler(FileSystemEventHandler):
         def on_modified(self, event):
-            if event.src_path.endswith('.css') and 'main.min.css' not in event.src_path:
+            if event.src_path.endswith('.css') and 'main.min' not in event.src_path:
                 print(f"\n🔄 Phát hiện thay đổi: {Path(event.src_path).name}")
                 build_css()
 
@@ -499,7 +938,8 @@ def show_help():
     commands = [
         ("python build_css.py", "Tách + Build (mặc định)", "Lần đầu sử dụng"),
         ("python build_css.py split", "Chỉ tách file CSS", "Tách style.css thành modules"),
-        ("python build_css.py build", "Chỉ build CSS", "Gộp modules thành main.min.css"),
+        ("python build_css.py build", "Chỉ build CSS", "Gộp modules thành main.min.css (bỏ selector không dùng, xem CSS_SAFELIST)"),
+        ("python build_css.py critical", "Chỉ build critical CSS", "Tính lại css/critical/ từ main.min.css hiện tại"),
         ("python build_css.py watch", "Watch mode", "Tự động build khi sửa file"),
         ("python build_css.py help", "Hiển thị trợ giúp", "Xem hướng dẫn này"),
     ]
@@ -518,15 +958,17 @@ def show_help():
     print("          │   ├── 02-reset.css")
     print("          │   └── ...")
     print("          ├── style.css             ← File CSS gốc")
-    print("          └── main.min.css          ← File build (production)\n")
+    print("          ├── critical/             ← Critical CSS theo template (inline trong <head>)")
+    print("          ├── main.min.css          ← File build (production)")
+    print("          └── main.min.<hash>.css   ← Bản fingerprint (cache immutable, xem assets-manifest.json)\n")
 
     print("⚡ Workflow khuyến nghị:\n")
     print("  1. Lần đầu:    python build_css.py")
     print("  2. Phát triển: python build_css.py watch")
-    print("  3. Production: Deploy main.min.css\n")
+    print("  3. Production: Deploy main.min.css + main.min.<hash>.css + assets-manifest.json\n")
 
     print("🔗 Update template:\n")
-    print('  <link rel="stylesheet" href="{{ url_for(\'static\', filename=\'css/main.min.css\') }}">\n')
+    print('  <link rel="stylesheet" href="{{ asset_url(\'css/main.min.css\') }}">\n')
 
 
 def main():
@@ -540,7 +982,14 @@ def main():
             split_css(INPUT_FILE)
 
         elif command == 'build':
-            build_css()
+            if not build_css():
+                sys.exit(1)
+
+        elif command == 'critical':
+            if OUTPUT_FILE.exists():
+                build_critical_css(OUTPUT_FILE.read_text(encoding='utf-8'))
+            else:
+                print_error(f"Chưa có {OUTPUT_FILE.name}, chạy: python build_css.py build")
 
         elif command == 'watch':
             watch_and_build()
@@ -558,7 +1007,8 @@ def main():
         print_info("Chế độ: Tự động (Split + Build)\n")
 
         if split_css(INPUT_FILE):
-            build_css()
+            if not build_css():
+                sys.exit(1)
 
             print("\n" + "=" * 70)
             print("  🎉 HOÀN TẤT!")
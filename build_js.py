@@ -6,11 +6,14 @@ Usage: python build_js.py [command]
 pip install watchdog
 """
 
+import json
 import os
 import re
 from pathlib import Path
 from datetime import datetime
 
+from asset_build import publish_asset, load_manifest, save_manifest, MANIFEST_FILE
+
 # ==================== CẤU HÌNH DỰ ÁN ====================
 BASE_DIR = Path(__file__).parent.resolve()
 STATIC_DIR = BASE_DIR / 'app' / 'static'
@@ -19,12 +22,23 @@ MODULES_DIR = JS_DIR / 'modules'
 INPUT_FILE = JS_DIR / 'main.js'
 OUTPUT_FILE = JS_DIR / 'main.min.js'
 
+# ==================== BUNDLE THEO TRANG ====================
+# 'used_on' của mỗi module:
+#   JS_CORE                          => main.min.js (mọi trang, layouts/base.html)
+#   ('public/index.html', ...)       => chunk riêng, chỉ tải ở các template đó
+# Module cùng tập template gộp chung 1 chunk: js/chunks/<tên>.min.js
+# js/chunks.json: {template: [chunk, ...]} - app/assets.py page_scripts() đọc khi render
+JS_CORE = '*'
+CHUNKS_DIR = JS_DIR / 'chunks'
+CHUNK_MAP_FILE = JS_DIR / 'chunks.json'
+
 # ==================== CẤU TRÚC MODULE JAVASCRIPT ====================
 JS_MODULES = {
     '01-floating-buttons.js': {
         'start': '// ==================== FLOATING BUTTONS ====================',
         'end': '// ==================== ANIMATE ON SCROLL ====================',
         'description': 'NÚT HÀNH ĐỘNG NỔI',
+        'used_on': JS_CORE,
         'details': '''
         📍 Vị trí: Góc phải màn hình
         🎯 Chức năng: Hiển thị các nút floating (Phone, Zalo, Messenger)
@@ -38,6 +52,7 @@ JS_MODULES = {
         'start': '// ==================== ANIMATE ON SCROLL ====================',
         'end': '// ==================== AUTO DISMISS ALERTS ====================',
         'description': 'HIỆU ỨNG CUỘN TRANG',
+        'used_on': JS_CORE,
         'details': '''
         📍 Vị trí: Áp dụng cho tất cả card
         🎯 Chức năng: Tự động thêm animation khi card xuất hiện trong viewport
@@ -54,6 +69,7 @@ JS_MODULES = {
         'start': '// ==================== AUTO DISMISS ALERTS ====================',
         'end': '// ==================== SEARCH FORM VALIDATION ====================',
         'description': 'TỰ ĐỘNG ĐÓNG THÔNG BÁO',
+        'used_on': JS_CORE,
         'details': '''
         📍 Vị trí: Mọi trang có flash messages
         🎯 Chức năng: Tự động đóng thông báo Bootstrap sau 3 giây
@@ -70,6 +86,7 @@ JS_MODULES = {
         'start': '// ==================== SEARCH FORM VALIDATION ====================',
         'end': '// ==================== IMAGE LAZY LOADING ====================',
         'description': 'KIỂM TRA FORM TÌM KIẾM',
+        'used_on': JS_CORE,
         'details': '''
         📍 Vị trí: Thanh tìm kiếm navbar và trang search
         🎯 Chức năng: Ngăn submit form tìm kiếm khi input rỗng
@@ -87,6 +104,7 @@ JS_MODULES = {
         'start': '// ==================== IMAGE LAZY LOADING ====================',
         'end': '// ==================== SMOOTH SCROLL - FIXED ====================',
         'description': 'TẢI ẢNH CHẬM (LAZY LOAD)',
+        'used_on': JS_CORE,
         'details': '''
         📍 Vị trí: Tất cả ảnh có attribute loading="lazy"
         🎯 Chức năng: Chỉ tải ảnh khi sắp vào viewport, tiết kiệm băng thông
@@ -104,6 +122,7 @@ JS_MODULES = {
         'start': '// ==================== SMOOTH SCROLL - FIXED ====================',
         'end': '// ==================== SCROLL TO TOP WITH PROGRESS ====================',
         'description': 'CUỘN MỀM MẠI ANCHOR',
+        'used_on': JS_CORE,
         'details': '''
         📍 Vị trí: Tất cả link có href="#..."
         🎯 Chức năng: Cuộn mượt mà đến section thay vì nhảy đột ngột
@@ -124,6 +143,7 @@ JS_MODULES = {
         'start': '// ==================== SCROLL TO TOP WITH PROGRESS ====================',
         'end': '// ==================== BANNER LAZY LOAD + RESPONSIVE (INTEGRATED) ====================',
         'description': 'NÚT LÊN ĐẦU TRANG + TIẾN TRÌNH',
+        'used_on': JS_CORE,
         'details': '''
         📍 Vị trí: Góc phải dưới màn hình
         🎯 Chức năng: 
@@ -145,6 +165,7 @@ JS_MODULES = {
         'start': '// ==================== BANNER LAZY LOAD + RESPONSIVE (INTEGRATED) ====================',
         'end': '// ==================== RESPONSIVE IMAGE SOURCE HANDLER ====================',
         'description': 'BANNER CAROUSEL TRANG CHỦ',
+        'used_on': ('public/index.html',),
         'details': '''
         📍 Vị trí: Trang chủ (index.html)
         🎯 Chức năng: Quản lý carousel banner với đầy đủ tính năng
@@ -168,6 +189,7 @@ JS_MODULES = {
         'start': '// ==================== RESPONSIVE IMAGE SOURCE HANDLER ====================',
         'end': '// ==================== Page-loader ====================',
         'description': 'XỬ LÝ ẢNH RESPONSIVE',
+        'used_on': ('public/index.html',),
         'details': '''
         📍 Vị trí: Banner carousel (dùng <picture> tag)
         🎯 Chức năng: Force browser đánh giá lại <source> khi resize
@@ -185,6 +207,7 @@ JS_MODULES = {
         'start': '// ==================== Page-loader ====================',
         'end': '// ==================== FEATURED PROJECTS CAROUSEL WITH MOUSE DRAG ====================',
         'description': 'LOADING TOÀN TRANG',
+        'used_on': JS_CORE,
         'details': '''
         📍 Vị trí: Tất cả các trang
         🎯 Chức năng: Hiển thị spinner khi trang đang load, ẩn khi xong
@@ -202,6 +225,7 @@ JS_MODULES = {
         'start': '// ==================== FEATURED PROJECTS CAROUSEL WITH MOUSE DRAG ====================',
         'end': '// ==================== Chatbot Widget ====================',
         'description': 'CAROUSEL DỰ ÁN NỔI BẬT',
+        'used_on': ('public/index.html',),
         'details': '''
         📍 Vị trí: Trang chủ section "Dự án nổi bật"
         🎯 Chức năng: Carousel tùy chỉnh với kéo chuột/chạm
@@ -227,6 +251,7 @@ JS_MODULES = {
         'start': '// ==================== Chatbot Widget ====================',
         'end': '// ==================== ENHANCED EFFECTS FOR INDEX PAGE ==================== /',
         'description': 'CHATBOT HỖ TRỢ KHÁCH HÀNG',
+        'used_on': ('components/chatbot.html',),
         'details': '''
         📍 Vị trí: Góc phải dưới màn hình (trên scroll-to-top)
         🎯 Chức năng: Chatbot AI hỗ trợ khách hàng 24/7
@@ -256,6 +281,7 @@ JS_MODULES = {
         'start': '// ==================== ENHANCED EFFECTS FOR INDEX PAGE ==================== /',
         'end': '/*** ==================== MOBILE BLOG CAROUSEL  ============================*/',
         'description': 'HIỆU ỨNG NÂNG CAO TRANG CHỦ',
+        'used_on': ('public/index.html',),
         'details': '''
     📍 Vị trí: Chỉ áp dụng trên trang chủ (index.html)
     🎯 Chức năng: Bộ hiệu ứng cao cấp để tăng trải nghiệm người dùng
@@ -309,6 +335,7 @@ JS_MODULES = {
         'start': '/*** ==================== MOBILE BLOG CAROUSEL  ============================*/',
         'end': '/* ==================== BANNER EFFECTS WITH DRAG/SWIPE ==================== */',
         'description': 'CAROUSEL BLOG MOBILE/TABLET',
+        'used_on': ('public/index.html',),
         'details': '''
     📍 Vị trí: Trang chủ section "Tin tức nổi bật" (chỉ mobile/tablet)
     🎯 Chức năng: Carousel tùy chỉnh cho blog cards ở màn hình nhỏ
@@ -363,6 +390,7 @@ JS_MODULES = {
         'start': '/* ==================== BANNER EFFECTS WITH DRAG/SWIPE ==================== */',
         'end': '/* ==================== Newsletter ==================== */',
         'description': 'BANNER EFFECTS (ANIMATION + DRAG/SWIPE)',
+        'used_on': ('public/index.html',),
         'details': '''
     📍 Vị trí: Trang chủ (section #bannerCarousel)
     🎯 Chức năng: Hiệu ứng chuyển cảnh và animation chữ trên banner chính
@@ -427,6 +455,7 @@ JS_MODULES = {
         'start': '/* ==================== Newsletter ==================== */',
         'end': '/* ==================== Testimonials / Customer Reviews ==================== */',
         'description': 'Đăng kí nhận khuyến mãi',
+        'used_on': ('public/index.html',),
         'details': '''
             Đăng kí nhận khuyến mãi
     '''
@@ -435,6 +464,7 @@ JS_MODULES = {
         'start': '/* ==================== Testimonials / Customer Reviews ==================== */',
         'end': '/* ==================== Trust Badges / Certifications ==================== */',
         'description': 'Khách hàng đánh giá',
+        'used_on': ('public/index.html',),
         'details': '''
             Khách hàng đánh giá
     '''
@@ -443,6 +473,7 @@ JS_MODULES = {
         'start': '/* ==================== Trust Badges / Certifications ==================== */',
         'end': '/* ==================== TIMELINE ==================== */',
         'description': '4 ô tạo niềm tin',
+        'used_on': ('public/index.html',),
         'details': '''
         bốn ô tạo niềm tin , hiệu ứng fade-in
     '''
@@ -451,6 +482,7 @@ JS_MODULES = {
         'start': '/* ==================== TIMELINE ==================== */',
         'end': '/* ==================== NavLink Hold Drop ==================== */',
         'description': 'Lịch sử công ty',
+        'used_on': ('public/index.html',),
         'details': '''
         Lịch sử công ty
     '''
@@ -459,6 +491,7 @@ JS_MODULES = {
         'start': '/* ==================== NavLink Hold Drop ==================== */',
         'end': None,
         'description': 'Hold Drop Nav',
+        'used_on': JS_CORE,
         'details': '''
         Chức năng: Giữ chuột vào nav-link sẽ hiện dropdown
     '''
@@ -595,8 +628,72 @@ def split_js(input_file):
     return True
 
 
+def _bundle_header(title, module_count):
+    return f"""/*! 
+ * ============================================================================
+ * BRICON - {title}
+ * ============================================================================
+ * Generated: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}
+ * Modules: {module_count} files
+ * Description: Auto-generated optimized JavaScript
+ * DO NOT EDIT THIS FILE DIRECTLY - Edit individual modules instead
+ * ============================================================================
+ */
+
+"use strict";
+
+"""
+
+
+def chunk_name(templates):
+    """('public/index.html',) => 'public-index'"""
+    return '+'.join(Path(t).with_suffix('').as_posix().replace('/', '-') for t in sorted(templates))
+
+
+def build_chunks(chunk_modules):
+    """
+    Ghi js/chunks/<tên>.min.js cho từng nhóm module (cùng tập template) + js/chunks.json
+    - chunk_modules: {tuple template: [(tên module, nội dung), ...]} theo thứ tự module
+    Returns: {template: [đường dẫn chunk trong static/]}
+    """
+    CHUNKS_DIR.mkdir(parents=True, exist_ok=True)
+    chunk_map = {}
+    written = set()
+
+    for templates, modules in chunk_modules.items():
+        name = chunk_name(templates)
+        path = CHUNKS_DIR / f'{name}.min.js'
+        final_js = _bundle_header(f'Page Chunk: {name}', len(modules)) + \
+            minify_js('\n\n'.join(content for _, content in modules))
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(final_js)
+        publish_asset(path)
+        written.add(path.name)
+
+        logical = path.relative_to(STATIC_DIR).as_posix()
+        for template in templates:
+            chunk_map.setdefault(template, []).append(logical)
+        print(f"  ✓ {path.name:32s} | {len(final_js) / 1024:7.1f} KB | "
+              f"{', '.join(module for module, _ in modules)}")
+
+    # Chunk không còn dùng (đổi used_on) => xóa file + bản hash/nén + entry manifest
+    stale = [p for p in CHUNKS_DIR.iterdir() if p.name.split('.min.', 1)[0] + '.min.js' not in written]
+    for path in stale:
+        path.unlink()
+    manifest = load_manifest()
+    for logical in list(manifest):
+        if logical.startswith('js/chunks/') and Path(logical).name not in written:
+            del manifest[logical]
+    save_manifest(manifest)
+
+    with open(CHUNK_MAP_FILE, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(chunk_map.items())), f, indent=2)
+        f.write('\n')
+    return chunk_map
+
+
 def build_js():
-    """Gộp tất cả module thành main.min.js"""
+    """Gộp module dùng chung thành main.min.js + chunk riêng cho module chỉ dùng ở vài trang"""
     print_header("🔨 BUILD MAIN.MIN.JS")
 
     if not MODULES_DIR.exists():
@@ -605,6 +702,7 @@ def build_js():
         return False
 
     combined_js = []
+    chunk_modules = {}
     total_size = 0
     module_count = 0
 
@@ -617,34 +715,24 @@ def build_js():
         if file_path.exists():
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
+            used_on = JS_MODULES[filename].get('used_on', JS_CORE)
+            if used_on == JS_CORE:
                 combined_js.append(content)
-                size = len(content) / 1024
-                total_size += size
                 module_count += 1
-            print(f"  ✓ {filename:32s} | {size:7.1f} KB")
+                target = OUTPUT_FILE.name
+            else:
+                chunk_modules.setdefault(tuple(sorted(used_on)), []).append((filename, content))
+                target = f"chunks/{chunk_name(used_on)}.min.js"
+            size = len(content) / 1024
+            total_size += size
+            print(f"  ✓ {filename:32s} | {size:7.1f} KB | => {target}")
         else:
             print_warning(f"Không tìm thấy: {filename}")
 
-    # Tạo header cho file build
-    build_header = f"""/*! 
- * ============================================================================
- * BRICON - Main JavaScript Build
- * ============================================================================
- * Generated: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}
- * Modules: {module_count} files
- * Description: Auto-generated optimized JavaScript
- * DO NOT EDIT THIS FILE DIRECTLY - Edit individual modules instead
- * ============================================================================
- */
-
-"use strict";
-
-"""
-
     # Gộp và minify
     full_js = '\n\n'.join(combined_js)
     minified_js = minify_js(full_js)
-    final_js = build_header + minified_js
+    final_js = _bundle_header('Main JavaScript Build', module_count) + minified_js
 
     # Ghi file output
     with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
@@ -653,17 +741,27 @@ def build_js():
     # Thống kê
     original_kb = total_size
     minified_kb = len(final_js) / 1024
-    saved_kb = original_kb - minified_kb
-    saved_percent = (saved_kb / original_kb) * 100 if original_kb > 0 else 0
 
     print(f"\n{'─' * 70}")
     print(f"  📊 Thống kê Build:")
-    print(f"     • Kích thước gốc:    {original_kb:8.1f} KB")
-    print(f"     • Kích thước minify: {minified_kb:8.1f} KB")
-    print(f"     • Tiết kiệm:         {saved_kb:8.1f} KB ({saved_percent:.1f}%)")
+    print(f"     • Kích thước gốc (mọi module): {original_kb:8.1f} KB")
+    print(f"     • main.min.js (dùng chung):    {minified_kb:8.1f} KB")
     print(f"{'─' * 70}")
 
     print_success(f"Build thành công: {OUTPUT_FILE}")
+
+    # Bản fingerprint (tên có hash nội dung) + manifest cho asset_url()
+    hashed_file = publish_asset(OUTPUT_FILE)
+    print_success(f"Fingerprint: {hashed_file.name} (manifest: {MANIFEST_FILE.name})")
+
+    # Chunk theo trang (used_on) + chunks.json cho page_scripts()
+    print_header("🧩 CHUNK THEO TRANG")
+    chunk_map = build_chunks(chunk_modules)
+    print(f"\n  📄 main.min.js + chunk theo template:")
+    for template, chunks in sorted(chunk_map.items()):
+        size = sum((STATIC_DIR / chunk).stat().st_size for chunk in chunks) / 1024
+        print(f"     • {template:30s} | +{size:6.1f} KB | {', '.join(Path(c).name for c in chunks)}")
+    print_success(f"Chunk map: {CHUNK_MAP_FILE.relative_to(STATIC_DIR)}")
     return True
 
 
@@ -715,6 +813,8 @@ def list_modules():
         print(f"📦 MODULE #{i:02d}: {filename}")
         print(f"{'=' * 70}")
         print(f"📌 Tên: {config['description']}")
+        used_on = config.get('used_on', JS_CORE)
+        print(f"🧩 Bundle: {'main.min.js (mọi trang)' if used_on == JS_CORE else ', '.join(used_on)}")
         print(config['details'])
 
     print(f"\n{'=' * 70}")
@@ -751,15 +851,19 @@ def show_help():
     print("          │   ├── 02-animate-scroll.js")
     print("          │   └── ...")
     print("          ├── main.js                ← File JS gốc")
-    print("          └── main.min.js            ← File build (dùng trong production)\n")
+    print("          ├── chunks/                ← Chunk theo trang (module có used_on riêng)")
+    print("          ├── chunks.json            ← {template: [chunk]} cho page_scripts()")
+    print("          ├── main.min.js            ← Module dùng chung (mọi trang)")
+    print("          └── main.min.<hash>.js     ← Bản fingerprint (cache immutable, xem assets-manifest.json)\n")
 
     print("⚡ Workflow khuyến nghị:\n")
     print("  1. Lần đầu: python build_js.py")
     print("  2. Phát triển: python build_js.py watch")
-    print("  3. Production: Chỉ cần deploy main.min.js\n")
+    print("  3. Production: Deploy main.min.js + chunks/ + chunks.json (+ bản <hash>) + assets-manifest.json\n")
 
     print("🔗 Update template:\n")
-    print('  <script src="{{ url_for(\'static\', filename=\'js/main.min.js\') }}" defer></script>\n')
+    print('  <script src="{{ asset_url(\'js/main.min.js\') }}"></script>')
+    print('  {{ page_scripts() }}   ← chunk của template trang (module mới: khai báo used_on)\n')
 
 
 def main():
@@ -37,6 +37,12 @@ def on_starting(server):
     print(f"   Workers: {workers} | Threads: {threads} | Timeout: {timeout}s | Preload: {preload_app}")
 
 def post_fork(server, worker):
+    # Tính sẵn related content trong worker (thread nền, app/related.py) => request đầu không phải build
+    try:
+        from app.related import warm_related_index
+        warm_related_index(server.app.wsgi())
+    except Exception as e:
+        print(f"❌ Worker {worker.pid} warm related failed: {e}")
     print(f"✅ Worker {worker.pid} ready")
 
 def worker_int(worker):
@@ -46,4 +52,12 @@ def worker_abort(worker):
     print(f"❌ Worker {worker.pid} aborted (timeout/crash)")
 
 def worker_exit(server, worker):
+    # Ghi nốt lượt xem còn trong buffer (app/models/counters.py)
+    try:
+        from app.models.counters import flush_view_counts
+        flushed = flush_view_counts(worker.wsgi)
+        if flushed:
+            print(f"💾 Worker {worker.pid} flushed view counts ({flushed} rows)")
+    except Exception as e:
+        print(f"❌ Worker {worker.pid} flush view counts failed: {e}")
     print(f"👋 Worker {worker.pid} exited")
\ No newline at end of file
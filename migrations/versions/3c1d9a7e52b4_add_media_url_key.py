@@ -0,0 +1,40 @@
+"""add media.url_key (canonical image URL hash) + unique index
+
+Revision ID: 3c1d9a7e52b4
+Revises:
+Create Date: 2026-10-18 15:30:00.000000
+
+- Bảng media tạo bằng db.create_all() mới đã có sẵn cột => bỏ qua, chỉ tạo index nếu thiếu
+- Sau upgrade: flask backfill-media-keys để điền url_key cho record cũ
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c1d9a7e52b4'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('media'):
+        return
+
+    columns = {column['name'] for column in inspector.get_columns('media')}
+    if 'url_key' not in columns:
+        with op.batch_alter_table('media') as batch_op:
+            batch_op.add_column(sa.Column('url_key', sa.String(length=40), nullable=True))
+
+    indexes = {index['name'] for index in sa.inspect(op.get_bind()).get_indexes('media')}
+    if 'ix_media_url_key' not in indexes:
+        op.create_index('ix_media_url_key', 'media', ['url_key'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('media') as batch_op:
+        batch_op.drop_index('ix_media_url_key')
+        batch_op.drop_column('url_key')
@@ -0,0 +1,75 @@
+"""
+Fixture cho test hành vi (pytest) - app + SQLite tạm, không cần server chạy
+
+Chạy: python -m pytest test
+(test_main_routes.py / test_admin_routes.py là script gọi server thật, chạy riêng bằng python)
+"""
+import pytest
+
+from app.config import Config
+
+collect_ignore = ['test_main_routes.py', 'test_admin_routes.py']
+
+
+class TestConfig(Config):
+    TESTING = True
+    WTF_CSRF_ENABLED = False
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    SECRET_KEY = 'test-secret-key'
+    # Không để thread flush lượt xem chạy trong lúc test
+    VIEW_COUNT_FLUSH_INTERVAL = 3600
+    # Test tự quyết khi nào có search index
+    SEARCH_INDEX_AUTO_BUILD = False
+
+
+@pytest.fixture(scope='session')
+def app(tmp_path_factory):
+    from app import create_app
+
+    db_path = tmp_path_factory.mktemp('db') / 'test.db'
+    TestConfig.SQLALCHEMY_DATABASE_URI = f'sqlite:///{db_path}'
+    app = create_app(TestConfig)
+    app.config['SESSION_COOKIE_SECURE'] = False
+    return app
+
+
+def _reset_process_state():
+    """Bỏ cache trong RAM của process (snapshot settings, index gợi ý, related, body nén, lượt xem...)"""
+    import app.search as search
+    from app import cache
+    from app.models import counters
+    from app.compression import clear_compression_cache
+    from app.models.settings import clear_settings_cache
+    from app.related import clear_related_index
+
+    search._BACKEND = None
+    search.clear_suggest_index()
+    clear_related_index()
+    clear_settings_cache()
+    cache.clear()
+    clear_compression_cache()
+    with counters._PENDING_LOCK:
+        counters._PENDING.clear()
+
+
+@pytest.fixture(autouse=True)
+def db(app):
+    """Mỗi test: bảng trống + cache process sạch, chạy trong app context"""
+    from app import db
+
+    from app.search import TABLE_NAME
+
+    with app.app_context():
+        db.drop_all()
+        # Bảng search index không nằm trong metadata => test nào build index thì xóa ở đây
+        db.session.execute(db.text(f'DROP TABLE IF EXISTS {TABLE_NAME}'))
+        db.session.commit()
+        db.create_all()
+        _reset_process_state()
+        yield db
+        db.session.remove()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
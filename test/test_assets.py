@@ -0,0 +1,294 @@
+"""
+Test build + phục vụ static asset: fingerprint, bản nén sẵn, build CSS (tách module, tree shaking), critical CSS, chunk JS theo trang
+
+Chạy: python -m pytest test
+"""
+import gzip
+
+import pytest
+from markupsafe import Markup
+
+import asset_build
+import build_css
+import build_js
+
+_BANNER = """/*!
+ * Main CSS Build
+ * Generated: {time}
+ */
+"""
+
+
+@pytest.fixture
+def static_dir(app, tmp_path, monkeypatch):
+    """static/ tạm cho asset_build + app (không đụng app/static thật)"""
+    monkeypatch.setattr(asset_build, 'STATIC_DIR', tmp_path)
+    monkeypatch.setattr(asset_build, 'MANIFEST_FILE', tmp_path / 'assets-manifest.json')
+    monkeypatch.setattr(asset_build, 'CHUNK_MAP_FILE', tmp_path / 'js' / 'chunks.json')
+    (tmp_path / 'css').mkdir()
+    (tmp_path / 'js').mkdir()
+
+    static_folder = app.static_folder
+    extensions = {key: app.extensions.get(key) for key in ('asset_manifest', 'asset_hashed_files',
+                                                           'asset_precompressed', 'asset_chunks')}
+    app.static_folder = str(tmp_path)
+    yield tmp_path
+    app.static_folder = static_folder
+    app.extensions.update(extensions)
+
+
+def _reload_assets(app):
+    from app.assets import load_chunk_map, load_manifest, scan_precompressed
+
+    manifest = load_manifest(app)
+    app.extensions['asset_manifest'] = manifest
+    app.extensions['asset_hashed_files'] = frozenset(manifest.values())
+    app.extensions['asset_precompressed'] = scan_precompressed(app)
+    app.extensions['asset_chunks'] = load_chunk_map(app)
+
+
+# ==================== FINGERPRINT ====================
+def test_same_sources_same_hashed_name(static_dir):
+    path = static_dir / 'css' / 'main.min.css'
+    body = '.btn{color:red}'
+
+    path.write_text(_BANNER.format(time='2026-01-01 08:00:00') + body, encoding='utf-8')
+    first = asset_build.publish_asset(path)
+    # Build lại, source không đổi => chỉ dòng Generated khác
+    path.write_text(_BANNER.format(time='2026-03-09 17:45:12') + body, encoding='utf-8')
+    second = asset_build.publish_asset(path)
+    assert first == second
+
+    path.write_text(_BANNER.format(time='2026-03-09 17:45:12') + '.btn{color:blue}', encoding='utf-8')
+    third = asset_build.publish_asset(path)
+    assert third != first
+    # Bản hash cũ bị dọn, manifest trỏ bản mới
+    assert not first.exists()
+    assert asset_build.load_manifest() == {'css/main.min.css': f'css/{third.name}'}
+
+
+def test_publish_all_drops_missing_assets(static_dir):
+    (static_dir / 'css' / 'main.min.css').write_text('a{}', encoding='utf-8')
+    asset_build.save_manifest({'js/chunks/old.min.js': 'js/chunks/old.min.0123456789ab.js'})
+
+    published = asset_build.publish_all()
+
+    assert list(published) == ['css/main.min.css']
+    assert asset_build.load_manifest() == published
+    hashed = static_dir / published['css/main.min.css']
+    assert gzip.decompress(hashed.with_name(hashed.name + '.gz').read_bytes()) == b'a{}'
+
+
+# ==================== STATIC VIEW ====================
+def test_hashed_asset_url_and_precompressed_response(app, client, static_dir):
+    css = 'body{margin:0}' * 100
+    (static_dir / 'css' / 'main.min.css').write_text(css, encoding='utf-8')
+    asset_build.publish_all()
+    _reload_assets(app)
+
+    with app.test_request_context('/'):
+        from app.assets import asset_url
+        url = asset_url('css/main.min.css')
+        assert url == '/static/' + asset_build.load_manifest()['css/main.min.css']
+        assert asset_url('img/logo.png') == '/static/img/logo.png'
+
+    response = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert 'immutable' in response.headers['Cache-Control']
+    assert gzip.decompress(response.get_data()).decode('utf-8') == css
+
+    # Client không nhận nén => bản gốc
+    plain = client.get(url, headers={'Accept-Encoding': 'identity'})
+    assert 'Content-Encoding' not in plain.headers
+    assert plain.get_data(as_text=True) == css
+
+
+def test_precompressed_encoding_negotiation(app, client, static_dir):
+    brotli = pytest.importorskip('brotli')
+    js = 'console.log("bricon");' * 50
+    (static_dir / 'js' / 'main.min.js').write_text(js, encoding='utf-8')
+    url = '/static/' + asset_build.publish_all()['js/main.min.js']
+    _reload_assets(app)
+
+    # Ưu tiên br
+    br = client.get(url, headers={'Accept-Encoding': 'gzip, deflate, br'})
+    assert br.headers['Content-Encoding'] == 'br'
+    assert br.mimetype in ('application/javascript', 'text/javascript')
+    assert brotli.decompress(br.get_data()).decode('utf-8') == js
+
+    # br;q=0 => gzip
+    gz = client.get(url, headers={'Accept-Encoding': 'br;q=0, gzip'})
+    assert gz.headers['Content-Encoding'] == 'gzip'
+    assert int(gz.headers['Content-Length']) == len(gz.get_data())
+    # Mỗi encoding 1 ETag riêng, revalidate đúng bản
+    assert gz.headers['ETag'] != br.headers['ETag']
+    revalidated = client.get(url, headers={'Accept-Encoding': 'gzip', 'If-None-Match': gz.headers['ETag']})
+    assert revalidated.status_code == 304
+
+    # File không có bản nén sẵn => gửi bản gốc
+    (static_dir / 'robots.txt').write_text('User-agent: *', encoding='utf-8')
+    plain = client.get('/static/robots.txt', headers={'Accept-Encoding': 'br, gzip'})
+    assert 'Content-Encoding' not in plain.headers
+    assert plain.get_data(as_text=True) == 'User-agent: *'
+
+
+def test_missing_manifest_falls_back_to_plain_url(app, static_dir):
+    (static_dir / 'css' / 'main.min.css').write_text('a{}', encoding='utf-8')
+    _reload_assets(app)
+
+    with app.test_request_context('/'):
+        from app.assets import asset_url
+        assert asset_url('css/main.min.css') == '/static/css/main.min.css'
+
+
+# ==================== CSS BUILD ====================
+def test_split_follows_marker_order():
+    # Marker ACCESSIBILITY lặp lại trong khối khác => module sau phải lấy đúng lần xuất hiện sau
+    content = ('/* == BANNER == */.banner{}/* == A11Y == */.banner:focus{}'
+               '/* == LOADER == */.loader{}/* == A11Y == */.skip{}/* == PRINT == */')
+    banner, position = build_css.extract_css_section(content, '/* == BANNER == */', '/* == LOADER == */')
+    loader, position = build_css.extract_css_section(content, '/* == LOADER == */', '/* == A11Y == */', position)
+    a11y, _ = build_css.extract_css_section(content, '/* == A11Y == */', '/* == PRINT == */', position)
+
+    assert '.banner:focus' in banner
+    assert loader == '/* == LOADER == */.loader{}'
+    assert a11y == '/* == A11Y == */.skip{}'
+
+
+def test_dedupe_keeps_last_identical_rule():
+    rules = build_css.parse_css_rules(
+        '.a{color:red}.b{color:blue}.a{color:red}'
+        '@media (max-width:768px){.a{margin:0}.a{margin:0}}'
+    )
+    assert build_css.serialize_css_rules(build_css.dedupe_css_rules(rules)) == \
+        '.b{color:blue}.a{color:red}@media (max-width:768px){.a{margin:0}}'
+
+
+def test_tree_shaking_drops_unused_selectors():
+    keep = build_css.used_selector_filter({'btn', 'bg-'}, {'main'})
+    rules = build_css.parse_css_rules(
+        '.btn,.unused{color:red}.ghost{color:blue}#main .bg-primary{margin:0}'
+        '@media (max-width:768px){.ghost{display:none}}.show{opacity:1}'
+    )
+    assert build_css.serialize_css_rules(build_css.filter_css_rules(rules, keep)) == \
+        '.btn{color:red}#main .bg-primary{margin:0}.show{opacity:1}'
+
+
+@pytest.fixture
+def css_build(static_dir, monkeypatch):
+    """build_css trỏ vào static/ tạm: style.css gốc + 2 module"""
+    css_dir = static_dir / 'css'
+    (css_dir / 'modules').mkdir()
+    monkeypatch.setattr(build_css, 'MODULES_DIR', css_dir / 'modules')
+    monkeypatch.setattr(build_css, 'INPUT_FILE', css_dir / 'style.css')
+    monkeypatch.setattr(build_css, 'OUTPUT_FILE', css_dir / 'main.min.css')
+    monkeypatch.setattr(build_css, 'CRITICAL_DIR', css_dir / 'critical')
+    monkeypatch.setattr(build_css, 'CSS_TREE_SHAKING', False)
+    monkeypatch.setattr(build_css, 'CSS_MODULES', {'01-base.css': {}, '02-a11y.css': {}})
+    return css_dir
+
+
+def test_build_dedupes_overlapping_modules(css_build):
+    (css_build / 'style.css').write_text('body {\n  margin: 0;\n}\n.skip:focus {\n  top: 0;\n}\n', encoding='utf-8')
+    (css_build / 'modules' / '01-base.css').write_text('body { margin: 0; }', encoding='utf-8')
+    # Module tách sai: chứa lại cả rule của module trước
+    (css_build / 'modules' / '02-a11y.css').write_text('body { margin: 0; } .skip:focus { top: 0; }',
+                                                       encoding='utf-8')
+
+    assert build_css.build_css()
+    output = (css_build / 'main.min.css').read_text(encoding='utf-8')
+    assert output.split('*/', 1)[1].strip() == 'body{margin:0}.skip:focus{top:0}'
+
+
+def test_build_fails_when_output_larger_than_source(css_build):
+    (css_build / 'style.css').write_text('a{color:red}', encoding='utf-8')
+    (css_build / 'modules' / '01-base.css').write_text('a { color: red; }', encoding='utf-8')
+    (css_build / 'modules' / '02-a11y.css').write_text('.skip:focus { top: 0; }', encoding='utf-8')
+
+    assert build_css.build_css() is False
+    assert not (css_build / 'main.min.css').exists()
+
+
+# ==================== CRITICAL CSS ====================
+def test_critical_css_keeps_above_the_fold_rules(tmp_path, monkeypatch):
+    monkeypatch.setattr(build_css, 'CRITICAL_DIR', tmp_path / 'critical')
+    (tmp_path / 'critical' / 'public').mkdir(parents=True)
+    stale = tmp_path / 'critical' / 'public' / 'da-xoa.css'
+    stale.write_text('a{}', encoding='utf-8')
+
+    css = ('.skip-link{position:absolute}.khong-ai-dung{color:red}'
+           '@media (max-width:768px){.skip-link{top:0}}@keyframes spin{to{transform:rotate(1turn)}}')
+    assert build_css.build_critical_css(css)
+
+    index = (tmp_path / 'critical' / 'public' / 'index.css').read_text(encoding='utf-8')
+    # skip-link nằm đầu layout => critical; class không có trong markup + @keyframes => để main.min.css
+    assert index == '.skip-link{position:absolute}@media (max-width:768px){.skip-link{top:0}}'
+    # Template không còn => critical cũ bị xóa
+    assert not stale.exists()
+
+
+def test_critical_css_inlined_for_page_template(app, client, db):
+    critical = app.extensions['asset_critical_css']
+    app.extensions['asset_critical_css'] = {'public/faq.html': Markup('.faq-hero{margin:0}')}
+    try:
+        body = client.get('/cau-hoi-thuong-gap').get_data(as_text=True)
+        assert '<style>.faq-hero{margin:0}</style>' in body
+        assert 'media="print" onload="this.media=\'all\'"' in body
+
+        # Trang chưa có critical CSS => <link> chặn render như cũ
+        body = client.get('/tuyen-dung').get_data(as_text=True)
+        assert '.faq-hero' not in body
+        assert 'media="print"' not in body
+    finally:
+        app.extensions['asset_critical_css'] = critical
+
+
+# ==================== CHUNK JS THEO TRANG ====================
+def test_build_chunks_groups_modules_by_templates(static_dir, monkeypatch):
+    monkeypatch.setattr(build_js, 'STATIC_DIR', static_dir)
+    monkeypatch.setattr(build_js, 'CHUNKS_DIR', static_dir / 'js' / 'chunks')
+    monkeypatch.setattr(build_js, 'CHUNK_MAP_FILE', static_dir / 'js' / 'chunks.json')
+    (static_dir / 'js' / 'chunks').mkdir()
+    stale = static_dir / 'js' / 'chunks' / 'public-about.min.js'
+    stale.write_text('var old;', encoding='utf-8')
+
+    chunk_map = build_js.build_chunks({
+        ('public/index.html',): [('08-banner-carousel.js', 'var banner = 1;'),
+                                 ('15-banner-effect.js', 'var effect = 2;')],
+        ('components/chatbot.html', 'public/index.html'): [('12-chatbot.js', 'var chat = 3;')],
+    })
+
+    assert chunk_map == {
+        'public/index.html': ['js/chunks/public-index.min.js', 'js/chunks/components-chatbot+public-index.min.js'],
+        'components/chatbot.html': ['js/chunks/components-chatbot+public-index.min.js'],
+    }
+    index_chunk = (static_dir / 'js' / 'chunks' / 'public-index.min.js').read_text(encoding='utf-8')
+    assert 'banner' in index_chunk and 'effect' in index_chunk and 'chat' not in index_chunk
+    # Chunk không còn trong used_on => xóa
+    assert not stale.exists()
+    assert set(asset_build.load_manifest()) == {
+        'js/chunks/public-index.min.js', 'js/chunks/components-chatbot+public-index.min.js'
+    }
+
+
+def test_page_scripts_selects_chunks_for_template(app, static_dir):
+    from flask import g
+    from app.assets import page_scripts
+
+    (static_dir / 'js' / 'chunks').mkdir()
+    (static_dir / 'js' / 'chunks' / 'public-index.min.js').write_text('var banner;', encoding='utf-8')
+    (static_dir / 'js' / 'chunks.json').write_text('{"public/index.html": ["js/chunks/public-index.min.js"]}',
+                                                   encoding='utf-8')
+    asset_build.publish_all()
+    _reload_assets(app)
+    hashed = asset_build.load_manifest()['js/chunks/public-index.min.js']
+
+    with app.test_request_context('/'):
+        g.page_template = 'public/index.html'
+        assert page_scripts() == Markup(f'<script src="/static/{hashed}"></script>')
+        # Template khác / chỉ định template
+        assert page_scripts('public/about.html') == Markup('')
+        g.page_template = 'public/faq.html'
+        assert page_scripts() == Markup('')
@@ -31,6 +31,9 @@ PUBLIC_ROUTES = [
     ("/san-pham?sort=price_asc", "📊 Sắp xếp sản phẩm theo giá"),
     ("/san-pham?sort=latest", "🆕 Sản phẩm mới nhất"),
 
+    # Gợi ý tìm kiếm (JSON)
+    ("/api/suggest?q=keo", "💡 Gợi ý tìm kiếm"),
+
     # Blog
     ("/tin-tuc", "📰 Danh sách blog"),
     ("/tin-tuc?search=test", "🔍 Tìm kiếm blog"),
@@ -56,6 +59,7 @@ PUBLIC_ROUTES = [
 
     # SEO & Misc
     ("/sitemap.xml", "🗺️ Sitemap"),
+    ("/sitemap-pages-1.xml", "🗺️ Sitemap trang tĩnh"),
     ("/robots.txt", "🤖 Robots.txt"),
 ]
 
@@ -69,6 +73,22 @@ def check_server():
         return False
 
 
+def is_valid_suggest_json(response):
+    """/api/suggest phải trả {'query': str, 'suggestions': [{'type', 'title', 'url'}, ...]}"""
+    if 'application/json' not in response.headers.get('Content-Type', ''):
+        return False
+    try:
+        data = response.json()
+    except ValueError:
+        return False
+    if not isinstance(data.get('query'), str) or not isinstance(data.get('suggestions'), list):
+        return False
+    return all(
+        isinstance(item, dict) and {'type', 'title', 'url'} <= set(item)
+        for item in data['suggestions']
+    )
+
+
 def test_route(route, name):
     """Test một route public"""
     url = BASE_URL + route
@@ -88,6 +108,13 @@ def test_route(route, name):
                 else:
                     print(f"{Colors.YELLOW}⚠️{Colors.END} {name:<40} {Colors.YELLOW}Wrong content-type{Colors.END}")
                     return False
+            elif route.startswith('/api/'):
+                if is_valid_suggest_json(response):
+                    print(f"{Colors.GREEN}✅{Colors.END} {name:<40} {Colors.CYAN}{url}{Colors.END}")
+                    return True
+                else:
+                    print(f"{Colors.YELLOW}⚠️{Colors.END} {name:<40} {Colors.YELLOW}Wrong JSON shape{Colors.END}")
+                    return False
             elif route.endswith('.txt'):
                 if 'text' in content_type:
                     print(f"{Colors.GREEN}✅{Colors.END} {name:<40} {Colors.CYAN}{url}{Colors.END}")
@@ -0,0 +1,441 @@
+"""
+Test hành vi các service: keyset cursor, gợi ý tìm kiếm, related, facet, page cache, nén, settings, lượt xem, sitemap
+
+Chạy: python -m pytest test
+"""
+import gzip
+import random
+import re
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.content import Blog, FAQ
+from app.models.job import Job
+from app.models.media import Project
+from app.models.product import Category, Product
+
+
+def _add(db, *objs):
+    db.session.add_all(objs)
+    db.session.commit()
+    return objs
+
+
+# ==================== KEYSET CURSOR ====================
+def test_cursor_round_trip(app):
+    from app.pagination import decode_cursor, encode_cursor
+
+    created = datetime(2024, 5, 17, 8, 30, 15)
+    with app.test_request_context('/'):
+        token = encode_cursor([created, 42], 3, before=True)
+        assert decode_cursor(token) == ([created, 42], 3, True)
+
+
+def test_cursor_rejects_tampered_token(app):
+    from app.pagination import decode_cursor, encode_cursor
+
+    with app.test_request_context('/'):
+        token = encode_cursor([datetime(2024, 5, 17), 42], 2)
+        tampered = token[:-2] + ('AA' if not token.endswith('AA') else 'BB')
+        assert decode_cursor(tampered) is None
+        assert decode_cursor('not-a-cursor') is None
+
+    signer_secret = app.secret_key
+    app.secret_key = 'other-secret'
+    try:
+        with app.test_request_context('/'):
+            assert decode_cursor(token) is None
+    finally:
+        app.secret_key = signer_secret
+
+
+def test_keyset_pages_follow_cursor(app, db):
+    from app.pagination import KeysetOrder, keyset_paginate
+
+    start = datetime(2024, 1, 1)
+    # 2 bài cùng created_at => id phân định thứ tự
+    _add(db, *[Blog(title=f'Bài {i}', slug=f'bai-{i}', content='x',
+                    created_at=start + timedelta(days=min(i, 5))) for i in range(7)])
+    expected = [blog.id for blog in Blog.query.order_by(Blog.created_at.desc(), Blog.id.desc())]
+
+    seen, params, pages = [], {}, []
+    while True:
+        with app.test_request_context('/', query_string=params):
+            pagination = keyset_paginate(Blog.query, Blog, [KeysetOrder('created_at', True)], per_page=3)
+            seen += [blog.id for blog in pagination.items]
+            pages.append(pagination.page)
+            params = pagination.next_params
+        if not params:
+            break
+
+    assert seen == expected
+    assert pages == [1, 2, 3]
+
+    # Trang 3 -> về trang 2 bằng cursor "before"
+    with app.test_request_context('/', query_string={'page': 3}):
+        prev_params = keyset_paginate(Blog.query, Blog, [KeysetOrder('created_at', True)], per_page=3).prev_params
+    with app.test_request_context('/', query_string=prev_params):
+        pagination = keyset_paginate(Blog.query, Blog, [KeysetOrder('created_at', True)], per_page=3)
+        assert pagination.page == 2
+        assert [blog.id for blog in pagination.items] == expected[3:6]
+
+
+# ==================== SUGGEST ====================
+def test_suggest_matches_without_accents(db):
+    from app.search import suggest
+
+    _add(db,
+         Product(name='Keo chống thấm đa năng', slug='keo-chong-tham'),
+         Product(name='Keo dán gạch', slug='keo-dan-gach'),
+         Product(name='Chống thấm ngừng bán', slug='ngung-ban', is_active=False))
+
+    assert [entry.slug for entry in suggest('chong tham')] == ['keo-chong-tham']
+    assert [entry.slug for entry in suggest('CHỐNG Th')] == ['keo-chong-tham']
+    # Khớp từ đầu tiêu đề xếp trước
+    assert [entry.slug for entry in suggest('keo')] == ['keo-dan-gach', 'keo-chong-tham']
+    assert suggest('   ') == []
+
+
+def test_missing_search_index_builds_in_background(app, db, caplog):
+    import app.search as search
+    from app.search import apply_search
+
+    _add(db, Product(name='Keo dán gạch', slug='keo-dan-gach'))
+
+    app.config['SEARCH_INDEX_AUTO_BUILD'] = True
+    # Như process mới khởi động: chưa kiểm tra index
+    search._BACKEND = None
+    try:
+        # Chưa có index: request dùng ngay ILIKE (không chờ build) + log warning
+        with caplog.at_level('WARNING', logger='app.search'):
+            assert apply_search(Product.query, Product, 'gach').count() == 0
+        assert 'dùng ILIKE' in caplog.text
+
+        for thread in threading.enumerate():
+            if thread.name == 'search-index-build':
+                thread.join(timeout=10)
+        # Build xong => dùng index (bỏ dấu)
+        assert apply_search(Product.query, Product, 'gach').count() == 1
+    finally:
+        app.config['SEARCH_INDEX_AUTO_BUILD'] = False
+
+
+def test_suggest_follows_commits(db):
+    from app.search import suggest
+
+    product, = _add(db, Product(name='Vữa tự san phẳng', slug='vua'))
+    assert [entry.slug for entry in suggest('vua')] == ['vua']
+
+    product.name = 'Sơn chống kiềm'
+    db.session.commit()
+    assert suggest('vua') == []
+    assert [entry.slug for entry in suggest('son chong')] == ['vua']
+
+
+def test_suggest_api_shape(client, db):
+    _add(db, Category(name='Keo dán', slug='keo-dan'), Product(name='Keo chà ron', slug='keo-cha-ron'))
+
+    response = client.get('/api/suggest?q=keo')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['query'] == 'keo'
+    assert [item['type'] for item in data['suggestions']] == ['category', 'product']
+    for item in data['suggestions']:
+        assert set(item) == {'type', 'title', 'url'}
+
+
+# ==================== RELATED ====================
+def _wait_related_rebuilds():
+    for thread in threading.enumerate():
+        if thread.name.startswith('related-rebuild-'):
+            thread.join(timeout=10)
+
+
+def test_related_ranking_and_background_rebuild(db):
+    from app.related import related_ids
+
+    keo, son = _add(db, Category(name='Keo', slug='keo'), Category(name='Sơn', slug='son'))
+    base, tile, grout, paint = _add(
+        db,
+        Product(name='Keo dán gạch chống thấm', slug='keo-dan-gach', category_id=keo.id,
+                application='Ốp lát, chống thấm'),
+        Product(name='Keo dán gạch ốp tường', slug='keo-op-tuong', category_id=keo.id,
+                application='Ốp lát'),
+        Product(name='Keo chà ron', slug='keo-cha-ron', category_id=keo.id),
+        Product(name='Sơn chống thấm ngoại thất', slug='son-chong-tham', category_id=son.id),
+    )
+
+    # Cùng danh mục + trùng từ + trùng ứng dụng xếp trước, khác danh mục nhưng trùng từ xếp sau
+    assert related_ids('product', base.id) == (tile.id, grout.id, paint.id)
+    assert related_ids('product', paint.id) == (base.id,)
+
+    # Commit => build lại ở thread nền, request chỉ đọc snapshot
+    tile.is_active = False
+    db.session.commit()
+    _wait_related_rebuilds()
+    assert related_ids('product', base.id) == (grout.id, paint.id)
+    assert related_ids('product', tile.id) == ()
+
+
+# ==================== FACETS ====================
+def test_product_category_facet_counts(db):
+    from app.facets import product_category_facets
+
+    keo, son = _add(db, Category(name='Keo dán', slug='keo-dan'), Category(name='Sơn', slug='son'))
+    _add(db,
+         Product(name='Keo dán gạch', slug='keo-dan-gach', category_id=keo.id),
+         Product(name='Keo chà ron', slug='keo-cha-ron', category_id=keo.id),
+         Product(name='Keo ngừng bán', slug='keo-ngung-ban', category_id=keo.id, is_active=False),
+         Product(name='Sơn lót', slug='son-lot', category_id=son.id),
+         Product(name='Chưa phân loại', slug='chua-phan-loai'))
+
+    facets = product_category_facets()
+    assert facets.total == 4
+    assert {option.slug: option.count for option in facets.options} == {'keo-dan': 2, 'son': 1}
+
+    facets = product_category_facets('keo')
+    assert facets.total == 2
+    assert {option.slug: option.count for option in facets.options} == {'keo-dan': 2, 'son': 0}
+
+
+def test_product_facet_cache_key_matches_search_backend(db):
+    from app.facets import product_category_facets
+    from app.search import rebuild_search_index
+
+    _add(db, Product(name='Keo dán gạch', slug='keo-dan-gach'))
+
+    # Chưa có index => ILIKE theo từ khóa gốc: 'gach' không khớp 'gạch', không dùng chung cache
+    assert product_category_facets('gạch').total == 1
+    assert product_category_facets('gach').total == 0
+
+    # Có index => so token đã bỏ dấu
+    rebuild_search_index()
+    assert product_category_facets('gach').total == 1
+    assert product_category_facets('GẠCH').total == 1
+
+
+def test_job_facets_count_against_other_selection(db):
+    from app.facets import FacetValue, job_facets
+
+    _add(db,
+         Job(title='Kỹ sư hiện trường', slug='ky-su-hcm', department='Kỹ thuật', location='TP.HCM'),
+         Job(title='Kỹ sư QA', slug='ky-su-hn', department='Kỹ thuật', location='Hà Nội'),
+         Job(title='Kinh doanh', slug='kinh-doanh-hcm', department='Kinh doanh', location='TP.HCM'),
+         Job(title='Đã tuyển xong', slug='da-tuyen', department='Kế toán', location='TP.HCM', is_active=False))
+
+    facets = job_facets()
+    assert facets.total == 3
+    assert facets.departments == (FacetValue('Kinh doanh', 1), FacetValue('Kỹ thuật', 2))
+    assert facets.locations == (FacetValue('Hà Nội', 1), FacetValue('TP.HCM', 2))
+
+    # Chọn địa điểm => phòng ban đếm trong địa điểm đó (vẫn liệt kê phòng ban 0 job)
+    facets = job_facets(location='Hà Nội')
+    assert facets.total == 1
+    assert facets.departments == (FacetValue('Kinh doanh', 0), FacetValue('Kỹ thuật', 1))
+    assert facets.locations == (FacetValue('Hà Nội', 1), FacetValue('TP.HCM', 2))
+
+    # Cache invalidate theo tag 'job'
+    _add(db, Job(title='Kinh doanh HN', slug='kinh-doanh-hn', department='Kinh doanh', location='Hà Nội'))
+    assert job_facets(location='Hà Nội').total == 2
+
+
+def test_careers_page_filters_by_facet(client, db):
+    _add(db,
+         Job(title='Kỹ sư hiện trường', slug='ky-su-hcm', department='Kỹ thuật', location='TP.HCM'),
+         Job(title='Nhân viên kinh doanh', slug='kinh-doanh-hn', department='Kinh doanh', location='Hà Nội'))
+
+    body = client.get('/tuyen-dung?dept=Kinh doanh').get_data(as_text=True)
+    assert 'Nhân viên kinh doanh' in body
+    assert 'Kỹ sư hiện trường' not in body
+
+
+# ==================== PAGE CACHE ====================
+def test_cached_page_invalidated_by_tag(client, db):
+    _add(db, FAQ(question='Keo khô trong bao lâu?', answer='24 giờ'))
+
+    first = client.get('/cau-hoi-thuong-gap')
+    assert first.headers['X-Cache'] == 'MISS'
+    second = client.get('/cau-hoi-thuong-gap')
+    assert second.headers['X-Cache'] == 'HIT'
+    assert second.get_data() == first.get_data()
+
+    # Cùng ETag => 304
+    revalidated = client.get('/cau-hoi-thuong-gap', headers={'If-None-Match': first.headers['ETag']})
+    assert revalidated.status_code == 304
+
+    # Commit FAQ => tag 'faq' đổi version => build lại trang
+    _add(db, FAQ(question='Có giao hàng tỉnh không?', answer='Có'))
+    third = client.get('/cau-hoi-thuong-gap')
+    assert third.headers['X-Cache'] == 'MISS'
+    assert 'Có giao hàng tỉnh không?' in third.get_data(as_text=True)
+    assert third.headers['ETag'] != first.headers['ETag']
+
+
+def test_detail_page_conditional_get_still_counts_views(client, db):
+    from app.models.counters import pending_view_counts
+
+    product, = _add(db, Product(name='Keo dán gạch', slug='keo-dan-gach'))
+
+    first = client.get('/san-pham/keo-dan-gach')
+    assert first.status_code == 200
+    assert 'X-Cache' not in first.headers
+    assert first.headers['Last-Modified']
+
+    revalidated = client.get('/san-pham/keo-dan-gach', headers={'If-None-Match': first.headers['ETag']})
+    assert revalidated.status_code == 304
+    assert revalidated.headers['ETag'] == first.headers['ETag']
+    # 304 vẫn tính lượt xem
+    assert pending_view_counts() == {('Product', product.id): 2}
+
+    # Sản phẩm đổi => ETag mới, render lại
+    product.name = 'Keo dán gạch cao cấp'
+    db.session.commit()
+    changed = client.get('/san-pham/keo-dan-gach', headers={'If-None-Match': first.headers['ETag']})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != first.headers['ETag']
+    assert 'Keo dán gạch cao cấp' in changed.get_data(as_text=True)
+
+    assert client.get('/san-pham/khong-co', headers={'If-None-Match': '*'}).status_code == 404
+
+
+# ==================== COMPRESSION ====================
+def test_compressed_body_cache_limits():
+    from app.compression import CompressedBodyCache
+
+    results = CompressedBodyCache(max_entries=2, max_bytes=40)
+    results.set('a', b'x' * 8)
+    results.set('b', b'y' * 8)
+    assert results.get('a') == b'x' * 8
+    results.set('c', b'z' * 8)
+    # Vượt số entry => bỏ entry ít dùng nhất ('b')
+    assert results.get('b') is None
+    # Lớn hơn 1/4 giới hạn bytes => không lưu
+    results.set('big', b'w' * 11)
+    assert results.get('big') is None
+    assert results.stats()['entries'] == 2
+    assert results.stats()['evictions'] == 1
+
+
+def test_compression_cache_hit_and_level_by_size(app, client, db):
+    from app import compress
+
+    _add(db, FAQ(question='Keo khô trong bao lâu?', answer='24 giờ'))
+    app.config['COMPRESS_DEBUG_HEADER'] = True
+    try:
+        first = client.get('/cau-hoi-thuong-gap', headers={'Accept-Encoding': 'gzip'})
+        second = client.get('/cau-hoi-thuong-gap', headers={'Accept-Encoding': 'gzip'})
+        assert first.headers['Content-Encoding'] == 'gzip'
+        assert (first.headers['X-Compress-Cache'], second.headers['X-Compress-Cache']) == ('MISS', 'HIT')
+        assert second.get_data() == first.get_data()
+
+        # < COMPRESS_MIN_SIZE => gửi nguyên
+        small = client.get('/api/suggest?q=keo', headers={'Accept-Encoding': 'gzip'})
+        assert 'Content-Encoding' not in small.headers
+    finally:
+        app.config['COMPRESS_DEBUG_HEADER'] = False
+
+    # Body lớn: dùng lại được (ETag) => mức cao, không => mức mặc định
+    words = ['keo', 'dán', 'gạch', 'chống', 'thấm', 'vữa', 'sơn', 'lót', 'bricon', 'ốp', 'lát']
+    rng = random.Random(7)
+    body = ' '.join(rng.choice(words) + str(rng.randint(0, 999)) for _ in range(8000)).encode('utf-8')
+    assert len(body) >= app.config['COMPRESS_LARGE_SIZE']
+    with app.test_request_context('/'):
+        plain = app.response_class(body, mimetype='text/html')
+        reusable = app.response_class(body, mimetype='text/html')
+        reusable.set_etag('v1')
+        default_level = compress.compress(app, plain, 'gzip')
+        high_level = compress.compress(app, reusable, 'gzip')
+    assert default_level == gzip.compress(body, compresslevel=app.config['COMPRESS_LEVEL'], mtime=0)
+    assert high_level == gzip.compress(body, compresslevel=app.config['COMPRESS_LARGE_LEVEL'], mtime=0)
+    assert high_level != default_level
+
+
+# ==================== SETTINGS ====================
+def test_set_settings_rolls_back_on_error(db, monkeypatch):
+    from app.models.settings import Settings, get_setting, set_setting, set_settings
+
+    set_setting('hotline', '0901.180.094')
+    assert get_setting('hotline') == '0901.180.094'
+
+    def failing_commit():
+        raise RuntimeError('db down')
+
+    monkeypatch.setattr(db.session, 'commit', failing_commit)
+    with pytest.raises(RuntimeError):
+        set_settings({
+            'hotline': ('0000.000.000', 'general', ''),
+            'contact_email': ('x@bricon.vn', 'general', ''),
+        })
+    monkeypatch.undo()
+
+    # Snapshot + DB giữ nguyên
+    assert get_setting('hotline') == '0901.180.094'
+    assert get_setting('contact_email') is None
+    assert {s.key: s.value for s in Settings.query.all()} == {'hotline': '0901.180.094'}
+
+    assert set_settings({'hotline': ('0000.000.000', 'general', '')}) == 1
+    assert get_setting('hotline') == '0000.000.000'
+
+
+# ==================== VIEW COUNTERS ====================
+def test_view_counts_flush_in_one_batch(app, db):
+    from app.models.counters import count_view, flush_view_counts, pending_view_counts
+
+    updated_at = datetime(2024, 1, 1)
+    product, blog = _add(db, Product(name='Keo', slug='keo', views=5, updated_at=updated_at),
+                         Blog(title='Tin', slug='tin', content='x', views=None))
+
+    with app.test_request_context('/'):
+        for _ in range(3):
+            # Mỗi lượt xem là 1 request mới => obj đọc lại từ DB
+            db.session.expire(product)
+            count_view(product)
+        count_view(blog)
+
+    # Giá trị hiển thị cộng cả lượt đang chờ, DB chưa đổi
+    assert product.views == 8
+    assert pending_view_counts() == {('Product', product.id): 3, ('Blog', blog.id): 1}
+    assert db.session.execute(db.select(Product.views).filter_by(id=product.id)).scalar() == 5
+
+    assert flush_view_counts() == 2
+    assert pending_view_counts() == {}
+    db.session.expire_all()
+    assert (product.views, blog.views) == (8, 1)
+    # Lượt xem không đổi updated_at
+    assert product.updated_at == updated_at
+    assert flush_view_counts() == 0
+
+
+# ==================== SITEMAP ====================
+def _sitemap_locs(body):
+    return re.findall(r'<loc>([^<]+)</loc>', body.decode('utf-8'))
+
+
+def test_sitemap_chunk_boundaries(app, db):
+    from app.sitemaps import sitemap_index, sitemap_part
+
+    app.config['SITEMAP_CHUNK_SIZE'] = 2
+    try:
+        _add(db, *[Project(title=f'Dự án {i}', slug=f'du-an-{i}') for i in range(5)],
+             Project(title='Ẩn', slug='an', is_active=False))
+
+        with app.test_request_context('/', base_url='https://bricon.vn'):
+            chunks = [_sitemap_locs(sitemap_part('projects', page)[0]) for page in (1, 2, 3)]
+            assert [len(locs) for locs in chunks] == [2, 2, 1]
+            slugs = [loc.rsplit('/', 1)[-1] for locs in chunks for loc in locs]
+            assert slugs == [f'du-an-{i}' for i in range(5)]
+
+            assert sitemap_part('projects', 4) is None
+            assert sitemap_part('projects', 0) is None
+            assert sitemap_part('unknown', 1) is None
+            # Loại chưa có item nào vẫn có chunk 1 (rỗng)
+            assert _sitemap_locs(sitemap_part('blogs', 1)[0]) == []
+
+            index = _sitemap_locs(sitemap_index()[0])
+            assert [loc for loc in index if 'projects' in loc] == [
+                f'https://bricon.vn/sitemap-projects-{page}.xml' for page in (1, 2, 3)
+            ]
+    finally:
+        app.config.pop('SITEMAP_CHUNK_SIZE')